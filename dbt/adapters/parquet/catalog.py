@@ -0,0 +1,227 @@
+import os
+import threading
+import typing as tp
+
+import duckdb
+
+from .relation import ParquetRelation
+from dbt.adapters.base import RelationType
+from dbt.events import AdapterLogger
+
+logger = AdapterLogger("Parquet")
+
+
+class CatalogFile:
+    """
+    A duckdb database file in the database folder with a schema and a view for every relation,
+    kept up to date as relations are created, renamed or dropped.
+
+    duckdb's CLI and other tools open it to query all relations right away, instead of first
+    registering a view per parquet file, and connections read the relations from it instead of
+    walking the database folder. A registry table records the layout of each relation, from which
+    the relations are rebuilt.
+
+    Only one process can have the file open for writing. While another one has it open, the
+    catalog is neither read nor updated, and a process changing relations meanwhile leaves a
+    marker file next to it, so that the next invocation rebuilds it from the database folder.
+    """
+
+    FILENAME = ".dbt_parquet_catalog.duckdb"
+    STALE_MARKER = ".dbt_parquet_catalog.stale"
+    REGISTRY = "_dbt_parquet_relations"
+
+    def __init__(self, database: str):
+        self.database = database
+        self.path = os.path.join(database, self.FILENAME)
+        self.stale_path = os.path.join(database, self.STALE_MARKER)
+        self._conn: tp.Optional[duckdb.DuckDBPyConnection] = None
+        self._unavailable = False
+        self._lock = threading.RLock()
+
+    def _cursor(self, create: bool = False) -> tp.Optional[duckdb.DuckDBPyConnection]:
+        """
+        The connection to the catalog file, opened on first use. Returns None if the file does
+        not exist (unless `create` is set), or is locked by another process.
+        """
+        if self._conn is None and not self._unavailable:
+            if not create and not os.path.exists(self.path):
+                return None
+            try:
+                self._conn = duckdb.connect(self.path)
+                self._conn.execute(
+                    f"""
+                    create table if not exists {self.REGISTRY} (
+                        name varchar,
+                        schema varchar,
+                        identifier varchar,
+                        partition_depth integer,
+                        change_files boolean,
+                        scan varchar
+                    )
+                    """
+                )
+            except duckdb.Error as e:
+                logger.warning(f"Not using the catalog file {self.path}: {e}")
+                self._conn, self._unavailable = None, True
+        return self._conn
+
+    def _writer(self, create: bool = False) -> tp.Optional[duckdb.DuckDBPyConnection]:
+        """
+        The connection to record changes with. If the file exists but another process holds it,
+        the changes cannot be recorded, and the catalog is marked as out of date instead.
+        """
+        cur = self._cursor(create)
+        if cur is None and self._unavailable:
+            try:
+                with open(self.stale_path, "w"):
+                    pass
+            except OSError as e:
+                logger.warning(f"Could not mark the catalog file {self.path} as out of date: {e}")
+        return cur
+
+    def _invalidate(self, error: Exception) -> None:
+        """
+        Remove a catalog file that could not be updated, so that it is rebuilt rather than read
+        out of date
+        """
+        logger.warning(f"Removing the catalog file {self.path}, as updating it failed: {error}")
+        self.close()
+        for path in (self.path, self.path + ".wal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def relations(self) -> tp.Optional[tp.List[ParquetRelation]]:
+        """
+        The relations recorded in the catalog, or None if there is no usable catalog
+        """
+        with self._lock:
+            if os.path.exists(self.stale_path):
+                # removed before the caller walks the database folder, so that a marker left
+                # meanwhile is kept for the next invocation
+                os.remove(self.stale_path)
+                return None
+            cur = self._cursor()
+            if cur is None:
+                return None
+            rows = cur.execute(
+                f"""
+                select schema, identifier, partition_depth, change_files, scan
+                from {self.REGISTRY}
+                order by name
+                """
+            ).fetchall()
+        relations = []
+        for schema, identifier, partition_depth, change_files, scan in rows:
+            relation = ParquetRelation.create(
+                database=self.database,
+                schema=schema,
+                identifier=identifier,
+                type=RelationType.Table,
+                partition_depth=partition_depth,
+                change_files=change_files,
+            )
+            # e.g. the database folder moved, and the views read from the old location
+            if relation.render_parquet_scan() != scan:
+                return None
+            relations.append(relation)
+        return relations
+
+    def replace(self, relations: tp.Iterable[ParquetRelation]) -> None:
+        """
+        Rebuild the catalog, creating the file if needed, to hold exactly `relations`
+        """
+        with self._lock:
+            cur = self._writer(create=True)
+            if cur is None:
+                return
+            cmds = [
+                f'drop schema "{schema}" cascade'
+                for (schema,) in cur.execute(
+                    "select schema_name from duckdb_schemas() where not internal"
+                ).fetchall()
+            ]
+            cmds.extend(
+                f'drop view "{view}"'
+                for (view,) in cur.execute(
+                    "select view_name from duckdb_views() "
+                    "where not internal and schema_name = 'main'"
+                ).fetchall()
+            )
+            cmds.append(f"delete from {self.REGISTRY}")
+            self._apply(cur, cmds, list(relations))
+
+    def register(self, relations: tp.Iterable[ParquetRelation]) -> None:
+        """
+        Create or replace the views of `relations` in an existing catalog
+        """
+        with self._lock:
+            relations = list(relations)
+            if not relations:
+                return
+            cur = self._writer()
+            if cur is None:
+                return
+            self._apply(cur, [], relations)
+
+    def _apply(
+        self,
+        cur: duckdb.DuckDBPyConnection,
+        cmds: tp.List[str],
+        relations: tp.List[ParquetRelation],
+    ) -> None:
+        schemas = sorted({relation.schema for relation in relations if relation.schema})
+        cmds.extend(f'create schema if not exists "{schema}"' for schema in schemas)
+        cmds.extend(relation.register_as_view_cmd() for relation in relations)
+        try:
+            cur.execute("begin transaction")
+            cur.execute(";\n".join(cmds))
+            cur.executemany(
+                f"delete from {self.REGISTRY} where name = ?",
+                [[relation.render()] for relation in relations],
+            )
+            cur.executemany(
+                f"insert into {self.REGISTRY} values (?, ?, ?, ?, ?, ?)",
+                [
+                    [
+                        relation.render(),
+                        relation.schema or "",
+                        relation.identifier,
+                        relation.partition_depth,
+                        relation.change_files,
+                        relation.render_parquet_scan(),
+                    ]
+                    for relation in relations
+                ],
+            )
+            cur.execute("commit")
+        except duckdb.Error as e:
+            self._invalidate(e)
+
+    def forget(self, schema: tp.Optional[str] = None, name: tp.Optional[str] = None) -> None:
+        """
+        Drop the view of a dropped relation by its rendered name, or a whole dropped schema
+        """
+        with self._lock:
+            cur = self._writer()
+            if cur is None:
+                return
+            try:
+                if name is not None:
+                    cur.execute(f"drop view if exists {name}")
+                    cur.execute(f"delete from {self.REGISTRY} where name = ?", [name])
+                if schema:
+                    cur.execute(f'drop schema if exists "{schema}" cascade')
+                    cur.execute(f"delete from {self.REGISTRY} where schema = ?", [schema])
+            except duckdb.Error as e:
+                self._invalidate(e)
+
+    def close(self) -> None:
+        """
+        Close the file, releasing its lock for other processes. It is reopened when next used,
+        also if another process held it so far.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._unavailable = False
@@ -1,46 +1,200 @@
+import json
 import os
 import pathlib
+import re
 import threading
+import time
 import typing as tp
 from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
 
 import agate
 import duckdb
 import fs.base
 import fs.osfs
+import pyarrow
+import pyarrow.fs
+from fs_s3fs import S3FS
 
 import dbt.exceptions
+from . import storage
 from . import util
+from .catalog import CatalogFile
+from .metadata import FooterCache
+from .metadata import FooterInfo
+from .relation import ParquetRelation
 from dbt.adapters.base import BaseConnectionManager
 from dbt.adapters.base import Credentials
 from dbt.clients import agate_helper
 from dbt.contracts.connection import AdapterResponse
 from dbt.contracts.connection import Connection
 from dbt.contracts.connection import ConnectionState
-from dbt.logger import GLOBAL_LOGGER as logger
+from dbt.events import AdapterLogger
+
+logger = AdapterLogger("Parquet")
+
+# the parquet files or dataset folders written by `copy ... to '<path>' (format 'parquet' ...)`
+_COPY_TARGET_RE = re.compile(r"\bto\s+'([^']+)'\s*\(\s*format\s+'parquet'", re.IGNORECASE)
+
+# rows per arrow record batch when streaming results out of duckdb
+ARROW_BATCH_ROWS = 100_000
+
+
+def agate_type(arrow_type: pyarrow.DataType) -> agate.data_types.DataType:
+    """
+    The agate column type for an arrow column, so that agate need not infer types from the values
+    """
+    if pyarrow.types.is_boolean(arrow_type):
+        return agate.data_types.Boolean()
+    if (
+        pyarrow.types.is_integer(arrow_type)
+        or pyarrow.types.is_floating(arrow_type)
+        or pyarrow.types.is_decimal(arrow_type)
+    ):
+        return agate_helper.Number()
+    if pyarrow.types.is_timestamp(arrow_type):
+        return agate_helper.ISODateTime()
+    if pyarrow.types.is_date(arrow_type):
+        return agate.data_types.Date()
+    return agate.data_types.Text(null_values=())
 
 
 @dataclass
 class ParquetCredentials(Credentials):
     database: str
     schema: str = ""
+    # register views only for relations that are referenced, instead of all files at startup
+    lazy_views: bool = False
+    # number of parquet footers (schema and row group metadata) kept in memory
+    footer_cache_size: int = 4096
+    # keep the footer cache in a sidecar file under the database folder between invocations
+    persist_footer_cache: bool = False
+    # keep schemas and views in a duckdb file under the database folder, for the duckdb CLI and
+    # other tools, and read the relations from it when connections open. Local databases only
+    persist_catalog: bool = False
+    # maximum number of result rows turned into python objects, e.g. for `run_query`
+    fetch_max_rows: tp.Optional[int] = None
+    # parquet writer defaults, models can override them with the same configs
+    compression: tp.Optional[str] = None
+    row_group_size: tp.Optional[int] = None
+    # duckdb resource settings, models can override them with the `duckdb_settings` config.
+    # `threads` is taken by dbt's own thread count, hence `duckdb_threads`
+    duckdb_threads: tp.Optional[int] = None
+    memory_limit: tp.Optional[str] = None
+    temp_directory: tp.Optional[str] = None
+    preserve_insertion_order: tp.Optional[bool] = None
+    # estimated input bytes of the models running at the same time, defaults to `memory_limit`;
+    # models reading less than `admission_min_size` are always admitted
+    admission_budget: tp.Optional[str] = None
+    admission_min_size: str = "64MB"
+    # write duckdb's json query profiles of every model to `target/profiles`
+    query_profiling: bool = False
+    # S3-compatible object storage, used when `database` is an `s3://bucket/prefix` url.
+    # `s3_endpoint` is the `host:port` of a non-AWS store such as minio or moto
+    s3_region: tp.Optional[str] = None
+    s3_endpoint: tp.Optional[str] = None
+    s3_access_key_id: tp.Optional[str] = None
+    s3_secret_access_key: tp.Optional[str] = None
+    s3_session_token: tp.Optional[str] = None
+    s3_url_style: tp.Optional[str] = None
+    s3_use_ssl: bool = True
+    # concurrent part uploads of duckdb's multipart writes, and concurrent object moves
+    s3_upload_threads: tp.Optional[int] = None
+    # seconds that listings of the object store are reused for
+    listing_cache_ttl: float = 30.0
 
     @property
     def type(self):
         return "parquet"
 
+    @property
+    def is_remote(self) -> bool:
+        return storage.is_url(self.database)
+
+    def s3_endpoint_url(self) -> tp.Optional[str]:
+        if not self.s3_endpoint:
+            return None
+        return f"{'https' if self.s3_use_ssl else 'http'}://{self.s3_endpoint}"
+
     def create_fs_interface(self) -> fs.base.FS:
+        if self.is_remote:
+            if not self.database.startswith("s3://"):
+                raise dbt.exceptions.RuntimeException(
+                    f"unsupported database url {self.database}, only s3:// is supported"
+                )
+            bucket, prefix = storage.split_s3_url(self.database)
+            bucket_fs = S3FS(
+                bucket,
+                dir_path=prefix or "/",
+                aws_access_key_id=self.s3_access_key_id,
+                aws_secret_access_key=self.s3_secret_access_key,
+                aws_session_token=self.s3_session_token,
+                endpoint_url=self.s3_endpoint_url(),
+                region=self.s3_region,
+                strict=False,
+            )
+            return storage.CachedListingFS(bucket_fs, ttl=self.listing_cache_ttl)
         if os.path.exists(self.database):
             db_folder = fs.osfs.OSFS(self.database)
             return db_folder
         raise FileNotFoundError(f"folder {self.database} not found")
 
+    def duckdb_settings(self) -> tp.Dict[str, tp.Any]:
+        settings = {
+            "threads": self.duckdb_threads,
+            "memory_limit": self.memory_limit,
+            "temp_directory": self.temp_directory,
+            "preserve_insertion_order": self.preserve_insertion_order,
+        }
+        return {name: value for name, value in settings.items() if value is not None}
+
+    def s3_settings(self) -> tp.Dict[str, tp.Any]:
+        """
+        duckdb httpfs settings reaching the same object store as the adapter's filesystem
+        """
+        settings = {
+            "s3_region": self.s3_region,
+            "s3_endpoint": self.s3_endpoint,
+            "s3_access_key_id": self.s3_access_key_id,
+            "s3_secret_access_key": self.s3_secret_access_key,
+            "s3_session_token": self.s3_session_token,
+            "s3_url_style": self.s3_url_style,
+            "s3_use_ssl": self.s3_use_ssl,
+            "s3_uploader_thread_limit": self.s3_upload_threads,
+        }
+        return {name: value for name, value in settings.items() if value is not None}
+
+    def footer_opener(self) -> tp.Optional[tp.Callable[[str], tp.BinaryIO]]:
+        """
+        Opens files below the database for footer reads with ranged requests, instead of the
+        filesystem's `openbin` that downloads whole objects
+        """
+        if not self.is_remote:
+            return None
+        bucket_fs = pyarrow.fs.S3FileSystem(
+            access_key=self.s3_access_key_id,
+            secret_key=self.s3_secret_access_key,
+            session_token=self.s3_session_token,
+            region=self.s3_region,
+            endpoint_override=self.s3_endpoint,
+            scheme="https" if self.s3_use_ssl else "http",
+        )
+        root = self.database[len("s3://") :].rstrip("/")
+        return lambda path: bucket_fs.open_input_file(f"{root}/{path}")
+
+    def admission_budget_bytes(self) -> tp.Optional[int]:
+        budget = self.admission_budget or self.memory_limit
+        return util.parse_bytes(budget) if budget else None
+
     def _connection_keys(self):
         # return an iterator of keys to pretty-print in 'dbt debug'.
         return ("database", "schema")
 
     def __post_init__(self):
+        if self.is_remote:
+            self.database = self.database.rstrip("/")
+            return
         if not pathlib.Path(self.database).is_absolute():
             db_path = pathlib.Path.cwd() / self.database
         else:
@@ -48,10 +202,107 @@ class ParquetCredentials(Credentials):
         self.database = str(db_path.resolve())
 
 
+def set_statements(settings: tp.Dict[str, tp.Any]) -> str:
+    """
+    Render duckdb `set` statements for a mapping of setting names to values
+    """
+
+    def literal(value: tp.Any) -> str:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (int, float)):
+            return str(value)
+        return "'{}'".format(str(value).replace("'", "''"))
+
+    return ";\n".join(f"set {name}={literal(value)}" for name, value in settings.items())
+
+
+class SettingsLock:
+    """
+    Shared/exclusive lock around model runs.
+
+    duckdb settings such as `threads` or `memory_limit` are global to the database that all
+    connections share. A model overriding them holds the lock exclusively, so that its settings
+    apply to it alone; all other models hold it shared and run side by side.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._exclusive_waiting = 0
+
+    def acquire(self, exclusive: bool) -> None:
+        with self._cond:
+            if exclusive:
+                self._exclusive_waiting += 1
+                self._cond.wait_for(lambda: not self._exclusive and self._shared == 0)
+                self._exclusive_waiting -= 1
+                self._exclusive = True
+            else:
+                # waiting exclusive holders go first, so they do not starve
+                self._cond.wait_for(lambda: not self._exclusive and self._exclusive_waiting == 0)
+                self._shared += 1
+
+    def release(self, exclusive: bool) -> None:
+        with self._cond:
+            if exclusive:
+                self._exclusive = False
+            else:
+                self._shared -= 1
+            self._cond.notify_all()
+
+
+class AdmissionControl:
+    """
+    Admits model runs against a budget of (estimated) input bytes.
+
+    Each model reserves its input size while it runs, and waits until its reservation fits next
+    to those of the running models. A model larger than the whole budget reserves all of it and so
+    runs on its own. Small models are not accounted for and always start right away. Concurrent
+    models share duckdb's threads through its own task scheduler.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._reserved = 0
+
+    def acquire(self, cost: int, budget: int) -> int:
+        """
+        Wait for `cost` bytes of the budget, returning what was reserved
+        """
+        cost = min(cost, budget)
+        with self._cond:
+            self._cond.wait_for(lambda: self._reserved == 0 or self._reserved + cost <= budget)
+            self._reserved += cost
+        return cost
+
+    def release(self, cost: int) -> None:
+        with self._cond:
+            self._reserved -= cost
+            self._cond.notify_all()
+
+
+@dataclass
+class ParquetAdapterResponse(AdapterResponse):
+    # wall time of the statement in seconds
+    duration: tp.Optional[float] = None
+    # high-water mark of the whole process' memory in bytes so far, which includes duckdb's
+    # buffers: it never goes down, so it is not the memory used by this statement
+    process_peak_memory: tp.Optional[int] = None
+    # for statements writing parquet files: their total size, number and row groups
+    bytes_written: tp.Optional[int] = None
+    files_written: tp.Optional[int] = None
+    row_groups_written: tp.Optional[int] = None
+
+
 @dataclass
 class ParquetHandle:
     db: duckdb.DuckDBPyConnection
     fs: fs.base.FS
+    # file duckdb writes the profile of each query to, while profiling
+    profile_output: tp.Optional[str] = None
+    profiles: tp.List[tp.Dict[str, tp.Any]] = field(default_factory=list)
 
     def close(self):
         self.db.close()
@@ -63,6 +314,19 @@ class ParquetConnectionManager(BaseConnectionManager):
     CONN: tp.Optional[duckdb.DuckDBPyConnection] = None
     LOCK = threading.RLock()
     CONNECTION_COUNT = 0
+    # view name -> the parquet scan each registered view currently reads from
+    VIEWS: tp.Dict[str, str] = {}
+    # names that `resolve_views` found no relation for, until views are registered or forgotten
+    UNRESOLVED: tp.Set[str] = set()
+    # rendered name -> (schema, identifier) of the models kept as in-memory duckdb tables
+    TABLES: tp.Dict[str, tp.Tuple[str, str]] = {}
+    # the catalog file that registered views are recorded in, with `persist_catalog`
+    CATALOG: tp.Optional[CatalogFile] = None
+    # parquet footers of the database folder FOOTERS_ROOT, shared by all connections
+    FOOTERS: tp.Optional[FooterCache] = None
+    FOOTERS_ROOT: tp.Optional[str] = None
+    SETTINGS_LOCK = SettingsLock()
+    ADMISSION = AdmissionControl()
 
     @classmethod
     def open(cls, connection: Connection):
@@ -73,19 +337,42 @@ class ParquetConnectionManager(BaseConnectionManager):
             cls.FS = connection.credentials.create_fs_interface()
 
         with cls.LOCK:
+            credentials = connection.credentials
+            if cls.FOOTERS is None or cls.FOOTERS_ROOT != credentials.database:
+                cls.FOOTERS = FooterCache(
+                    maxsize=credentials.footer_cache_size, opener=credentials.footer_opener()
+                )
+                cls.FOOTERS_ROOT = credentials.database
+                if credentials.persist_footer_cache:
+                    cls.FOOTERS.load(cls.FS)
+
+            reload = cls.CONN is None
             if cls.CONN is None:
                 cls.CONN = duckdb.connect()
-
+                cls.VIEWS = {}
+                cls.UNRESOLVED = set()
+                cls.TABLES = {}
+                if credentials.is_remote:
+                    cls.CONN.execute("install httpfs; load httpfs")
+                    cls.CONN.execute(set_statements(credentials.s3_settings()))
+                if credentials.duckdb_settings():
+                    cls.CONN.execute(set_statements(credentials.duckdb_settings()))
+                if credentials.persist_catalog and credentials.is_remote:
+                    logger.warning("persist_catalog is not supported for remote databases")
+
+            if not credentials.persist_catalog or credentials.is_remote:
+                if cls.CATALOG is not None:
+                    cls.CATALOG.close()
+                    cls.CATALOG = None
+            elif cls.CATALOG is None or cls.CATALOG.database != credentials.database:
+                if cls.CATALOG is not None:
+                    cls.CATALOG.close()
+                cls.CATALOG = CatalogFile(credentials.database)
+                reload = True
+
+            if reload and not credentials.lazy_views:
                 # first connection -- initialize all the existing tables
-                for schema in util.list_schemas_from_fs(cls.FS):
-                    if schema:
-                        cls.CONN.execute(f"create schema if not exists {schema}")
-
-                    relations = util.list_relations_from_fs(
-                        cls.FS, connection.credentials.database, schema
-                    )
-                    for relation in relations:
-                        cls.CONN.execute(relation.register_as_view_cmd())
+                cls.load_views(cls.CONN, cls.FS, credentials.database)
 
         connection.handle = ParquetHandle(db=cls.CONN.cursor(), fs=cls.FS)
         cls.CONNECTION_COUNT += 1
@@ -105,11 +392,239 @@ class ParquetConnectionManager(BaseConnectionManager):
                     # close the filesystem to ensure writes
                     # we keep the in-memory duckdb connection alive so that we don't need to reload metadata
                     if cls.FS is not None:
+                        if cls.FOOTERS is not None and connection.credentials.persist_footer_cache:
+                            cls.FOOTERS.save(cls.FS)
                         cls.FS.close()
                         cls.FS = None
+                    if cls.CATALOG is not None:
+                        cls.CATALOG.close()
 
         return connection
 
+    @classmethod
+    def load_views(
+        cls, cursor: duckdb.DuckDBPyConnection, root_dir: fs.base.FS, database: str
+    ) -> None:
+        """
+        Register views for all relations: those recorded in the catalog file if there is one,
+        otherwise those found by walking the database folder, which (re)builds the catalog
+        """
+        relations = cls.CATALOG.relations() if cls.CATALOG is not None else None
+        if relations is not None:
+            try:
+                cls.register_views(cursor, relations, record=False)
+                return
+            except duckdb.Error as e:
+                # e.g. files removed by other tools
+                logger.debug(f"catalog file out of date, rebuilding it: {e}")
+
+        relations = []
+        for schema in util.list_schemas_from_fs(root_dir):
+            relations.extend(util.list_relations_from_fs(root_dir, database, schema))
+        cls.register_views(cursor, relations, record=False)
+        if cls.CATALOG is not None:
+            cls.CATALOG.replace(relations)
+
+    @classmethod
+    def register_views(
+        cls,
+        cursor: duckdb.DuckDBPyConnection,
+        relations: tp.Iterable[ParquetRelation],
+        force: bool = False,
+        record: bool = True,
+    ) -> None:
+        """
+        Register relations as views with a single batched statement, and record them in the
+        catalog file unless `record` is unset.
+
+        Views that already read from the same parquet scan are skipped unless `force` is set,
+        which is required after the underlying data was rewritten: duckdb views capture the
+        column types at creation time. In-memory tables of the same names are dropped.
+        """
+        with cls.LOCK:
+            cmds = []
+            schemas = {v.split(".")[0] for v in cls.VIEWS if "." in v}
+            pending: tp.Dict[str, ParquetRelation] = {}
+            for relation in relations:
+                if relation.in_memory:
+                    continue
+                name, scan = relation.render(), relation.render_parquet_scan()
+                if name in pending or (not force and cls.VIEWS.get(name) == scan):
+                    continue
+                if relation.schema and f'"{relation.schema}"' not in schemas:
+                    cmds.append(f'create schema if not exists "{relation.schema}"')
+                    schemas.add(f'"{relation.schema}"')
+                if name in cls.TABLES:
+                    cmds.append(f"drop table if exists {name}")
+                cmds.append(relation.register_as_view_cmd())
+                pending[name] = relation
+            if cmds:
+                cursor.execute(";\n".join(cmds))
+                cls.UNRESOLVED.clear()
+                cls.VIEWS.update(
+                    (name, relation.render_parquet_scan()) for name, relation in pending.items()
+                )
+                for name in pending:
+                    cls.TABLES.pop(name, None)
+                if record and cls.CATALOG is not None:
+                    cls.CATALOG.register(pending.values())
+
+    @classmethod
+    def forget_views(cls, schema: tp.Optional[str] = None, name: tp.Optional[str] = None) -> None:
+        """
+        Drop registry entries for views or in-memory tables that were dropped, by name or for a
+        whole schema
+        """
+        with cls.LOCK:
+            cls.UNRESOLVED.clear()
+            registries: tp.List[tp.Dict[str, tp.Any]] = [cls.VIEWS, cls.TABLES]
+            for registry in registries:
+                for view in list(registry):
+                    if view == name or (schema is not None and view.startswith(f'"{schema}".')):
+                        del registry[view]
+            if cls.CATALOG is not None:
+                cls.CATALOG.forget(schema=schema, name=name)
+
+    @classmethod
+    def add_table(cls, relation: ParquetRelation) -> None:
+        """
+        Record a model kept as an in-memory duckdb table
+        """
+        with cls.LOCK:
+            cls.VIEWS.pop(relation.render(), None)
+            if cls.CATALOG is not None:
+                cls.CATALOG.forget(name=relation.render())
+            cls.TABLES[relation.render()] = (relation.schema or "", relation.identifier or "")
+
+    @classmethod
+    def in_memory_tables(cls, schema: str) -> tp.List[str]:
+        """
+        The identifiers of the in-memory tables in a schema
+        """
+        with cls.LOCK:
+            return sorted(ident for s, ident in cls.TABLES.values() if s == (schema or ""))
+
+    @classmethod
+    def footer_cache(cls) -> FooterCache:
+        assert cls.FOOTERS is not None, "footer cache is only available on an open connection"
+        return cls.FOOTERS
+
+    def admission_enabled(self) -> bool:
+        credentials = tp.cast(ParquetCredentials, self.profile.credentials)
+        return credentials.admission_budget_bytes() is not None
+
+    def admit(self, input_bytes: int, name: str = "") -> int:
+        """
+        Wait until a model reading `input_bytes` may start, see `AdmissionControl`.
+        Returns the reservation to pass to `release_admission` when the model is done.
+        """
+        credentials = tp.cast(ParquetCredentials, self.profile.credentials)
+        budget = credentials.admission_budget_bytes()
+        if budget is None or input_bytes < util.parse_bytes(credentials.admission_min_size):
+            return 0
+        logger.debug(f"Waiting to admit {name} reading {input_bytes} bytes")
+        reserved = self.ADMISSION.acquire(input_bytes, budget)
+        logger.debug(f"Admitted {name}")
+        return reserved
+
+    def release_admission(self, reserved: int) -> None:
+        if reserved:
+            self.ADMISSION.release(reserved)
+
+    def apply_settings(self, settings: tp.Dict[str, tp.Any]) -> tp.Optional[tp.Dict[str, tp.Any]]:
+        """
+        Enter a model run, applying its duckdb setting overrides. Returns the previous values of
+        the overridden settings, to be passed to `restore_settings` when the model is done.
+        """
+        if not settings:
+            self.SETTINGS_LOCK.acquire(exclusive=False)
+            return None
+
+        self.SETTINGS_LOCK.acquire(exclusive=True)
+        cur: duckdb.DuckDBPyConnection = self.get_thread_connection().handle.db
+        previous = {}
+        try:
+            for name in settings:
+                previous[name] = cur.execute(f"select current_setting('{name}')").fetchall()[0][0]
+            cur.execute(set_statements(settings))
+        except Exception as e:
+            try:
+                if previous:
+                    cur.execute(set_statements(previous))
+            finally:
+                self.SETTINGS_LOCK.release(exclusive=True)
+            raise dbt.exceptions.RuntimeException(f"Invalid duckdb_settings: {e}")
+        return previous
+
+    def restore_settings(self, previous: tp.Optional[tp.Dict[str, tp.Any]]) -> None:
+        """
+        Leave a model run, restoring the settings returned by `apply_settings`
+        """
+        try:
+            if previous:
+                self.get_thread_connection().handle.db.execute(set_statements(previous))
+        finally:
+            self.SETTINGS_LOCK.release(exclusive=previous is not None)
+
+    def start_profiling(self, output: str) -> None:
+        """
+        Profile every query on this thread's connection, until `stop_profiling` is called.
+        duckdb overwrites `output` with the json profile of each query, which is collected
+        after the query ran.
+        """
+        handle: ParquetHandle = self.get_thread_connection().handle
+        handle.db.execute("pragma enable_profiling='json'")
+        handle.db.execute(f"pragma profiling_output='{output}'")
+        handle.profile_output, handle.profiles = output, []
+
+    def stop_profiling(self) -> tp.List[tp.Dict[str, tp.Any]]:
+        """
+        Stop profiling and return the profiles of the queries run since `start_profiling`
+        """
+        handle: ParquetHandle = self.get_thread_connection().handle
+        handle.db.execute("pragma disable_profiling")
+        if handle.profile_output and os.path.exists(handle.profile_output):
+            os.remove(handle.profile_output)
+        profiles, handle.profile_output, handle.profiles = handle.profiles, None, []
+        return profiles
+
+    @staticmethod
+    def _collect_profile(handle: ParquetHandle) -> None:
+        assert handle.profile_output is not None
+        try:
+            with open(handle.profile_output) as f:
+                handle.profiles.append(json.load(f))
+            os.remove(handle.profile_output)
+        except (OSError, ValueError) as e:
+            logger.debug(f"could not read query profile: {e}")
+
+    def resolve_views(self, sql: str) -> None:
+        """
+        Register views for the not yet registered relations that `sql` refers to.
+
+        Used in `lazy_views` mode, where no views are registered when the connection opens.
+        duckdb's python API offers no replacement scan hook for plain identifiers, so the rendered
+        relation names are picked out of the statement instead. Names that are no relation, such
+        as quoted columns, are remembered so that they are not looked up on every statement.
+        """
+        assert self.FS is not None
+        database = self.profile.credentials.database
+        relations = []
+        unresolved = set()
+        for schema, identifier in util.referenced_relation_names(sql):
+            name = f'"{schema}"."{identifier}"' if schema else f'"{identifier}"'
+            if name in self.VIEWS or name in self.UNRESOLVED:
+                continue
+            relation = util.get_relation_from_fs(self.FS, database, schema, identifier)
+            if relation is not None:
+                relations.append(relation)
+            else:
+                unresolved.add(name)
+        if relations:
+            self.register_views(self.get_thread_connection().handle.db, relations)
+        with self.LOCK:
+            self.UNRESOLVED.update(unresolved)
+
     def cancel(self, connection: Connection):
         pass
 
@@ -139,24 +654,113 @@ class ParquetConnectionManager(BaseConnectionManager):
             raise dbt.exceptions.RuntimeException(str(exc)) from exc
 
     @staticmethod
-    def get_table_from_response(resp: duckdb.DuckDBPyConnection):
-        column_names = [field[0] for field in resp.description]  # type: ignore
-        return agate_helper.table_from_rows(resp.fetchall(), column_names)
+    def get_table_from_response(
+        resp: duckdb.DuckDBPyConnection, limit: tp.Optional[int] = None
+    ) -> agate.Table:
+        """
+        Stream the result as arrow record batches into an agate table, typed from the arrow
+        schema. At most `limit` rows are materialized as python objects.
+        """
+        if resp.description is None:
+            return agate_helper.empty_table()
+        reader = resp.fetch_record_batch(ARROW_BATCH_ROWS)
+        rows: tp.List[tp.Tuple[tp.Any, ...]] = []
+        for batch in reader:
+            if limit is not None and len(rows) + batch.num_rows > limit:
+                logger.warning(f"Query result truncated to fetch_max_rows={limit} rows")
+                batch = batch.slice(0, limit - len(rows))
+            rows.extend(zip(*(column.to_pylist() for column in batch.columns)))
+            if limit is not None and len(rows) >= limit:
+                ParquetConnectionManager.discard_result(resp)
+                break
+        return agate.Table(
+            rows, reader.schema.names, [agate_type(field.type) for field in reader.schema]
+        )
+
+    @staticmethod
+    def discard_result(cur: duckdb.DuckDBPyConnection) -> None:
+        """
+        Drop the unread rest of a result that was only partially fetched. duckdb refuses
+        multi-statement queries on a cursor whose previous result is still pending. Running, and
+        fetching, any single statement releases it without reading it to the end.
+        """
+        cur.execute("select 1").fetchall()
+
+    def execute_arrow(self, sql: str) -> pyarrow.RecordBatchReader:
+        """
+        Run `sql` and return a reader streaming the result as arrow record batches
+        """
+        cur: duckdb.DuckDBPyConnection = self.get_thread_connection().handle.db
+        try:
+            if tp.cast(ParquetCredentials, self.profile.credentials).lazy_views:
+                self.resolve_views(sql)
+            return cur.execute(sql).fetch_record_batch(ARROW_BATCH_ROWS)
+        except Exception as e:
+            raise dbt.exceptions.RuntimeException(str(e))
 
     def execute(
         self, sql: str, auto_begin: bool = False, fetch: bool = False
     ) -> tp.Tuple[AdapterResponse, agate.Table]:
-        cur: duckdb.DuckDBPyConnection = self.get_thread_connection().handle.db
+        handle: ParquetHandle = self.get_thread_connection().handle
+        cur: duckdb.DuckDBPyConnection = handle.db
+        rows_affected = None
         try:
+            if tp.cast(ParquetCredentials, self.profile.credentials).lazy_views:
+                self.resolve_views(sql)
+            start = time.perf_counter()
             r = cur.execute(sql)
             if fetch:
-                table = self.get_table_from_response(r)
+                limit = tp.cast(ParquetCredentials, self.profile.credentials).fetch_max_rows
+                table = self.get_table_from_response(r, limit)
             else:
                 table = agate_helper.empty_table()
+                # copy, insert and create table as report the number of rows written
+                if [d[0] for d in r.description or []] == ["Count"]:
+                    rows_affected = sum(row[0] for row in r.fetchall())
+            duration = time.perf_counter() - start
+            if handle.profile_output:
+                self._collect_profile(handle)
 
         except Exception as e:
             raise dbt.exceptions.RuntimeException(str(e))
 
-        message = "OK"
-        response = AdapterResponse(_message=message)
+        written = self.written_files(handle.fs, sql)
+        code = "COPY" if written else None
+        if written:
+            # duckdb reports no row count for partitioned writes
+            rows_affected = written.pop("rows_written")
+        response = ParquetAdapterResponse(
+            _message=f"{code or 'OK'} {rows_affected}" if rows_affected is not None else "OK",
+            code=code,
+            rows_affected=rows_affected,
+            duration=duration,
+            process_peak_memory=util.peak_memory_bytes(),
+            **written,
+        )
         return response, table
+
+    def written_files(self, root_dir: fs.base.FS, sql: str) -> tp.Dict[str, int]:
+        """
+        Rows, size, number and row groups of the parquet files written by the `copy` statements in
+        `sql`, read from their footers
+        """
+        database = self.profile.credentials.database
+        infos: tp.List[FooterInfo] = []
+        for target in _COPY_TARGET_RE.findall(sql):
+            if not target.startswith(database + "/"):
+                continue
+            path = target[len(database) + 1 :]
+            if not root_dir.exists(path):
+                continue
+            files = (
+                root_dir.walk.files(path, filter=["*.parquet"]) if root_dir.isdir(path) else [path]
+            )
+            infos.extend(self.footer_cache().get(root_dir, file) for file in files)
+        if not infos:
+            return {}
+        return {
+            "rows_written": sum(info.num_rows for info in infos),
+            "bytes_written": sum(info.size for info in infos),
+            "files_written": len(infos),
+            "row_groups_written": sum(info.num_row_groups for info in infos),
+        }
@@ -1,25 +1,62 @@
+import json
 import os
 import subprocess
 import typing as tp
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import agate
 import duckdb
 import fs.base
 import fs.errors
+import fs.path
+import pyarrow
+import pyarrow.ipc
 
 import dbt.exceptions
+from . import profiling
 from . import util
 from .column import ParquetColumn
+from .metadata import FooterInfo
 from .relation import ParquetRelation
 from dbt.adapters.base import available
 from dbt.adapters.base import BaseAdapter
 from dbt.adapters.base import BaseRelation
 from dbt.adapters.base import RelationType
+from dbt.adapters.base.impl import log_code_execution
 from dbt.adapters.parquet import ParquetConnectionManager
+from dbt.adapters.parquet.connections import ParquetAdapterResponse
+from dbt.clients import agate_helper
+from dbt.contracts.connection import AdapterResponse
 from dbt.events import AdapterLogger
+from dbt.events.functions import get_invocation_id
 
 logger = AdapterLogger("Parquet")
 
+# parquet compression codecs supported by duckdb's writer
+COMPRESSION_CODECS = ["snappy", "zstd", "gzip", "uncompressed"]
+
+# formats models are written in: parquet, or parquet plus an Arrow IPC copy for other readers
+FILE_FORMATS = ["parquet", "both"]
+
+CATALOG_STATS = ["num_rows", "num_bytes", "num_row_groups", "compression", "arrow_bytes"]
+CATALOG_COLUMNS = [
+    "table_database",
+    "table_schema",
+    "table_name",
+    "table_type",
+    "table_comment",
+    "column_name",
+    "column_index",
+    "column_type",
+    "column_comment",
+    "table_owner",
+] + [
+    f"stats:{stat}:{part}"
+    for stat in CATALOG_STATS
+    for part in ("label", "value", "description", "include")
+]
+
 
 class ParquetAdapter(BaseAdapter):
     ConnectionManager = ParquetConnectionManager
@@ -42,6 +79,103 @@ class ParquetAdapter(BaseAdapter):
     def is_cancelable(cls):
         return False
 
+    def pre_model_hook(self, config: tp.Any) -> tp.Any:
+        """
+        Wait for admission, based on the size of the model's inputs, then apply the model's
+        `duckdb_settings` overrides, e.g. `threads` or `memory_limit`, and start profiling
+        if `query_profiling` is enabled
+        """
+        model = config.model
+        reserved = 0
+        if self.connections.admission_enabled():
+            input_bytes = self.estimate_input_bytes(getattr(model, "compiled_code", None) or "")
+            reserved = self.connections.admit(input_bytes, model.unique_id)
+        try:
+            settings = self.connections.apply_settings(config.get("duckdb_settings") or {})
+        except Exception:
+            self.connections.release_admission(reserved)
+            raise
+        profile_queries = self.config.credentials.query_profiling
+        if profile_queries:
+            os.makedirs(self._profiles_dir(), exist_ok=True)
+            output = os.path.join(self._profiles_dir(), f".{model.unique_id}.query.json")
+            self.connections.start_profiling(output)
+        return reserved, settings, profile_queries
+
+    def post_model_hook(self, config: tp.Any, context: tp.Any) -> None:
+        reserved, settings, profile_queries = context
+        try:
+            if profile_queries:
+                self._write_model_profile(config.model, self.connections.stop_profiling())
+            self.connections.restore_settings(settings)
+        finally:
+            self.connections.release_admission(reserved)
+
+    def _profiles_dir(self) -> str:
+        return os.path.join(self.config.project_root, self.config.target_path, "profiles")
+
+    def _write_model_profile(self, model: tp.Any, profiles: tp.List[tp.Dict[str, tp.Any]]) -> None:
+        input_bytes = self.input_bytes(getattr(model, "compiled_code", None) or "")
+        document = {
+            "unique_id": model.unique_id,
+            "invocation_id": get_invocation_id(),
+            "summary": profiling.summarize(profiles, input_bytes),
+            "profiles": profiles,
+        }
+        with open(os.path.join(self._profiles_dir(), f"{model.unique_id}.json"), "w") as f:
+            json.dump(document, f, indent=2)
+
+    @available
+    def profile_report(self) -> agate.Table:
+        """
+        Rank the models of the last profiled run by their total query time, with the time spent
+        in scans, joins and writes
+        """
+        documents = []
+        if os.path.isdir(self._profiles_dir()):
+            for name in os.listdir(self._profiles_dir()):
+                if name.endswith(".json") and not name.startswith("."):
+                    path = os.path.join(self._profiles_dir(), name)
+                    with open(path) as f:
+                        documents.append((os.path.getmtime(path), json.load(f)))
+        last_invocation = (
+            max(documents, key=lambda d: d[0])[1]["invocation_id"] if documents else None
+        )
+        rows = []
+        for _, document in documents:
+            if document["invocation_id"] != last_invocation:
+                continue
+            summary = document["summary"]
+            by_category = summary["time_by_category"]
+            rows.append(
+                (document["unique_id"], summary["total_time"])
+                + (by_category["scan"], by_category["join"], by_category["write"])
+                + (sum(summary["input_bytes"].values()),)
+            )
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return agate_helper.table_from_rows(
+            rows,
+            ["unique_id", "total_time", "scan_time", "join_time", "write_time", "input_bytes"],
+        )
+
+    def input_bytes(self, sql: str) -> tp.Dict[str, int]:
+        """
+        The on-disk size of the parquet file or dataset of each relation that `sql` refers to,
+        according to their (cached) parquet footers
+        """
+        root_dir = self.get_fs_handle()
+        sizes = {}
+        for relation in util.referenced_relations(root_dir, None, sql):
+            _, infos = self._read_footers(root_dir, relation)
+            sizes[relation.render_resource_path()] = sum(info.size for info in infos)
+        return sizes
+
+    def estimate_input_bytes(self, sql: str) -> int:
+        """
+        Estimate the input size of a query, as the on-disk size of the relations it refers to
+        """
+        return sum(self.input_bytes(sql).values())
+
     def get_conn_handle(self) -> duckdb.DuckDBPyConnection:
         """
         Get a handle to the in-memory duckdb connection
@@ -56,16 +190,61 @@ class ParquetAdapter(BaseAdapter):
         handle = self.connections.get_thread_connection().handle
         return handle.fs
 
+    def _move_resource(self, root_dir: fs.base.FS, src_path: str, dst_path: str) -> None:
+        workers = self.config.credentials.s3_upload_threads
+        util.move_resource(root_dir, src_path, dst_path, workers=workers)
+
+    def resolve_relation(self, relation: ParquetRelation) -> ParquetRelation:
+        """
+        Return the relation with its on-disk layout (single file or partitioned dataset)
+        filled in from the filesystem, or marked as an in-memory table. Relations that do not
+        exist are returned unchanged.
+        """
+        if relation.render() in self.connections.TABLES:
+            return relation.incorporate(in_memory=True, partition_depth=None)
+        found = util.get_relation_from_fs(
+            self.get_fs_handle(),
+            relation.database,
+            relation.schema or "",
+            relation.identifier,  # type: ignore[arg-type]
+        )
+        if found is None:
+            return relation
+        return relation.incorporate(
+            partition_depth=found.partition_depth, change_files=found.change_files
+        )
+
     def drop_relation(self, relation: ParquetRelation) -> None:
         is_cached = self._schema_is_cached(relation.database, relation.schema)  # type: ignore[arg-type]
         if is_cached:
             self.cache_dropped(relation)
 
-        path = relation.render_path()
+        relation = self.resolve_relation(relation)
+        if relation.in_memory:
+            self.execute(f"drop table if exists {relation.render()}")
+            self.connections.forget_views(name=relation.render())
+            return
+        self._remove_data(relation)
+        self.execute(f"drop view if exists {relation.render()}")
+        self.connections.forget_views(name=relation.render())
+
+    def _remove_data(self, relation: ParquetRelation) -> None:
+        path = relation.render_resource_path()
+        root_dir = self.get_fs_handle()
+        self.connections.footer_cache().invalidate(path)
         try:
-            self.get_fs_handle().remove(path)
+            if relation.is_dataset:
+                root_dir.removetree(path)
+            else:
+                root_dir.remove(path)
+                if root_dir.exists(self._seed_marker_path(relation)):
+                    root_dir.remove(self._seed_marker_path(relation))
         except fs.errors.ResourceNotFound:
             pass
+        if root_dir.exists(self._build_marker_path(relation)):
+            root_dir.remove(self._build_marker_path(relation))
+        if root_dir.exists(relation.render_arrow_resource_path()):
+            root_dir.remove(relation.render_arrow_resource_path())
 
     def truncate_relation(self, relation: ParquetRelation) -> None:
         raise dbt.exceptions.NotImplementedException(
@@ -78,11 +257,396 @@ class ParquetAdapter(BaseAdapter):
         if from_relation.render() == to_relation.render():
             return
         self.cache_renamed(from_relation, to_relation)
-        self.get_fs_handle().move(
+        from_relation = self.resolve_relation(from_relation)
+        if from_relation.in_memory:
+            self.execute(
+                f'alter table {from_relation.render()} rename to "{to_relation.identifier}"'
+            )
+            self.connections.forget_views(name=from_relation.render())
+            self.connections.add_table(to_relation)
+            return
+        to_relation = to_relation.incorporate(partition_depth=from_relation.partition_depth)
+        self._move_resource(
+            self.get_fs_handle(),
+            from_relation.render_resource_path(),
+            to_relation.render_resource_path(),
+        )
+        self.connections.footer_cache().rename(
             from_relation.render_resource_path(), to_relation.render_resource_path()
         )
+        if self.get_fs_handle().exists(from_relation.render_arrow_resource_path()):
+            self._move_resource(
+                self.get_fs_handle(),
+                from_relation.render_arrow_resource_path(),
+                to_relation.render_arrow_resource_path(),
+            )
         self.execute(f"drop view if exists {from_relation.render()}")
-        self.execute(to_relation.register_as_view_cmd())
+        self.connections.forget_views(name=from_relation.render())
+        self.register_views([to_relation])
+
+    def register_views(self, relations: tp.List[ParquetRelation], force: bool = True) -> None:
+        """
+        (Re-)register the relations as views in one statement. Views must be re-registered
+        whenever their data was rewritten, which is why `force` is the default.
+        """
+        self.connections.register_views(self.get_conn_handle(), relations, force=force)
+
+    @available
+    def prepare_in_memory(self, relation: ParquetRelation) -> ParquetRelation:
+        """
+        Make way for a model kept as an in-memory duckdb table (`persist: false`): the view and
+        parquet data of an earlier, persisted version are dropped so that they are never read
+        stale. Returns the in-memory relation to create the table as.
+        """
+        existing = self.resolve_relation(relation)
+        if not existing.in_memory:
+            self.execute(f"drop view if exists {relation.render()}")
+            self._remove_data(existing)
+        relation = relation.incorporate(in_memory=True, partition_depth=None)
+        self.connections.add_table(relation)
+        return relation
+
+    @available
+    def prepare_dataset(self, relation: ParquetRelation) -> str:
+        """
+        Create an empty folder for a dataset about to be written, and return the path of a
+        fresh part file inside it for writers that do not partition their output.
+        """
+        root_dir = self.get_fs_handle()
+        path = relation.render_resource_path()
+        self.connections.footer_cache().invalidate(path)
+        if root_dir.exists(path):
+            root_dir.removetree(path)
+        root_dir.makedirs(path)
+        return f"{relation.render_path()}/part-{uuid.uuid4().hex}.parquet"
+
+    @available
+    def append_staged(self, staging_relation: ParquetRelation, relation: ParquetRelation) -> None:
+        """
+        Move every part file of the staging dataset into the existing dataset, keeping the
+        partition folders they were written to. Existing parts are left untouched.
+        """
+        root_dir = self.get_fs_handle()
+        staging_path = fs.path.abspath(staging_relation.render_resource_path())
+        target_path = fs.path.abspath(relation.render_resource_path())
+        parts = self._staged_parts(staging_relation)
+        if not parts:
+            # no new rows: nothing to check or move
+            if root_dir.exists(staging_path):
+                root_dir.removetree(staging_path)
+            return
+        if relation.partition_depth:
+            self._check_partition_schema(staging_relation, relation)
+        footers = self.connections.footer_cache()
+        for path in parts:
+            partition = fs.path.dirname(fs.path.relativefrom(staging_path, path))
+            target_dir = fs.path.join(target_path, partition)
+            root_dir.makedirs(target_dir, recreate=True)
+            part_path = fs.path.join(target_dir, f"part-{uuid.uuid4().hex}.parquet")
+            self._move_resource(root_dir, path, part_path)
+            footers.rename(path, part_path)
+        root_dir.removetree(staging_path)
+        self.register_views([relation])
+
+    def _staged_parts(self, staging_relation: ParquetRelation) -> tp.List[str]:
+        """
+        The part files of a staging dataset. duckdb writes no files at all for a partitioned
+        copy of zero rows, so the list is empty when there are no new rows.
+        """
+        root_dir = self.get_fs_handle()
+        staging_path = fs.path.abspath(staging_relation.render_resource_path())
+        if not root_dir.isdir(staging_path):
+            return []
+        return list(root_dir.walk.files(staging_path, filter=["*.parquet"]))
+
+    def _check_partition_schema(
+        self, staging_relation: ParquetRelation, relation: ParquetRelation
+    ) -> None:
+        staged = [c.name for c in self.get_columns_in_relation(staging_relation)]
+        existing = [c.name for c in self.get_columns_in_relation(relation)]
+        if existing and staged != existing:
+            raise dbt.exceptions.RuntimeException(
+                f"New rows for partitioned relation {relation} have columns {staged}, "
+                f"but the existing parts have {existing}. Partitioned datasets must keep "
+                "a consistent schema, run with --full-refresh to rebuild it."
+            )
+
+    @available
+    def swap_staged(self, staging_relation: ParquetRelation, relation: ParquetRelation) -> None:
+        """
+        Replace the relation with the staged data, whatever the layout of the existing data.
+
+        A single file is replaced by one atomic rename, so readers never see it missing. A folder
+        cannot be replaced in one rename, so an existing dataset is first moved aside.
+        The relation's view is registered once, after the swap.
+        """
+        root_dir = self.get_fs_handle()
+        existing = self.resolve_relation(relation)
+        existing_path = existing.render_resource_path()
+        target_path = relation.render_resource_path()
+        exists = root_dir.exists(existing_path)
+
+        backup = None
+        if exists and existing.is_dataset and existing_path == target_path:
+            backup = existing.backup_relation()
+            self._remove_data(backup)
+            self._move_resource(root_dir, existing_path, backup.render_resource_path())
+        footers = self.connections.footer_cache()
+        footers.invalidate(target_path)
+        self._move_resource(root_dir, staging_relation.render_resource_path(), target_path)
+        footers.rename(staging_relation.render_resource_path(), target_path)
+        self.register_views([relation])
+
+        if backup is not None:
+            self._remove_data(backup)
+        elif exists and existing_path != target_path:
+            # the layout changed, e.g. from a single file to a partitioned dataset
+            self._remove_data(existing)
+
+    @available
+    def overwrite_partitions(
+        self,
+        staging_relation: ParquetRelation,
+        relation: ParquetRelation,
+        partitions: tp.Optional[tp.List[str]] = None,
+    ) -> None:
+        """
+        Swap every partition folder of the staging dataset in for the same partition of the
+        relation. All other partitions are left byte-for-byte untouched.
+
+        `partitions` optionally lists further partition paths (`key=value/...`) that were
+        rewritten; those that are not present in the staging dataset end up removed. A staging
+        dataset without part files (no new rows) has nothing to overwrite.
+        """
+        if self._staged_parts(staging_relation):
+            self._check_partition_schema(staging_relation, relation)
+        root_dir = self.get_fs_handle()
+        staging_path = fs.path.abspath(staging_relation.render_resource_path())
+        target_path = fs.path.abspath(relation.render_resource_path())
+        backup_path = fs.path.abspath(relation.backup_relation().render_resource_path())
+        depth = relation.partition_depth or 0
+
+        staged = [
+            fs.path.relativefrom(staging_path, d)
+            for d in root_dir.walk.dirs(staging_path, max_depth=depth)
+            if fs.path.relativefrom(staging_path, d).count("/") == depth - 1
+        ]
+        if root_dir.exists(backup_path):
+            root_dir.removetree(backup_path)
+        for partition in sorted(set(staged) | set(partitions or [])):
+            target = fs.path.join(target_path, partition)
+            self.connections.footer_cache().invalidate(target)
+            if root_dir.exists(target):
+                backup = fs.path.join(backup_path, partition)
+                root_dir.makedirs(fs.path.dirname(backup), recreate=True)
+                self._move_resource(root_dir, target, backup)
+            if partition in staged:
+                root_dir.makedirs(fs.path.dirname(target), recreate=True)
+                self._move_resource(root_dir, fs.path.join(staging_path, partition), target)
+        for path in (staging_path, backup_path):
+            if root_dir.exists(path):
+                root_dir.removetree(path)
+        self.register_views([relation])
+
+    @available
+    def merge_partitions(
+        self,
+        batch_table: str,
+        staging_relation: ParquetRelation,
+        relation: ParquetRelation,
+        unique_key: tp.Union[str, tp.List[str]],
+        partition_by: tp.Optional[tp.List[str]] = None,
+        copy_options: str = "format 'parquet'",
+        order_by: tp.Optional[tp.Union[str, tp.List[str]]] = None,
+    ) -> None:
+        """
+        Upsert the rows of the (temporary) `batch_table` into the relation by `unique_key`.
+
+        Only the partitions that hold new rows, or existing rows with a key present in the batch,
+        are rewritten -- each with its existing rows minus the replaced keys, plus the new rows.
+        An unpartitioned relation is rewritten as a whole.
+        """
+        keys = [unique_key] if isinstance(unique_key, str) else list(unique_key)
+        partition_cols: tp.List[str] = partition_by or []
+        conn = self.get_conn_handle()
+        batch = conn.execute(f"select * from {batch_table} limit 0")
+        columns = [field[0] for field in batch.description]  # type: ignore
+
+        def select_list(alias: str) -> str:
+            return ", ".join(
+                f"{alias}.{self.quote(c)}::varchar as {self.quote(c)}"
+                if c in partition_cols
+                else f"{alias}.{self.quote(c)}"
+                for c in columns
+            )
+
+        key_match = " and ".join(f"b.{self.quote(k)} = t.{self.quote(k)}" for k in keys)
+        replaced = f"exists (select 1 from {batch_table} b where {key_match})"
+        existing = f"select {select_list('t')} from {relation.render()} t where not {replaced}"
+        partitions: tp.List[str] = []
+        globs: tp.List[str] = []
+
+        if partition_cols:
+            partition_values = ", ".join(
+                f"{self.quote(c)}::varchar as {self.quote(c)}" for c in partition_cols
+            )
+            touched = f"""
+                select distinct {partition_values} from {batch_table}
+                union
+                select distinct {partition_values} from {relation.render()} t where {replaced}
+            """
+            partitions = [
+                "/".join(f"{col}={value}" for col, value in zip(partition_cols, row))
+                for row in conn.execute(touched).fetchall()
+            ]
+            # only read back the partitions being rewritten
+            root_dir = self.get_fs_handle()
+            globs = [
+                f"'{relation.render_path()}/{p}/*.parquet'"
+                for p in partitions
+                if root_dir.exists(f"{relation.render_resource_path()}/{p}")
+            ]
+            scan = f"parquet_scan([{', '.join(globs)}], hive_partitioning=1)"
+            existing = f"select {select_list('t')} from {scan} t where not {replaced}"
+
+        merged = f"select {select_list('b')} from {batch_table} b"
+        if not partition_cols or globs:
+            merged += f" union all {existing}"
+        staging_relation = staging_relation.incorporate(partition_depth=len(partition_cols))
+        part_path = self.prepare_dataset(staging_relation)
+        target = staging_relation.render_path() if partition_cols else part_path
+        if order_by:
+            order_by = [order_by] if isinstance(order_by, str) else order_by
+            merged = f"select * from ({merged}) order by {', '.join(order_by)}"
+        conn.execute(f"copy ({merged}) to '{target}' ({copy_options})")
+
+        if partition_cols:
+            self.overwrite_partitions(staging_relation, relation, partitions)
+        else:
+            self.swap_staged(staging_relation, relation)
+
+    @available
+    def prepare_snapshot(self, relation: ParquetRelation) -> ParquetRelation:
+        """
+        Return the snapshot's dataset relation. A snapshot stored as a single parquet file, as
+        written by dbt's default snapshot materialization, is moved into a dataset folder first.
+        """
+        existing = self.resolve_relation(relation)
+        if existing.is_dataset or existing.in_memory:
+            return existing
+        if self.get_fs_handle().isfile(existing.render_resource_path()):
+            self._move_into_dataset(existing, relation)
+        return relation
+
+    def _move_into_dataset(self, existing: ParquetRelation, relation: ParquetRelation) -> None:
+        """
+        Turn the single parquet file of `existing` into the first part file of the unpartitioned
+        dataset `relation`, by a rename
+        """
+        root_dir = self.get_fs_handle()
+        path = existing.render_resource_path()
+        dataset_path = relation.render_resource_path()
+        root_dir.makedirs(dataset_path, recreate=True)
+        part_path = fs.path.join(dataset_path, f"part-{uuid.uuid4().hex}.parquet")
+        self._move_resource(root_dir, path, part_path)
+        self.connections.footer_cache().rename(path, part_path)
+        self.register_views([relation])
+
+    @available
+    def convert_layout(self, relation: ParquetRelation, copy_options: str) -> None:
+        """
+        Rewrite the existing data of an incremental model in the layout of `relation` before
+        new rows are added to it. The data was written as a single file, e.g. by the table
+        materialization, or with other partition columns, while `is_incremental()` already holds
+        and the model only selects the new rows. A single file becomes the first part file of an
+        unpartitioned dataset by a rename, other layouts are copied with `copy_options`.
+        """
+        existing = self.resolve_relation(relation)
+        if existing.in_memory:
+            raise dbt.exceptions.RuntimeException(
+                f"{relation} is an in-memory table, run with --full-refresh to write it as an "
+                "incremental dataset"
+            )
+        if existing.partition_depth == relation.partition_depth:
+            return
+        if not existing.is_dataset and not relation.partition_depth:
+            self._move_into_dataset(existing, relation)
+            return
+        staging_relation = relation.staging_relation()
+        self._remove_data(staging_relation)
+        part_path = self.prepare_dataset(staging_relation)
+        target = staging_relation.render_path() if relation.partition_depth else part_path
+        try:
+            self.execute(
+                f"copy (select * from {existing.render()}) to '{target}' ({copy_options})"
+            )
+        except dbt.exceptions.RuntimeException as e:
+            self._remove_data(staging_relation)
+            raise dbt.exceptions.RuntimeException(
+                f"Could not rewrite {relation} with its new partition columns, run with "
+                f"--full-refresh to rebuild it: {e}"
+            )
+        self.swap_staged(staging_relation, relation)
+
+    @available
+    def snapshot_change_path(self, relation: ParquetRelation) -> str:
+        """
+        The path of a new change file for a snapshot dataset
+        """
+        return f"{relation.render_path()}/change-{uuid.uuid4().hex}.parquet"
+
+    @available
+    def commit_snapshot_changes(
+        self, relation: ParquetRelation, consolidate_after: tp.Optional[int] = None
+    ) -> None:
+        """
+        Register the view of a snapshot dataset that a change file was just written to. Change
+        files without rows are dropped, and once there are `consolidate_after` change files, the
+        current state of the snapshot is rewritten as a single part file without changes.
+        """
+        root_dir = self.get_fs_handle()
+        footers = self.connections.footer_cache()
+        path = relation.render_resource_path()
+        changes = []
+        for file in root_dir.walk.files(path, filter=["change-*.parquet"]):
+            if footers.get(root_dir, file).num_rows:
+                changes.append(file)
+            else:
+                footers.invalidate(file)
+                root_dir.remove(file)
+        relation = relation.incorporate(partition_depth=0, change_files=bool(changes))
+        if not consolidate_after or len(changes) < consolidate_after:
+            self.register_views([relation])
+            return
+
+        staging_relation = relation.staging_relation().incorporate(change_files=False)
+        part_path = self.prepare_dataset(staging_relation)
+        self.connections.execute(
+            f"""
+            copy (select * from {relation.render_parquet_scan()})
+            to '{part_path}' ({self.copy_options()})
+            """
+        )
+        self.swap_staged(staging_relation, relation.incorporate(change_files=False))
+
+    @available
+    def fetch_arrow(self, sql: str, limit: tp.Optional[int] = None) -> pyarrow.Table:
+        """
+        Run `sql` and return the result as an arrow table, without converting any values to
+        python objects. With `limit`, stop reading the result after that many rows.
+        """
+        reader = self.connections.execute_arrow(sql)
+        if limit is None:
+            return reader.read_all()
+        batches = []
+        rows = 0
+        for batch in reader:
+            batches.append(batch.slice(0, limit - rows))
+            rows += batches[-1].num_rows
+            if rows >= limit:
+                self.connections.discard_result(self.get_conn_handle())
+                break
+        return pyarrow.Table.from_batches(batches, schema=reader.schema)
 
     @available
     def list_schemas(self, database: str) -> tp.List[str]:
@@ -95,12 +659,166 @@ class ParquetAdapter(BaseAdapter):
         return schema in self.list_schemas(database)
 
     def get_columns_in_relation(self, relation: ParquetRelation) -> tp.List[ParquetColumn]:
-        conn = self.get_conn_handle()
-        if not os.path.exists(relation.render_path()):
+        """
+        Read the columns from the parquet footers only, through the footer cache.
+        In-memory tables are described by duckdb.
+        """
+        relation = self.resolve_relation(relation)
+        if relation.in_memory:
+            reader = self.connections.execute_arrow(f"select * from {relation.render()} limit 0")
+            return [ParquetColumn(column=f.name, dtype=f.type) for f in reader.read_all().schema]
+        root_dir = self.get_fs_handle()
+        if not root_dir.exists(relation.render_resource_path()):
             return []
-        q = f"select * from {relation.render_parquet_scan()} LIMIT 0"
-        as_arrow = conn.execute(q).arrow()
-        return [ParquetColumn(column=f.name, dtype=f.type) for f in as_arrow.schema]
+        schema, _ = self._read_footers(root_dir, relation)
+        return [ParquetColumn(column=f.name, dtype=f.type) for f in schema]
+
+    def _read_footers(
+        self, root_dir: fs.base.FS, relation: ParquetRelation
+    ) -> tp.Tuple[pyarrow.Schema, tp.List[FooterInfo]]:
+        """
+        Return the footers of all files of an existing relation, and the schema duckdb reads
+        the relation with. For datasets that is the columns of all part files by name,
+        followed by the hive partition keys, which are read back as strings.
+        """
+        footers = self.connections.footer_cache()
+        path = relation.render_resource_path()
+        if not relation.is_dataset:
+            info = footers.get(root_dir, path)
+            return info.schema, [info]
+
+        files = sorted(root_dir.walk.files(path, filter=["*.parquet"]))
+        infos = [footers.get(root_dir, file) for file in files]
+        fields: tp.Dict[str, pyarrow.Field] = {}
+        for info in infos:
+            for field in info.schema:
+                fields.setdefault(field.name, field)
+        if files:
+            partition = fs.path.dirname(fs.path.relativefrom(fs.path.abspath(path), files[0]))
+            for key in fs.path.iteratepath(partition):
+                name = key.split("=", 1)[0]
+                fields[name] = pyarrow.field(name, pyarrow.string())
+        return pyarrow.schema(list(fields.values())), infos
+
+    @available
+    def catalog_for_schemas(self, database: str, schemas: tp.Iterable[str]) -> agate.Table:
+        """
+        Build the catalog for the given schemas from the parquet footers, one row per column,
+        with table statistics. Only the requested schema folders are listed, and the schemas
+        are read in parallel.
+        """
+        root_dir = self.get_fs_handle()
+        with ThreadPoolExecutor(max_workers=max(self.config.threads, 1)) as pool:
+            results = pool.map(
+                lambda schema: self._catalog_rows(root_dir, database, schema), sorted(schemas)
+            )
+            rows = [row for schema_rows in results for row in schema_rows]
+        return agate_helper.table_from_rows(
+            rows,
+            CATALOG_COLUMNS,
+            text_only_columns=["table_database", "table_schema", "table_name"],
+        )
+
+    def _catalog_rows(
+        self, root_dir: fs.base.FS, database: str, schema: str
+    ) -> tp.List[tp.Tuple[tp.Any, ...]]:
+        rows = []
+        for relation in util.list_relations_from_fs(root_dir, database, schema):
+            columns, infos = self._read_footers(root_dir, relation)
+            codecs = ", ".join(sorted({i.compression for i in infos if i.compression}))
+            arrow_path = relation.render_arrow_resource_path()
+            arrow_bytes = root_dir.getsize(arrow_path) if root_dir.exists(arrow_path) else None
+            stats: tp.Tuple[tp.Any, ...] = (
+                *("Row count", sum(i.num_rows for i in infos), "Number of rows", True),
+                *("Bytes", sum(i.size for i in infos), "Size of the parquet files", True),
+                *("Row groups", sum(i.num_row_groups for i in infos), "Parquet row groups", True),
+                *("Compression", codecs, "Compression codec of the column chunks", True),
+                *(
+                    "Arrow bytes",
+                    arrow_bytes,
+                    "Size of the Arrow IPC copy",
+                    arrow_bytes is not None,
+                ),
+            )
+            for index, field in enumerate(columns, start=1):
+                rows.append(
+                    (database, schema, relation.identifier, "table", "")
+                    + (field.name, index, str(field.type), "", "")
+                    + stats
+                )
+        return rows
+
+    def _stats_relation(self, model: tp.Any) -> tp.Optional[ParquetRelation]:
+        """
+        The relation a generic test runs on, if its parquet footers describe exactly the rows the
+        test sees. Not so for tests with a `where` config, whose model is a subquery, nor for
+        in-memory tables and snapshots with change files.
+        """
+        if not isinstance(model, ParquetRelation):
+            return None
+        relation = self.resolve_relation(model)
+        if relation.in_memory or relation.change_files:
+            return None
+        if not self.get_fs_handle().exists(relation.render_resource_path()):
+            return None
+        return relation
+
+    @available
+    def stats_scan(
+        self,
+        model: tp.Any,
+        column_name: str,
+        not_null: bool = False,
+        min_value: tp.Any = None,
+        max_value: tp.Any = None,
+        inclusive: bool = True,
+    ) -> str:
+        """
+        What a generic test of `column_name` still has to scan, after the parquet footer statistics
+        cleared the files they can: those without nulls for `not_null`, and those whose values all
+        lie between `min_value` and `max_value`. That is `model` itself if no file was cleared, and
+        an empty result if all were.
+        """
+        relation = self._stats_relation(model)
+        if relation is None:
+            return str(model)
+        name = column_name.strip('"')
+        root_dir = self.get_fs_handle()
+        footers = self.connections.footer_cache()
+        files = self._relation_files(root_dir, relation)
+        infos = [footers.get(root_dir, file) for file in files]
+        remaining = [
+            (file, info)
+            for file, info in zip(files, infos)
+            if not util.stats_clear(
+                info.column_stats.get(name), not_null, min_value, max_value, inclusive
+            )
+        ]
+        if not remaining:
+            return f"(select * from {model} limit 0)"
+        # a file without the column reads it as nulls, which only a scan of all files does
+        if len(remaining) == len(files) or any(name not in i.schema.names for _, i in remaining):
+            return str(model)
+        database = self.config.credentials.database
+        return relation.render_parquet_scan(
+            files=[f"{database}/{fs.path.relpath(file)}" for file, _ in remaining]
+        )
+
+    @available
+    def stats_row_count(self, model: tp.Any) -> tp.Optional[int]:
+        """
+        The number of rows a generic test sees, from the parquet footers, or None if they do not
+        tell
+        """
+        relation = self._stats_relation(model)
+        if relation is None:
+            return None
+        root_dir = self.get_fs_handle()
+        footers = self.connections.footer_cache()
+        return sum(
+            footers.get(root_dir, file).num_rows
+            for file in self._relation_files(root_dir, relation)
+        )
 
     def expand_column_types(self, goal: ParquetRelation, current: ParquetRelation) -> None:  # type: ignore[override]
         # This is a no-op
@@ -120,12 +838,19 @@ class ParquetAdapter(BaseAdapter):
         pq = schema_relation.include(database=True, schema=True, identifier=False).parquet_table
         schema = pq.schema
         relations = util.list_relations_from_fs(root_dir, schema_relation.database, schema)
-        # if schema:
-        #     self.execute(f"create schema if not exists {schema}")
-
-        for relation in relations:
-            self.execute(relation.register_as_view_cmd())
-        return relations
+        if not self.config.credentials.lazy_views:
+            self.register_views(relations, force=False)
+        in_memory = [
+            ParquetRelation.create(
+                database=schema_relation.database,
+                schema=schema,
+                identifier=identifier,
+                type=RelationType.Table,
+                in_memory=True,
+            )
+            for identifier in self.connections.in_memory_tables(schema)
+        ]
+        return relations + in_memory
 
     def create_schema(self, relation: ParquetRelation) -> None:
         schema_path = relation.include(identifier=False).render_resource_path()
@@ -146,6 +871,7 @@ class ParquetAdapter(BaseAdapter):
         except fs.errors.ResourceNotFound:
             pass
         self.execute(f"drop schema if exists {relation.schema} cascade")
+        self.connections.forget_views(schema=relation.schema)
         self.cache.drop_schema(database, schema)
 
     @available
@@ -153,6 +879,7 @@ class ParquetAdapter(BaseAdapter):
         conn = self.get_conn_handle()
         csv_file = agate_table.original_abspath
         rel = ParquetRelation.create(database, schema, table_name)
+        self.connections.footer_cache().invalidate(rel.render_resource_path())
         conn.execute(
             f"""
             copy
@@ -160,7 +887,151 @@ class ParquetAdapter(BaseAdapter):
             to '{rel.render_path()}' (format 'parquet');
             """
         )
-        conn.execute(rel.register_as_view_cmd())
+        self.register_views([rel])
+
+    @available
+    def load_csv(
+        self,
+        relation: ParquetRelation,
+        csv_path: str,
+        column_types: tp.Optional[tp.Dict[str, str]] = None,
+        full_refresh: bool = False,
+    ) -> ParquetAdapterResponse:
+        """
+        Load a seed csv straight into the relation's parquet file with duckdb's parallel csv reader.
+
+        The load is skipped, with response code SKIP, if the fingerprint of the csv (and column
+        types) matches the one recorded for the existing parquet file.
+        """
+        root_dir = self.get_fs_handle()
+        footers = self.connections.footer_cache()
+        path = relation.render_resource_path()
+        marker = self._seed_marker_path(relation)
+        fingerprint = util.csv_fingerprint(csv_path, column_types)
+
+        if not full_refresh and root_dir.isfile(path) and root_dir.isfile(marker):
+            info = footers.get(root_dir, path)
+            recorded = json.loads(root_dir.readtext(marker))
+            if recorded == {
+                "fingerprint": fingerprint,
+                "size": info.size,
+                "modified": info.modified,
+            }:
+                self.register_views([relation], force=False)
+                return ParquetAdapterResponse(
+                    _message=f"SKIP {info.num_rows}", code="SKIP", rows_affected=info.num_rows
+                )
+
+        types = ", ".join(
+            f"""'{name.replace("'", "''")}': '{dtype}'"""
+            for name, dtype in (column_types or {}).items()
+        )
+        options = "header=true, parallel=true"
+        if types:
+            options += f", types={{{types}}}"
+        staging_relation = relation.staging_relation()
+        response, _ = self.connections.execute(
+            f"""
+            copy
+                (select * from read_csv_auto('{csv_path}', {options}))
+            to '{staging_relation.render_path()}' (format 'parquet')
+            """
+        )
+        self.swap_staged(staging_relation, relation)
+
+        info = footers.get(root_dir, path)
+        root_dir.writetext(
+            marker,
+            json.dumps({"fingerprint": fingerprint, "size": info.size, "modified": info.modified}),
+        )
+        response = tp.cast(ParquetAdapterResponse, response)
+        response.code = "CREATE" if full_refresh else "INSERT"
+        response._message = f"{response.code} {response.rows_affected}"
+        return response
+
+    @available
+    def build_fingerprint(self, sql: str, build_config: tp.Dict[str, tp.Any]) -> tp.Optional[str]:
+        """
+        Fingerprint of a model build: its compiled SQL, the configs that shape the output, and the
+        footers (size, modification time, schema and row counts) of every parquet file it reads.
+        Models reading in-memory tables or files by path, or calling functions such as `now()`,
+        have no fingerprint, as their inputs cannot be fingerprinted.
+        """
+        root_dir = self.get_fs_handle()
+        in_memory = set(self.connections.TABLES.values())
+        inputs = {}
+        if util.referenced_relation_names(sql, known=lambda *name: name in in_memory):
+            return None
+        if util.uncacheable_sql(sql):
+            logger.debug("not caching the build: its SQL reads files by path or is volatile")
+            return None
+        for relation in util.referenced_relations(root_dir, None, sql):
+            _, infos = self._read_footers(root_dir, relation)
+            inputs[relation.render_resource_path()] = [info.to_dict() for info in infos]
+        return util.build_fingerprint({"sql": sql, "config": build_config, "inputs": inputs})
+
+    @available
+    def cached_build(
+        self, relation: ParquetRelation, fingerprint: tp.Optional[str]
+    ) -> tp.Optional[ParquetAdapterResponse]:
+        """
+        If the relation was last built with the same fingerprint and its parquet data was not
+        touched since, re-register its view and return a SKIP response instead of rebuilding it.
+        """
+        root_dir = self.get_fs_handle()
+        marker = self._build_marker_path(relation)
+        relation = self.resolve_relation(relation)
+        if fingerprint is None or relation.in_memory or not root_dir.isfile(marker):
+            return None
+        if not root_dir.exists(relation.render_resource_path()):
+            return None
+        record, rows = self._build_record(root_dir, relation, fingerprint)
+        if json.loads(root_dir.readtext(marker)) != record:
+            return None
+        self.register_views([relation], force=False)
+        return ParquetAdapterResponse(_message=f"SKIP {rows}", code="SKIP", rows_affected=rows)
+
+    @available
+    def record_build(self, relation: ParquetRelation, fingerprint: tp.Optional[str]) -> None:
+        """
+        Record the fingerprint a relation was just built with, next to its parquet data
+        """
+        root_dir = self.get_fs_handle()
+        marker = self._build_marker_path(relation)
+        if fingerprint is None:
+            if root_dir.exists(marker):
+                root_dir.remove(marker)
+            return
+        record, _ = self._build_record(root_dir, self.resolve_relation(relation), fingerprint)
+        root_dir.writetext(marker, json.dumps(record))
+
+    def _build_record(
+        self, root_dir: fs.base.FS, relation: ParquetRelation, fingerprint: str
+    ) -> tp.Tuple[tp.Dict[str, str], int]:
+        """
+        The build marker contents for the relation's current parquet files, and their row count.
+        The marker also fingerprints the output, so that data rewritten by anything but the
+        model's own build is never skipped over.
+        """
+        _, infos = self._read_footers(root_dir, relation)
+        output = util.build_fingerprint({"files": [info.to_dict() for info in infos]})
+        return {"fingerprint": fingerprint, "output": output}, sum(i.num_rows for i in infos)
+
+    @staticmethod
+    def _build_marker_path(relation: ParquetRelation) -> str:
+        """
+        Hidden sibling file recording the fingerprint the relation was last built with
+        """
+        schema_path = fs.path.dirname(relation.render_resource_path())
+        return fs.path.join(schema_path, f".{relation.identifier}.build_fingerprint")
+
+    @staticmethod
+    def _seed_marker_path(relation: ParquetRelation) -> str:
+        """
+        Hidden sibling file recording which csv the relation's parquet file was loaded from
+        """
+        schema_path = fs.path.dirname(relation.render_resource_path())
+        return fs.path.join(schema_path, f".{relation.identifier}.csv_fingerprint")
 
     def run_sql_for_tests(self, sql, fetch, conn=None):
         """
@@ -178,6 +1049,121 @@ class ParquetAdapter(BaseAdapter):
         else:
             return list(res)
 
+    @available
+    def copy_options(
+        self,
+        partition_by: tp.Optional[tp.List[str]] = None,
+        compression: tp.Optional[str] = None,
+        row_group_size: tp.Optional[int] = None,
+    ) -> str:
+        """
+        Render the options of a parquet `copy ... to` statement. Compression and row group size
+        fall back to the profile's defaults, and then to duckdb's.
+        """
+        credentials = self.config.credentials
+        compression = compression or credentials.compression
+        row_group_size = row_group_size or credentials.row_group_size
+        options = ["format 'parquet'"]
+        if compression:
+            if compression.lower() not in COMPRESSION_CODECS:
+                raise dbt.exceptions.CompilationException(
+                    f"Invalid parquet compression '{compression}', "
+                    f"expected one of {', '.join(COMPRESSION_CODECS)}"
+                )
+            options.append(f"compression '{compression.lower()}'")
+        if row_group_size:
+            options.append(f"row_group_size {int(row_group_size)}")
+        if partition_by:
+            options.append(f"partition_by ({', '.join(partition_by)})")
+        return ", ".join(options)
+
+    @available
+    @log_code_execution
+    def submit_python_job(self, parsed_model: dict, compiled_code: str) -> AdapterResponse:
+        """
+        Run a python model in the dbt process, with the thread's cursor of the shared duckdb
+        database as its `session`.
+
+        `dbt.ref()` and `dbt.source()` return lazy duckdb relations, which the model can turn into
+        arrow (`.arrow()`), polars (`.pl()`) or pandas (`.df()`) frames. The frame the model returns
+        is registered as the `dbt_output` view, without copying where possible, and written by the
+        `dbt_write_sql` statement that the materialization appended to the code.
+        """
+        cur = self.get_conn_handle()
+
+        def load_df(name: str) -> duckdb.DuckDBPyRelation:
+            sql = f"select * from {name}"
+            if self.config.credentials.lazy_views:
+                self.connections.resolve_views(sql)
+            return cur.query(sql)
+
+        namespace: tp.Dict[str, tp.Any] = {}
+        path = parsed_model.get("original_file_path", parsed_model.get("name", "<python model>"))
+        try:
+            exec(compile(compiled_code, path, "exec"), namespace)
+            frame = namespace["model"](namespace["dbtObj"](load_df), cur)
+            util.register_frame(cur, namespace["dbt_output"], frame)
+        except dbt.exceptions.RuntimeException:
+            raise
+        except Exception as e:
+            raise dbt.exceptions.RuntimeException(f"Python model failed: {e}") from e
+        try:
+            response, _ = self.execute(namespace["dbt_write_sql"])
+        finally:
+            cur.execute(f'drop view if exists "{namespace["dbt_output"]}"')
+        return response
+
+    @available
+    def check_file_format(self, file_format: str, persist: bool = True) -> None:
+        """
+        Reject unknown `file_format` configs, and Arrow IPC copies of models that are not persisted
+        """
+        if file_format not in FILE_FORMATS:
+            raise dbt.exceptions.CompilationException(
+                f"Invalid file_format '{file_format}', expected one of {', '.join(FILE_FORMATS)}"
+            )
+        if file_format != "parquet" and not persist:
+            raise dbt.exceptions.CompilationException(
+                f"file_format '{file_format}' writes a copy of the model's parquet data, and "
+                "cannot be combined with `persist: false`"
+            )
+
+    @available
+    def update_arrow_copy(
+        self, relation: ParquetRelation, file_format: str = "parquet", if_missing: bool = False
+    ) -> None:
+        """
+        With `file_format: both`, write the relation's data as an uncompressed Arrow IPC (Feather
+        v2) file next to its parquet data, which readers can memory-map without decoding. Any copy
+        left by an earlier build is removed otherwise. With `if_missing`, for tables that were not
+        rebuilt, an existing copy is kept as is.
+
+        duckdb 0.7 cannot read Arrow IPC files itself, so the parquet data stays the relation's
+        source for views and downstream models.
+        """
+        self.check_file_format(file_format)
+        root_dir = self.get_fs_handle()
+        path = relation.render_arrow_resource_path()
+        if file_format == "parquet":
+            if root_dir.exists(path):
+                root_dir.remove(path)
+            return
+        if if_missing and root_dir.exists(path):
+            return
+
+        # written aside and moved into place, so that readers never map a partial file
+        staging_path = relation.staging_relation().render_arrow_resource_path()
+        reader = self.connections.execute_arrow(f"select * from {relation.render()}")
+        with root_dir.openbin(staging_path, "w") as f:
+            with pyarrow.ipc.new_file(f, reader.schema) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+        self._move_resource(root_dir, staging_path, path)
+
+    @available
+    def valid_incremental_strategies(self) -> tp.List[str]:
+        return ["append", "insert_overwrite", "merge"]
+
     @classmethod
     def quote(cls, identifier: str) -> str:
         return '"{}"'.format(identifier)
@@ -222,32 +1208,234 @@ class ParquetAdapter(BaseAdapter):
                 cmds.append(rel.register_as_view_cmd())
         return cmds
 
+    @available
+    def refresh_catalog(self) -> None:
+        """
+        Rebuild the catalog file from the database folder, picking up relations that other tools
+        wrote or removed
+
+        Usage: `dbt run-operation refresh_catalog`
+        """
+        catalog = self.connections.CATALOG
+        if catalog is None:
+            raise dbt.exceptions.RuntimeException(
+                "refresh_catalog requires `persist_catalog: true` and a local database"
+            )
+        root_dir = self.get_fs_handle()
+        relations = []
+        for schema in util.list_schemas_from_fs(root_dir):
+            relations.extend(util.list_relations_from_fs(root_dir, catalog.database, schema))
+        catalog.replace(relations)
+
     @available
     def duckdb(self):
         """
-        Run the duckdb CLI with each parquet files having a corresponding view
+        Run the duckdb CLI with each parquet files having a corresponding view. With
+        `persist_catalog`, the CLI opens the catalog file, read-only.
 
         Usage: `dbt run-operation duckdb`
         """
-        cmds = ["install parquet", "load parquet"]
-        cmds.extend(self._register_view_cmds())
-        cmds.append(
-            """
+        list_views = """
             select
                 table_schema as schema,
                 table_name as view
             from information_schema.tables
+            where table_name not like '_dbt_parquet%'
             order by all
             """
-        )
         try:
             subprocess.run(["duckdb", "--version"]).check_returncode()
         except subprocess.CalledProcessError as e:
             raise RuntimeError(
                 "duckdb cli not installed. See instructions at https://duckdb.org/ or use a package manager like homebrew"
             ) from e
+        catalog = self.connections.CATALOG
+        if catalog is not None:
+            if not os.path.exists(catalog.path):
+                self.refresh_catalog()
+            # release the file, only one process can have it open for writing
+            catalog.close()
+            subprocess.run(["duckdb", "-readonly", catalog.path, "-cmd", list_views])
+            return
+        cmds = ["install parquet", "load parquet"]
+        cmds.extend(self._register_view_cmds())
+        cmds.append(list_views)
         subprocess.run(["duckdb", "-cmd", "; ".join(cmds)])
 
+    @available
+    def compact(
+        self,
+        schemas: tp.Optional[tp.List[str]] = None,
+        target_file_size: str = "128MB",
+        min_row_group_rows: int = 10_000,
+        dry_run: bool = False,
+    ) -> agate.Table:
+        """
+        Rewrite the small files and the files with undersized row groups of every relation into
+        files of about `target_file_size`, see `util.compaction_bins`. Returns the number and size
+        of the files of each compacted relation, before and after.
+
+        Usage: `dbt run-operation compact --args '{target_file_size: 256MB}'`
+        """
+        root_dir = self.get_fs_handle()
+        database = self.config.credentials.database
+        footers = self.connections.footer_cache()
+        target_size = util.parse_bytes(target_file_size)
+        rows = []
+        for schema in schemas if schemas is not None else util.list_schemas_from_fs(root_dir):
+            for relation in util.list_relations_from_fs(root_dir, database, schema):
+                if relation.change_files:
+                    # snapshots consolidate their change files themselves
+                    continue
+                files = self._relation_files(root_dir, relation)
+                infos = {file: footers.get(root_dir, file) for file in files}
+                bins = util.compaction_bins(infos, target_size, min_row_group_rows)
+                if not bins:
+                    continue
+                before = (len(files), sum(info.size for info in infos.values()))
+                if not dry_run:
+                    self._compact_relation(root_dir, relation, files, bins)
+                    files = self._relation_files(root_dir, relation)
+                after = (len(files), sum(footers.get(root_dir, file).size for file in files))
+                rows.append((schema, relation.identifier) + before + after)
+        return agate_helper.table_from_rows(
+            rows,
+            ["schema", "identifier", "files_before", "bytes_before", "files_after", "bytes_after"],
+            text_only_columns=["schema", "identifier"],
+        )
+
+    @staticmethod
+    def _relation_files(root_dir: fs.base.FS, relation: ParquetRelation) -> tp.List[str]:
+        path = relation.render_resource_path()
+        if not relation.is_dataset:
+            return [path]
+        return sorted(root_dir.walk.files(path, filter=["*.parquet"]))
+
+    def _compact_relation(
+        self,
+        root_dir: fs.base.FS,
+        relation: ParquetRelation,
+        files: tp.List[str],
+        bins: tp.List[tp.List[str]],
+    ) -> None:
+        """
+        Rewrite each bin of files of the relation as one file of a staging copy, in parallel, then
+        move the other files over and swap the staging copy in
+        """
+        path = relation.render_resource_path()
+        staging_relation = relation.staging_relation()
+        staging_path = staging_relation.render_resource_path()
+        self._remove_data(staging_relation)
+
+        jobs = []
+        for sources in bins:
+            if relation.is_dataset:
+                folder = fs.path.dirname(sources[0])[len(path) :]
+                root_dir.makedirs(staging_path + folder, recreate=True)
+                output = (
+                    f"{staging_relation.render_path()}{folder}/part-{uuid.uuid4().hex}.parquet"
+                )
+            else:
+                output = staging_relation.render_path()
+            scan = ", ".join(f"'{relation.render_path()}{file[len(path) :]}'" for file in sources)
+            jobs.append(
+                f"""
+                copy (select * from parquet_scan([{scan}], union_by_name=1))
+                to '{output}' ({self.copy_options()})
+                """
+            )
+
+        conn = self.get_conn_handle()
+
+        def rewrite(sql: str) -> None:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql)
+            finally:
+                cursor.close()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(self.config.threads, 1)) as pool:
+                list(pool.map(rewrite, jobs))
+        except duckdb.Error as e:
+            self._remove_data(staging_relation)
+            raise dbt.exceptions.RuntimeException(f"Compacting {relation} failed: {e}")
+
+        compacted = {file for sources in bins for file in sources}
+        for file in files:
+            if file not in compacted:
+                target = staging_path + file[len(path) :]
+                root_dir.makedirs(fs.path.dirname(target), recreate=True)
+                self._move_resource(root_dir, file, target)
+        self.swap_staged(staging_relation, relation)
+
+    def _checksums(
+        self, relation: ParquetRelation, names: tp.List[str]
+    ) -> tp.Tuple[int, tp.Any, tp.Dict[str, tp.Any]]:
+        """
+        The row count of `relation` and order-independent checksums of its rows and of each column
+        in `names`, as sums of duckdb's hashes of the values, in a single streaming pass. Equal
+        checksums mean equal (multi)sets of values, up to a hash collision. Values are hashed as
+        text, so that e.g. partition columns, which read back as text, match their source.
+        """
+        quoted = [f"{self.quote(name)}::varchar" for name in names]
+        sums = [f"sum(hash({', '.join(quoted)})::hugeint)" if quoted else "null"]
+        sums.extend(f"sum(hash({q})::hugeint)" for q in quoted)
+        row = self._fetchone(f"select count(*), {', '.join(sums)} from {relation.render()}")
+        return row[0], row[1], dict(zip(names, row[2:]))
+
+    def _fetchone(self, sql: str) -> tp.Tuple[tp.Any, ...]:
+        if self.config.credentials.lazy_views:
+            self.connections.resolve_views(sql)
+        row = self.get_conn_handle().execute(sql).fetchone()
+        assert row is not None
+        return row
+
+    def _column_names(self, relation: BaseRelation) -> tp.List[str]:
+        return [c.name for c in self.get_columns_in_relation(tp.cast(ParquetRelation, relation))]
+
+    @available
+    def diff_relations(
+        self,
+        relation_a: BaseRelation,
+        relation_b: BaseRelation,
+        column_names: tp.Optional[tp.List[str]] = None,
+    ) -> tp.Dict[str, tp.Any]:
+        """
+        Compare two relations, by default on all their columns: their row counts, the columns
+        whose values differ (or that only one of them has), and the number of rows that are in
+        one relation but not the other. The rows are only compared one by one, with `EXCEPT`,
+        when the checksums of the relations disagree.
+        """
+        names_a = self._column_names(relation_a)
+        names_b = self._column_names(relation_b)
+        if column_names is not None:
+            names_a = [name for name in names_a if name in column_names]
+            names_b = [name for name in names_b if name in column_names]
+        shared = sorted(set(names_a) & set(names_b))
+        rows_a, row_sum_a, column_sums_a = self._checksums(
+            tp.cast(ParquetRelation, relation_a), shared
+        )
+        rows_b, row_sum_b, column_sums_b = self._checksums(
+            tp.cast(ParquetRelation, relation_b), shared
+        )
+        only_in_one = set(names_a) ^ set(names_b)
+        different = [
+            name
+            for name in names_a + [name for name in names_b if name not in names_a]
+            if name in only_in_one or column_sums_a[name] != column_sums_b[name]
+        ]
+        num_mismatched = 0
+        if shared and (rows_a, row_sum_a) != (rows_b, row_sum_b):
+            sql = self._rows_different_sql(relation_a, relation_b, shared)
+            num_mismatched = self._fetchone(sql)[1]
+        return {
+            "rows_a": rows_a,
+            "rows_b": rows_b,
+            "different_columns": different,
+            "num_mismatched": num_mismatched,
+        }
+
     def get_rows_different_sql(
         self,
         relation_a: BaseRelation,
@@ -260,23 +1448,29 @@ class ParquetAdapter(BaseAdapter):
         relations and the number of mismatched rows.
         """
         # This method only really exists for test reasons.
-        names: tp.List[str]
-        if column_names is None:
-            columns = self.get_columns_in_relation(tp.cast(ParquetRelation, relation_a))
-            names = sorted((self.quote(c.name) for c in columns))
-        else:
-            names = sorted((self.quote(n) for n in column_names))
-        columns_csv = ", ".join(names)
+        names = self._column_names(relation_a) if column_names is None else list(column_names)
+        # identical relations are confirmed from their checksums, without the full comparison
+        rows_a, row_sum_a, _ = self._checksums(tp.cast(ParquetRelation, relation_a), sorted(names))
+        rows_b, row_sum_b, _ = self._checksums(tp.cast(ParquetRelation, relation_b), sorted(names))
+        if (rows_a, row_sum_a) == (rows_b, row_sum_b):
+            return "select 0 as row_count_difference, 0 as num_mismatched"
+        return self._rows_different_sql(relation_a, relation_b, names, except_operator)
 
-        sql = COLUMNS_EQUAL_SQL.format(
+    def _rows_different_sql(
+        self,
+        relation_a: BaseRelation,
+        relation_b: BaseRelation,
+        column_names: tp.List[str],
+        except_operator: str = "EXCEPT",
+    ) -> str:
+        columns_csv = ", ".join(sorted(self.quote(n) for n in column_names))
+        return COLUMNS_EQUAL_SQL.format(
             columns=columns_csv,
             relation_a=str(tp.cast(ParquetRelation, relation_a)),
             relation_b=str(tp.cast(ParquetRelation, relation_b)),
             except_op=except_operator,
         )
 
-        return sql
-
 
 # Change `table_a/b` to `table_aaaaa/bbbbb` to avoid duckdb binding issues when relation_a/b
 # is called "table_a" or "table_b" in some of the dbt tests
@@ -0,0 +1,197 @@
+import base64
+import json
+import threading
+import typing as tp
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import fs.base
+import fs.errors
+import fs.path
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from dbt.events import AdapterLogger
+
+logger = AdapterLogger("Parquet")
+
+
+def column_stats(
+    metadata: pq.FileMetaData, schema: pyarrow.Schema
+) -> tp.Dict[str, tp.Dict[str, tp.Any]]:
+    """
+    Statistics of each top-level column over all row groups: its `null_count`, and for integer
+    columns its `range` as `[min, max]`, which is `[None, None]` when all values are null. Either
+    is None unless every row group records it.
+    """
+    stats = {}
+    for index in range(metadata.num_columns):
+        name = metadata.schema.column(index).path
+        if schema.get_field_index(name) < 0 or pyarrow.types.is_nested(schema.field(name).type):
+            continue
+        null_count: tp.Optional[int] = 0
+        has_range = pyarrow.types.is_integer(schema.field(name).type)
+        low: tp.Any = None
+        high: tp.Any = None
+        for row_group in range(metadata.num_row_groups):
+            chunk = metadata.row_group(row_group).column(index).statistics
+            if chunk is None or not chunk.has_null_count:
+                null_count, has_range = None, False
+                break
+            null_count = tp.cast(int, null_count) + chunk.null_count
+            if not has_range:
+                # pyarrow cannot convert the bounds of every type, e.g. decimals
+                continue
+            if chunk.has_min_max:
+                low = chunk.min if low is None else min(low, chunk.min)
+                high = chunk.max if high is None else max(high, chunk.max)
+            elif chunk.null_count < metadata.row_group(row_group).num_rows:
+                has_range = False
+        stats[name] = {"null_count": null_count, "range": [low, high] if has_range else None}
+    return stats
+
+
+@dataclass
+class FooterInfo:
+    """
+    What we need to know about a parquet file, as read from its footer only
+    """
+
+    size: int
+    modified: float
+    schema: pyarrow.Schema
+    num_rows: int
+    num_row_groups: int
+    compression: str
+    # top-level column name -> {"null_count": ..., "range": [min, max]}, see `column_stats`
+    column_stats: tp.Dict[str, tp.Dict[str, tp.Any]]
+
+    @classmethod
+    def from_metadata(cls, metadata: pq.FileMetaData, size: int, modified: float) -> "FooterInfo":
+        compression = ""
+        if metadata.num_row_groups and metadata.num_columns:
+            compression = metadata.row_group(0).column(0).compression
+        schema = metadata.schema.to_arrow_schema()
+        return cls(
+            size=size,
+            modified=modified,
+            schema=schema,
+            num_rows=metadata.num_rows,
+            num_row_groups=metadata.num_row_groups,
+            compression=compression,
+            column_stats=column_stats(metadata, schema),
+        )
+
+    def to_dict(self) -> tp.Dict[str, tp.Any]:
+        return {
+            "size": self.size,
+            "modified": self.modified,
+            "schema": base64.b64encode(self.schema.serialize().to_pybytes()).decode(),
+            "num_rows": self.num_rows,
+            "num_row_groups": self.num_row_groups,
+            "compression": self.compression,
+            "column_stats": self.column_stats,
+        }
+
+    @classmethod
+    def from_dict(cls, d: tp.Dict[str, tp.Any]) -> "FooterInfo":
+        schema = pyarrow.ipc.read_schema(pyarrow.py_buffer(base64.b64decode(d["schema"])))
+        return cls(**{**d, "schema": schema})
+
+
+class FooterCache:
+    """
+    LRU cache of parquet footers, keyed by the path of each file relative to the database root.
+
+    Entries are validated against the file's size and modification time, so a file rewritten behind
+    our back is never served stale. The cache can be persisted to a sidecar JSON file under the
+    database root, so that later invocations start warm.
+
+    `opener` opens a file for reading by its path relative to the database root. It defaults to
+    the root filesystem's `openbin`; remote roots pass one that supports ranged reads, so that only
+    the footer is fetched rather than the whole object.
+    """
+
+    SIDECAR = ".dbt_parquet_footers.json"
+
+    def __init__(
+        self, maxsize: int = 4096, opener: tp.Optional[tp.Callable[[str], tp.BinaryIO]] = None
+    ):
+        self.maxsize = maxsize
+        self.opener = opener
+        self._entries: "OrderedDict[str, FooterInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def get(self, root_dir: fs.base.FS, path: str) -> FooterInfo:
+        path = fs.path.relpath(fs.path.normpath(path))
+        details = root_dir.getinfo(path, namespaces=["details"])
+        modified = details.modified.timestamp() if details.modified else 0.0
+        with self._lock:
+            info = self._entries.get(path)
+            if info is not None and info.size == details.size and info.modified == modified:
+                self._entries.move_to_end(path)
+                return info
+
+        with (self.opener or root_dir.openbin)(path) as f:
+            metadata = pq.ParquetFile(f).metadata
+        info = FooterInfo.from_metadata(metadata, details.size, modified)
+        self.put(path, info)
+        return info
+
+    def put(self, path: str, info: FooterInfo) -> None:
+        with self._lock:
+            self._entries[path] = info
+            self._entries.move_to_end(path)
+            self._dirty = True
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop the entries for a file, or for every file below a dataset folder
+        """
+        path = fs.path.relpath(fs.path.normpath(path))
+        with self._lock:
+            for key in list(self._entries):
+                if key == path or key.startswith(path + "/"):
+                    del self._entries[key]
+                    self._dirty = True
+
+    def rename(self, src_path: str, dst_path: str) -> None:
+        """
+        Carry entries over to the new location of a moved file or dataset folder
+        """
+        src_path = fs.path.relpath(fs.path.normpath(src_path))
+        dst_path = fs.path.relpath(fs.path.normpath(dst_path))
+        with self._lock:
+            for key in list(self._entries):
+                if key == src_path or key.startswith(src_path + "/"):
+                    self._entries[dst_path + key[len(src_path) :]] = self._entries.pop(key)
+                    self._dirty = True
+
+    def load(self, root_dir: fs.base.FS) -> None:
+        try:
+            entries = json.loads(root_dir.readtext(self.SIDECAR))
+        except fs.errors.ResourceNotFound:
+            return
+        except ValueError:
+            logger.debug(f"ignoring unreadable footer cache {self.SIDECAR}")
+            return
+        for path, d in entries.items():
+            # entries written before column statistics were kept are read again when used
+            if "column_stats" in d:
+                self.put(path, FooterInfo.from_dict(d))
+        self._dirty = False
+
+    def save(self, root_dir: fs.base.FS) -> None:
+        """
+        Write the cache to the sidecar file, if anything changed since it was last loaded or saved
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {path: info.to_dict() for path, info in self._entries.items()}
+            self._dirty = False
+        root_dir.writetext(self.SIDECAR, json.dumps(entries))
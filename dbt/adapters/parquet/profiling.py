@@ -0,0 +1,56 @@
+import typing as tp
+from collections import defaultdict
+
+# operator categories of the per-model summaries, by substrings of duckdb's operator names
+CATEGORIES = {
+    "scan": ("SCAN",),
+    "join": ("JOIN",),
+    "write": ("COPY_TO_FILE", "INSERT", "CREATE_TABLE"),
+}
+TOP_OPERATORS = 10
+
+
+def operator_category(name: str) -> str:
+    for category, markers in CATEGORIES.items():
+        if any(marker in name for marker in markers):
+            return category
+    return "other"
+
+
+def iter_operators(profile: tp.Dict[str, tp.Any]) -> tp.Iterator[tp.Dict[str, tp.Any]]:
+    """
+    All operators of a duckdb json query profile, depth first
+    """
+    for child in profile.get("children", []):
+        yield child
+        yield from iter_operators(child)
+
+
+def summarize(
+    profiles: tp.List[tp.Dict[str, tp.Any]], input_bytes: tp.Dict[str, int]
+) -> tp.Dict[str, tp.Any]:
+    """
+    Summarize the query profiles of one model: total time, time per operator category, the
+    operators that took longest, and the on-disk bytes of the parquet files each input relation
+    is stored in.
+    """
+    by_category = {category: 0.0 for category in [*CATEGORIES, "other"]}
+    by_operator: tp.Dict[str, tp.Dict[str, float]] = defaultdict(
+        lambda: {"time": 0.0, "rows": 0, "count": 0}
+    )
+    for profile in profiles:
+        for operator in iter_operators(profile):
+            name, timing = operator.get("name", ""), operator.get("timing", 0.0)
+            by_category[operator_category(name)] += timing
+            by_operator[name]["time"] += timing
+            by_operator[name]["rows"] += operator.get("cardinality", 0)
+            by_operator[name]["count"] += 1
+
+    top = sorted(by_operator.items(), key=lambda item: item[1]["time"], reverse=True)
+    return {
+        "total_time": sum(profile.get("timing", 0.0) for profile in profiles),
+        "queries": len(profiles),
+        "time_by_category": by_category,
+        "top_operators": [{"name": name, **stats} for name, stats in top[:TOP_OPERATORS]],
+        "input_bytes": input_bytes,
+    }
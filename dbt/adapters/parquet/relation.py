@@ -1,6 +1,8 @@
 import pathlib
+import typing as tp
 from dataclasses import dataclass
 
+from .storage import is_url
 from dbt.adapters.base.relation import BaseRelation
 from dbt.adapters.base.relation import ComponentName
 
@@ -9,11 +11,20 @@ from dbt.adapters.base.relation import ComponentName
 class ParquetTable:
     """
     Dataclass for describing how parquet data is organized by data_dir, schema, and table (file) name
+
+    A table is either a single `{table}.parquet` file, or -- when `partition_depth` is set -- a
+    `{table}/` directory dataset with `partition_depth` levels of hive-style `key=value` folders
+    above the parquet files.
     """
 
     data_dir: str = ""
     schema: str = ""
     table: str = ""
+    partition_depth: tp.Optional[int] = None
+
+    @property
+    def is_dataset(self) -> bool:
+        return self.partition_depth is not None
 
     @property
     def root_path(self) -> pathlib.Path:
@@ -25,18 +36,47 @@ class ParquetTable:
 
     @property
     def table_path(self) -> pathlib.Path:
-        return pathlib.Path(self.table + ".parquet") if self.table else pathlib.Path()
+        if not self.table:
+            return pathlib.Path()
+        if self.is_dataset:
+            return pathlib.Path(self.table)
+        return pathlib.Path(self.table + ".parquet")
+
+    @property
+    def arrow_relative_path(self) -> pathlib.Path:
+        """
+        Path of the table's Arrow IPC copy, next to its parquet file or dataset folder
+        """
+        return self.schema_path / (self.table + ".arrow")
 
     @property
-    def full_path(self) -> pathlib.Path:
-        return self.root_path / self.schema_path / self.table_path
+    def full_path(self) -> str:
+        if is_url(self.data_dir):
+            # pathlib would collapse the `//` of `s3://bucket`
+            relative_path = self.relative_path.as_posix()
+            if relative_path == ".":
+                return self.data_dir.rstrip("/")
+            return self.data_dir.rstrip("/") + "/" + relative_path
+        return str(self.root_path / self.schema_path / self.table_path)
 
     @property
     def relative_path(self) -> pathlib.Path:
         return self.schema_path / self.table_path
 
+    @property
+    def scan_glob(self) -> str:
+        """
+        Glob matching every parquet file belonging to the table
+        """
+        if not self.is_dataset:
+            return self.full_path
+        partition_levels = ["*"] * tp.cast(int, self.partition_depth)
+        if is_url(self.data_dir):
+            return "/".join([self.full_path, *partition_levels, "*.parquet"])
+        return str(pathlib.Path(self.full_path).joinpath(*partition_levels, "*.parquet"))
+
     def __str__(self) -> str:
-        return str(self.full_path)
+        return self.full_path
 
     def tmp_view_name(self):
         if self.schema:
@@ -68,9 +108,24 @@ class ParquetRelation(BaseRelation):
     from the `parquet_scan` table function  with the rendered relation name as the view name.
     See the `parquet__create_table_as` macro for details.
 
+    Relations materialized with a `partition_by` config are hive-partitioned directory datasets
+    rather than single files. For those, `partition_depth` holds the number of partition levels,
+    `.render_path()` points at the dataset directory and `.render_parquet_scan()` globs all of its
+    files with hive partitioning enabled, so the whole directory acts as one relation.
+
+    Snapshots are datasets without partitions, whose runs add `change-*.parquet` files holding the
+    new row versions and closed copies of the versions they invalidated. While a snapshot has
+    `change_files`, its scan keeps a single version per `dbt_scd_id`, preferring closed copies.
+
+    Models configured with `persist: false` are not written to parquet at all, but kept as
+    `in_memory` duckdb tables under the rendered relation name for the rest of the run.
+
     """
 
     quote_character: str = ""
+    partition_depth: tp.Optional[int] = None
+    in_memory: bool = False
+    change_files: bool = False
 
     @property
     def parquet_table(self) -> ParquetTable:
@@ -83,12 +138,20 @@ class ParquetRelation(BaseRelation):
             elif k == ComponentName.Identifier:
                 d["table"] = v
         return ParquetTable(
-            data_dir=d["data_dir"] or "", schema=d.get("schema") or "", table=d.get("table") or ""
+            data_dir=d["data_dir"] or "",
+            schema=d.get("schema") or "",
+            table=d.get("table") or "",
+            partition_depth=self.partition_depth,
         )
 
+    @property
+    def is_dataset(self) -> bool:
+        return self.partition_depth is not None
+
     def render_path(self) -> str:
         """
-        Render the full path to database/schema/identifier.parquet file
+        Render the full path to database/schema/identifier.parquet file,
+        or to the database/schema/identifier directory for a partitioned dataset
         """
         return str(self.parquet_table)
 
@@ -98,8 +161,39 @@ class ParquetRelation(BaseRelation):
         """
         return str(self.parquet_table.relative_path)
 
-    def render_parquet_scan(self) -> str:
-        return f"parquet_scan('{self.render_path()}')"
+    def render_arrow_resource_path(self) -> str:
+        """
+        Render the path of the Arrow IPC copy written with `file_format: both`, relative to the
+        root directory
+        """
+        return str(self.parquet_table.arrow_relative_path)
+
+    def render_parquet_scan(self, files: tp.Optional[tp.List[str]] = None) -> str:
+        """
+        The table function reading the relation, or with `files` (full paths) only some of its
+        files
+        """
+        if self.in_memory:
+            return self.render()
+        pq = self.parquet_table
+        if files is not None:
+            source = "[{}]".format(", ".join(f"'{file}'" for file in files))
+        else:
+            source = f"'{pq.scan_glob}'"
+        if pq.partition_depth:
+            # duckdb 0.7 prunes the wrong partitions when `union_by_name` is combined with
+            # hive partitioning, so partitioned datasets require a consistent schema
+            return f"parquet_scan({source}, hive_partitioning=1)"
+        if pq.is_dataset and self.change_files:
+            return (
+                f"(select * from parquet_scan({source}, union_by_name=1) "
+                "qualify row_number() over "
+                "(partition by dbt_scd_id order by dbt_valid_to nulls last) = 1)"
+            )
+        if pq.is_dataset:
+            # parts written by different runs may not share a schema, so align columns by name
+            return f"parquet_scan({source}, union_by_name=1)"
+        return f"parquet_scan({source})"
 
     def render(self):
         """
@@ -112,11 +206,25 @@ class ParquetRelation(BaseRelation):
         """
         return self.parquet_table.tmp_view_name()
 
+    def staging_relation(self) -> "ParquetRelation":
+        """
+        Hidden sibling file or dataset that new data is written to before being moved into place.
+
+        Hidden (dot-prefixed) files and folders are never listed as relations.
+        """
+        return self.incorporate(path={"identifier": f".{self.identifier}.dbt_staging"})
+
+    def backup_relation(self) -> "ParquetRelation":
+        """
+        Hidden sibling that the existing data is moved to while a new version is swapped in
+        """
+        return self.incorporate(path={"identifier": f".{self.identifier}.dbt_backup"})
+
     def register_as_view_cmd(self):
         """
         Register the parquet file as a view in duckdb
         """
         return f"""
             create or replace view {self.render()} as
-            select * from parquet_scan('{self.render_path()}')
+            select * from {self.render_parquet_scan()}
         """
@@ -0,0 +1,129 @@
+import threading
+import time
+import typing as tp
+
+import fs.base
+import fs.path
+import fs.wrapfs
+
+# methods that change the wrapped filesystem, and so invalidate cached listings
+_MUTATING_METHODS = [
+    "appendbytes",
+    "appendtext",
+    "copydir",
+    "create",
+    "makedir",
+    "makedirs",
+    "movedir",
+    "remove",
+    "removedir",
+    "removetree",
+    "setinfo",
+    "settimes",
+    "touch",
+    "upload",
+    "writebytes",
+    "writefile",
+    "writetext",
+]
+
+
+def is_url(path: str) -> bool:
+    return "://" in path
+
+
+def split_s3_url(url: str) -> tp.Tuple[str, str]:
+    """
+    Split `s3://bucket/some/prefix` into the bucket name and the prefix
+    """
+    bucket, _, prefix = url[len("s3://") :].partition("/")
+    return bucket, prefix.strip("/")
+
+
+class CachedListingFS(fs.wrapfs.WrapFS):
+    """
+    Wraps a remote filesystem, such as an S3 bucket, and caches its directory listings for `ttl`
+    seconds. Listing a prefix is a round trip to the object store, while relation and schema
+    lookups list the same prefixes over and over. Every change made through this filesystem
+    drops the cached listings.
+    """
+
+    def __init__(self, wrap_fs: fs.base.FS, ttl: float = 30.0):
+        super().__init__(wrap_fs)
+        self._ttl = ttl
+        self._listings: tp.Dict[tp.Tuple[str, tp.Tuple[str, ...]], tp.Tuple[float, list]] = {}
+        self._listings_lock = threading.Lock()
+
+    def scandir(self, path, namespaces=None, page=None):
+        if page is not None:
+            return super().scandir(path, namespaces=namespaces, page=page)
+        key = (fs.path.abspath(fs.path.normpath(path)), tuple(sorted(namespaces or ())))
+        with self._listings_lock:
+            cached = self._listings.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self._ttl:
+            return iter(cached[1])
+        entries = list(super().scandir(path, namespaces=namespaces))
+        with self._listings_lock:
+            self._listings[key] = (time.monotonic(), entries)
+        return iter(entries)
+
+    def listdir(self, path):
+        return [info.name for info in self.scandir(path)]
+
+    def invalidate_listings(self) -> None:
+        with self._listings_lock:
+            self._listings.clear()
+
+    def openbin(self, path, mode="r", buffering=-1, **options):
+        if set(mode) & set("wax+"):
+            self.invalidate_listings()
+        return super().openbin(path, mode=mode, buffering=buffering, **options)
+
+    def open(
+        self, path, mode="r", buffering=-1, encoding=None, errors=None, newline="", **options
+    ):
+        if set(mode) & set("wax+"):
+            self.invalidate_listings()
+        return super().open(
+            path,
+            mode=mode,
+            buffering=buffering,
+            encoding=encoding,
+            errors=errors,
+            newline=newline,
+            **options,
+        )
+
+    # S3FS predates the `preserve_time` argument that WrapFS passes on to `move` and `copy`
+    def move(self, src_path, dst_path, overwrite=False, preserve_time=False):
+        self.invalidate_listings()
+        try:
+            self.delegate_fs().move(src_path, dst_path, overwrite=overwrite)
+        finally:
+            self.invalidate_listings()
+
+    def copy(self, src_path, dst_path, overwrite=False, preserve_time=False):
+        self.invalidate_listings()
+        try:
+            self.delegate_fs().copy(src_path, dst_path, overwrite=overwrite)
+        finally:
+            self.invalidate_listings()
+
+
+def _invalidating(name: str) -> tp.Callable[..., tp.Any]:
+    method = getattr(fs.wrapfs.WrapFS, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.invalidate_listings()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.invalidate_listings()
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in _MUTATING_METHODS:
+    setattr(CachedListingFS, _name, _invalidating(_name))
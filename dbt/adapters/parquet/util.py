@@ -1,10 +1,64 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
 import typing as tp
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
+import duckdb
 import fs.base
+import fs.path
 
+# duckdb imports this on the first scan of an arrow object, which fails when python models on
+# several threads scan their first arrow frames at once
+import pyarrow.dataset  # noqa: F401
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None  # type: ignore
+
+from .metadata import FooterInfo
 from .relation import ParquetRelation
 from dbt.adapters.base import RelationType
 
+# rendered relation names, i.e. `"schema"."table"` or a bare `"table"` in the default schema.
+# Matches whole chains of quoted names, so that no match starts at a closing quote, as well as
+# string literals and quoted aliases (`as "name"`), which are skipped
+_RELATION_NAME_RE = re.compile(
+    r"""'(?:[^']|'')*'|\bas\s+"[^"]*"|((?:"[^"]*"\.)*"[^"]*")(\.?)""", re.IGNORECASE
+)
+
+# what a build fingerprint cannot capture: files read by path, with a table function or as a
+# replacement scan (`from 'file.parquet'`), and functions whose results change between runs.
+# String literals and quoted names are matched as well, and skipped
+_UNCACHEABLE_RE = re.compile(
+    r"""'(?:[^']|'')*'|"[^"]*"|("""
+    r"""\b(?:from|join)\s+'"""
+    r"""|\b(?:read_\w+|\w+_scan|glob|now|today|random|uuid|gen_random_uuid|nextval|setseed)"""
+    r"""\s*\("""
+    r"""|\b(?:current_timestamp|current_date|current_time|localtimestamp|localtime)\b"""
+    r")",
+    re.IGNORECASE,
+)
+
+# size units as understood by duckdb settings such as `memory_limit`
+_BYTE_UNITS = {
+    "": 1,
+    "b": 1,
+    "kb": 10**3,
+    "mb": 10**6,
+    "gb": 10**9,
+    "tb": 10**12,
+    "kib": 2**10,
+    "mib": 2**20,
+    "gib": 2**30,
+    "tib": 2**40,
+}
+
 
 def list_schemas_from_fs(root_dir: fs.base.FS):
     """
@@ -15,7 +69,100 @@ def list_schemas_from_fs(root_dir: fs.base.FS):
     folders = root_dir.filterdir("/", exclude_files=["*"])
 
     # include the empty, i.e. default schema in the response
-    return [""] + sorted([d.name for d in folders])
+    return [""] + sorted([d.name for d in folders if not d.name.startswith(".")])
+
+
+def move_resource(
+    root_dir: fs.base.FS, src_path: str, dst_path: str, workers: tp.Optional[int] = None
+) -> None:
+    """
+    Move a parquet file or dataset folder, using a cheap rename when the filesystem is local.
+
+    Object stores have no rename, every file is copied and deleted, so the files of a dataset are
+    moved by `workers` threads at once.
+    """
+    if root_dir.hassyspath(src_path):
+        src, dst = root_dir.getsyspath(src_path), root_dir.getsyspath(dst_path)
+        if os.path.isdir(dst) or (os.path.isdir(src) and os.path.exists(dst)):
+            # os.replace cannot overwrite a folder, nor a file with a folder: move the
+            # destination aside under a hidden name, and remove it once the source is in place
+            aside = os.path.join(
+                os.path.dirname(dst), f".{os.path.basename(dst)}.{uuid.uuid4().hex}.old"
+            )
+            os.replace(dst, aside)
+            os.replace(src, dst)
+            if os.path.isdir(aside):
+                shutil.rmtree(aside)
+            else:
+                os.remove(aside)
+        else:
+            os.replace(src, dst)
+    elif root_dir.isdir(src_path):
+        if root_dir.exists(dst_path):
+            root_dir.removetree(dst_path)
+        files = list(root_dir.walk.files(src_path))
+        for folder in {fs.path.dirname(file) for file in files}:
+            root_dir.makedirs(dst_path + folder[len(src_path) :], recreate=True)
+
+        def move(file: str) -> None:
+            root_dir.move(file, dst_path + file[len(src_path) :], overwrite=True)
+
+        with ThreadPoolExecutor(max_workers=workers or 8) as executor:
+            list(executor.map(move, files))
+        root_dir.removetree(src_path)
+    else:
+        root_dir.move(src_path, dst_path, overwrite=True)
+
+
+def dataset_partition_depth(root_dir: fs.base.FS, path: str) -> tp.Optional[int]:
+    """
+    Inspect the folder at `path` and return the number of hive-style `key=value`
+    partition levels above its parquet files, or None if it does not hold a parquet dataset.
+    """
+    depth = 0
+    while True:
+        entries = [e for e in root_dir.scandir(path) if not e.name.startswith(".")]
+        partitions = [e for e in entries if e.is_dir and "=" in e.name]
+        if partitions:
+            depth += 1
+            path = path + "/" + partitions[0].name
+            continue
+        if any(not e.is_dir and e.name.endswith(".parquet") for e in entries):
+            return depth
+        return depth if depth else None
+
+
+def has_change_files(root_dir: fs.base.FS, path: str) -> bool:
+    """
+    Whether the dataset folder at `path` holds snapshot change files
+    """
+    return any(
+        name.startswith("change-") and name.endswith(".parquet") for name in root_dir.listdir(path)
+    )
+
+
+def get_relation_from_fs(
+    root_dir: fs.base.FS, database: tp.Optional[str], schema: str, identifier: str
+) -> tp.Optional[ParquetRelation]:
+    """
+    Look up a single relation, detecting whether it is stored as a file or a dataset folder.
+    """
+    subdir = "/" + schema if schema else ""
+    depth = None
+    if schema and root_dir.isdir(f"{subdir}/{identifier}"):
+        depth = dataset_partition_depth(root_dir, f"{subdir}/{identifier}")
+        if depth is None:
+            return None
+    elif not root_dir.isfile(f"{subdir}/{identifier}.parquet"):
+        return None
+    return ParquetRelation.create(
+        database=database,
+        schema=schema,
+        identifier=identifier,
+        type=RelationType.Table,
+        partition_depth=depth,
+        change_files=depth == 0 and has_change_files(root_dir, f"{subdir}/{identifier}"),
+    )
 
 
 def list_relations_from_fs(
@@ -24,8 +171,10 @@ def list_relations_from_fs(
     """
     List all relations within a "schema" subfolder.
 
-    This is all parquet files under the subfolder.
-    File 'blah.parquet' is mapped to identifier "blah".
+    This is all parquet files under the subfolder, plus any (possibly hive-partitioned)
+    dataset folders holding parquet files.
+    File 'blah.parquet' and folder 'blah/' are both mapped to identifier "blah".
+    Datasets are only recognized inside a named schema, as top-level folders are schemas.
     """
 
     subdir = "/" + schema if schema else "/"
@@ -33,12 +182,209 @@ def list_relations_from_fs(
         return []
 
     relations = []
-    for item in root_dir.filterdir(subdir, files=["*.parquet"], exclude_dirs=["*"]):
+    for item in root_dir.scandir(subdir):
+        if item.name.startswith("."):
+            continue
+        depth = None
+        if item.is_dir:
+            if not schema:
+                continue
+            depth = dataset_partition_depth(root_dir, f"{subdir}/{item.name}")
+            if depth is None:
+                continue
+            identifier = item.name
+        elif item.name.endswith(".parquet"):
+            identifier = item.name[: -len(".parquet")]
+        else:
+            continue
         relation = ParquetRelation.create(
             database=database,
             schema=schema,
-            identifier=item.name[: -len(".parquet")],
+            identifier=identifier,
             type=RelationType.Table,
+            partition_depth=depth,
+            change_files=depth == 0 and has_change_files(root_dir, f"{subdir}/{identifier}"),
         )
         relations.append(relation)
     return relations
+
+
+def register_frame(cursor: duckdb.DuckDBPyConnection, name: str, frame: tp.Any) -> None:
+    """
+    Make a frame queryable as the view `name`, without copying its data where possible: duckdb
+    relations become a view of their query, arrow tables, readers and datasets as well as pandas
+    frames are scanned in place, and polars frames are handed over as their arrow buffers.
+    """
+    if isinstance(frame, duckdb.DuckDBPyRelation):
+        frame.create_view(name)
+        return
+    if hasattr(frame, "collect"):
+        # a polars LazyFrame
+        frame = frame.collect()
+    if hasattr(frame, "to_arrow"):
+        frame = frame.to_arrow()
+    cursor.register(name, frame)
+
+
+def stats_clear(
+    stats: tp.Optional[tp.Dict[str, tp.Any]],
+    not_null: bool = False,
+    min_value: tp.Any = None,
+    max_value: tp.Any = None,
+    inclusive: bool = True,
+) -> bool:
+    """
+    Whether the footer statistics of a column (see `metadata.column_stats`) prove that a file has
+    no nulls in it, with `not_null`, and that its values lie between the bounds. Nulls are within
+    any bounds. Only integer bounds can be compared, others are never proven.
+    """
+    if stats is None or (not_null and stats["null_count"] != 0):
+        return False
+    if min_value is None and max_value is None:
+        return True
+    if stats["range"] is None:
+        return False
+    low, high = stats["range"]
+    if low is None:
+        # only nulls
+        return True
+    bounds = [integer_literal(value) for value in (min_value, max_value)]
+    if any(
+        bound is None and value is not None for bound, value in zip(bounds, (min_value, max_value))
+    ):
+        return False
+    lower, upper = bounds
+    if lower is not None and (low < lower or (low == lower and not inclusive)):
+        return False
+    if upper is not None and (high > upper or (high == upper and not inclusive)):
+        return False
+    return True
+
+
+def integer_literal(value: tp.Any) -> tp.Optional[int]:
+    """
+    A test argument as an integer, if it is one
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and re.fullmatch(r"\s*-?[0-9]+\s*", value):
+        return int(value)
+    return None
+
+
+def csv_fingerprint(csv_path: str, column_types: tp.Optional[tp.Dict[str, str]] = None) -> str:
+    """
+    Hash of the contents of a seed csv file, together with the column types it is loaded with
+    """
+    digest = hashlib.sha256(json.dumps(column_types or {}, sort_keys=True).encode())
+    with open(csv_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_fingerprint(inputs: tp.Dict[str, tp.Any]) -> str:
+    """
+    Hash of everything a model build depends on, as a json-serializable dict
+    """
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def parse_bytes(value: tp.Union[int, str]) -> int:
+    """
+    Parse a size such as `512MB` or `4GiB` into a number of bytes
+    """
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([a-zA-Z]*)\s*", value)
+    if match is None or match.group(2).lower() not in _BYTE_UNITS:
+        raise ValueError(f"Invalid size '{value}'")
+    return int(float(match.group(1)) * _BYTE_UNITS[match.group(2).lower()])
+
+
+def referenced_relation_names(
+    sql: str, known: tp.Optional[tp.Callable[[str, str], bool]] = None
+) -> tp.Set[tp.Tuple[str, str]]:
+    """
+    The (schema, identifier) pairs of the rendered relation names in `sql`, with an empty schema
+    for relations in the default schema. Quoted column names cannot be told apart from names of
+    relations in the default schema, so with `known`, only the pairs it accepts are returned.
+    """
+    names = set()
+    for match in _RELATION_NAME_RE.finditer(sql):
+        chain, member = match.groups()
+        # skip e.g. the columns in `"schema"."table".x` and `t."x"`
+        if not chain or member or sql[max(match.start() - 1, 0) : match.start()] == ".":
+            continue
+        parts = re.findall(r'"([^"]*)"', chain)
+        if len(parts) <= 2:
+            names.add((parts[0], parts[1]) if len(parts) == 2 else ("", parts[0]))
+    return {name for name in names if known is None or known(*name)}
+
+
+def uncacheable_sql(sql: str) -> bool:
+    """
+    Whether `sql` reads files by path or calls functions whose results change between runs,
+    neither of which its build fingerprint covers
+    """
+    return any(match.group(1) for match in _UNCACHEABLE_RE.finditer(sql))
+
+
+def referenced_relations(
+    root_dir: fs.base.FS, database: tp.Optional[str], sql: str
+) -> tp.List[ParquetRelation]:
+    """
+    The relations stored in the database folder that `sql` refers to, by rendered name
+    """
+    relations = []
+    for schema, identifier in sorted(referenced_relation_names(sql)):
+        relation = get_relation_from_fs(root_dir, database, schema, identifier)
+        if relation is not None:
+            relations.append(relation)
+    return relations
+
+
+def peak_memory_bytes() -> tp.Optional[int]:
+    """
+    High-water mark of this process' resident memory, which includes duckdb's buffers
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS, but in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def compaction_bins(
+    files: tp.Mapping[str, FooterInfo], target_size: int, min_row_group_rows: int
+) -> tp.List[tp.List[str]]:
+    """
+    Group the parquet files of a relation that are worth rewriting into bins of about
+    `target_size` bytes, each bin to be rewritten as a single file.
+
+    Files are only combined with files of the same folder, i.e. partition. Files smaller than half
+    the target size are combined, and files whose row groups hold fewer than
+    `min_row_group_rows` rows on average are rewritten even on their own.
+    """
+
+    def undersized(info: FooterInfo) -> bool:
+        return info.num_row_groups > 1 and info.num_rows < min_row_group_rows * info.num_row_groups
+
+    folders: tp.Dict[str, tp.List[str]] = {}
+    for path in sorted(files):
+        folders.setdefault(fs.path.dirname(path), []).append(path)
+
+    bins = []
+    for paths in folders.values():
+        candidates = [p for p in paths if files[p].size < target_size // 2 or undersized(files[p])]
+        current: tp.List[str] = []
+        current_size = 0
+        for path in candidates:
+            if current and current_size + files[path].size > target_size:
+                bins.append(current)
+                current, current_size = [], 0
+            current.append(path)
+            current_size += files[path].size
+        if current:
+            bins.append(current)
+    return [b for b in bins if len(b) > 1 or undersized(files[b[0]])]
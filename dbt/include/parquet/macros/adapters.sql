@@ -4,20 +4,72 @@ dbt docs: https://docs.getdbt.com/docs/contributing/building-a-new-adapter
 */
 
 {% macro parquet__create_table_as(temporary, relation, compiled_code, language='sql') -%}
+  {%- if language == 'python' -%}
+    {{ exceptions.raise_compiler_error("Python models are only supported by the table materialization") }}
+  {%- endif -%}
   {%- set sql_header = config.get('sql_header', none) -%}
   {{ sql_header if sql_header is not none }}
 
-  copy ({{ sql }}) to '{{ relation.render_path() }}' (format 'parquet');
+  {%- set partition_by = parquet__get_partition_by() -%}
+  {%- if partition_by -%}
+    {%- set relation = parquet__as_dataset(relation, partition_by) -%}
+  {%- endif %}
+  {{ parquet__copy_to(relation, compiled_code, partition_by) }}
   {{ relation.register_as_view_cmd() }};
 {%- endmacro %}
 
 {% macro parquet__create_view_as(relation, sql) -%}
   -- For a parquet file, View == Table.
-  {%- set sql_header = config.get('sql_header', none) -%}
-  {{ sql_header if sql_header is not none }}
+  {{ parquet__create_table_as(False, relation, sql) }}
+{%- endmacro %}
 
-  copy ({{ sql }}) to '{{ relation.render_path() }}' (format 'parquet');
-  {{ relation.register_as_view_cmd() }};
+{% macro parquet__get_partition_by() -%}
+  {#-- the `partition_by` config as a list of column names, or none --#}
+  {%- set partition_by = config.get('partition_by', none) -%}
+  {%- if partition_by is string -%}
+    {%- set partition_by = [partition_by] -%}
+  {%- endif -%}
+  {{ return(partition_by or none) }}
+{%- endmacro %}
+
+{% macro parquet__as_dataset(relation, partition_by) -%}
+  {%- if not relation.schema -%}
+    {{ exceptions.raise_compiler_error(
+        "Model '" ~ relation.identifier ~ "' is stored as a dataset folder, which must live in a named schema") }}
+  {%- endif -%}
+  {{ return(relation.incorporate(partition_depth=partition_by | length)) }}
+{%- endmacro %}
+
+{% macro parquet__copy_to(relation, sql, partition_by=none) -%}
+  {%- if relation.is_dataset -%}
+    {%- set part_path = adapter.prepare_dataset(relation) -%}
+  {%- endif -%}
+  {%- set options = parquet__copy_options(partition_by) -%}
+  {%- set sql = parquet__ordered(sql) -%}
+  {%- if partition_by -%}
+  copy ({{ sql }}) to '{{ relation.render_path() }}' ({{ options }});
+  {%- elif relation.is_dataset -%}
+  copy ({{ sql }}) to '{{ part_path }}' ({{ options }});
+  {%- else -%}
+  copy ({{ sql }}) to '{{ relation.render_path() }}' ({{ options }});
+  {%- endif -%}
+{%- endmacro %}
+
+{% macro parquet__copy_options(partition_by=none) -%}
+  {#-- parquet writer options from the `compression` and `row_group_size` configs, or the profile defaults --#}
+  {{ return(adapter.copy_options(partition_by, config.get('compression'), config.get('row_group_size'))) }}
+{%- endmacro %}
+
+{% macro parquet__ordered(sql) -%}
+  {#-- sort the output by the `order_by` config, so that row group min/max statistics can prune reads --#}
+  {%- set order_by = config.get('order_by', none) -%}
+  {%- if order_by is string -%}
+    {%- set order_by = [order_by] -%}
+  {%- endif -%}
+  {%- if order_by -%}
+    {{ return('select * from (' ~ sql ~ ') order by ' ~ order_by | join(', ')) }}
+  {%- endif -%}
+  {{ return(sql) }}
 {%- endmacro %}
 
 {% macro parquet__snapshot_string_as_time(timestamp) -%}
@@ -30,6 +82,6 @@ dbt docs: https://docs.getdbt.com/docs/contributing/building-a-new-adapter
 {%- endmacro %}
 
 {% macro parquet__current_timestamp() -%}
-'''Returns current UTC time'''
-now()
-{% endmacro %}
+  {#-- Returns current UTC time --#}
+  now()
+{%- endmacro %}
@@ -5,3 +5,84 @@
 {% macro parquet__duckdb() -%}
    {{ return(adapter.duckdb()) }}
 {%- endmacro %}
+
+{#
+  With `persist_catalog: true`, rebuild the catalog file from the database folder, to pick up
+  relations written or removed by other tools:
+
+    dbt run-operation refresh_catalog
+#}
+{% macro refresh_catalog() -%}
+  {{ return(adapter.dispatch('refresh_catalog')()) }}
+{%- endmacro %}
+
+{% macro parquet__refresh_catalog() -%}
+  {{ return(adapter.refresh_catalog()) }}
+{%- endmacro %}
+
+{#
+  Rewrite relations stored in many small parquet files, or in files with small row groups, into
+  files of about `target_file_size`:
+
+    dbt run-operation compact --args '{schemas: [marts], target_file_size: 256MB}'
+
+  With `dry_run: true`, only reports the relations that would be compacted.
+#}
+{% macro compact(schemas=none, target_file_size='128MB', min_row_group_rows=10000, dry_run=false) -%}
+  {{ return(adapter.dispatch('compact')(schemas, target_file_size, min_row_group_rows, dry_run)) }}
+{%- endmacro %}
+
+{% macro parquet__compact(schemas, target_file_size, min_row_group_rows, dry_run) -%}
+  {%- set report = adapter.compact(schemas, target_file_size, min_row_group_rows, dry_run) -%}
+  {%- if report.rows | length == 0 -%}
+    {{ log("Nothing to compact", info=True) }}
+    {{ return(report) }}
+  {%- endif -%}
+  {{ log(" files before   MB before  files after    MB after  relation", info=True) }}
+  {%- for row in report.rows %}
+    {{ log("%13d %11.1f %12d %11.1f  %s" | format(
+        row['files_before'], row['bytes_before'] / 1000000,
+        row['files_after'], row['bytes_after'] / 1000000,
+        (row['schema'] ~ '.' if row['schema'] else '') ~ row['identifier']), info=True) }}
+  {%- endfor %}
+  {{ return(report) }}
+{%- endmacro %}
+
+{#
+  Compare two relations, given as `schema.identifier` (or an identifier in the target schema), e.g.
+  a dev build against prod:
+
+    dbt run-operation diff_relations --args '{a: dev.orders, b: prod.orders}'
+
+  Logs the row counts, the columns whose values differ and the number of rows in only one of the
+  relations. Order-independent checksums confirm identical relations in one pass over each; the
+  rows are only compared one by one when the checksums disagree. `columns` limits the comparison
+  to the given columns.
+#}
+{% macro diff_relations(a, b, columns=none) -%}
+  {{ return(adapter.dispatch('diff_relations')(a, b, columns)) }}
+{%- endmacro %}
+
+{% macro parquet__diff_relations(a, b, columns) -%}
+  {%- set relations = [] -%}
+  {%- for name in [a, b] -%}
+    {%- set parts = name.split('.') -%}
+    {%- set relation = adapter.get_relation(
+        database=target.database,
+        schema=parts[0] if parts | length > 1 else target.schema,
+        identifier=parts[-1]) -%}
+    {%- if relation is none -%}
+      {{ exceptions.raise_compiler_error("Relation " ~ name ~ " does not exist") }}
+    {%- endif -%}
+    {%- do relations.append(relation) -%}
+  {%- endfor -%}
+  {%- set diff = adapter.diff_relations(relations[0], relations[1], columns) -%}
+  {{ log("rows: %d in %s, %d in %s" | format(diff['rows_a'], a, diff['rows_b'], b), info=True) }}
+  {%- if diff['different_columns'] or diff['num_mismatched'] or diff['rows_a'] != diff['rows_b'] %}
+    {{ log("columns that differ: " ~ (diff['different_columns'] | join(', ') or 'none'), info=True) }}
+    {{ log("rows in only one relation: %d" | format(diff['num_mismatched']), info=True) }}
+  {%- else %}
+    {{ log("identical", info=True) }}
+  {%- endif %}
+  {{ return(diff) }}
+{%- endmacro %}
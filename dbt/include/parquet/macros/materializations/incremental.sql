@@ -0,0 +1,81 @@
+{#
+  Incremental models are stored as a dataset folder of parquet part files, optionally hive-partitioned.
+
+  Every run writes its new rows to a hidden staging dataset next to the target. A full (re)build swaps
+  the staging folder in for the existing data. Incremental runs then depend on `incremental_strategy`:
+
+  - `append` (default) moves the new part files into the existing dataset, so previously written
+    parts are never rewritten.
+  - `insert_overwrite` replaces every partition that receives new rows with just those rows.
+  - `merge` upserts the new rows by `unique_key`, rewriting only the partitions that receive new
+    rows or hold existing rows with a replaced key.
+#}
+{% materialization incremental, adapter='parquet' -%}
+
+  {%- if not config.get('persist', true) -%}
+    {{ exceptions.raise_compiler_error("`persist: false` is only supported by the table and view materializations") }}
+  {%- endif -%}
+
+  {%- set existing_relation = load_cached_relation(this) -%}
+  {%- set partition_by = parquet__get_partition_by() -%}
+  {%- set target_relation = this.incorporate(type='table') -%}
+  {%- set target_relation = parquet__as_dataset(target_relation, partition_by or []) -%}
+  {%- set staging_relation = target_relation.staging_relation() -%}
+
+  {%- set strategy = config.get('incremental_strategy') or 'append' -%}
+  {%- set unique_key = config.get('unique_key') -%}
+  {%- if strategy not in adapter.valid_incremental_strategies() -%}
+    {{ exceptions.raise_compiler_error("Invalid incremental strategy '" ~ strategy ~ "' for the parquet adapter") }}
+  {%- elif strategy == 'merge' and not unique_key -%}
+    {{ exceptions.raise_compiler_error("The 'merge' incremental strategy requires a `unique_key`") }}
+  {%- endif -%}
+
+  {%- set full_refresh_mode = should_full_refresh() or existing_relation is none -%}
+  {% set grant_config = config.get('grants') %}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  {#-- `is_incremental()` holds, so the model only selects new rows: existing data written as a
+       single file, or with other partition columns, is first converted to the new layout --#}
+  {% if not full_refresh_mode and existing_relation.partition_depth != target_relation.partition_depth %}
+    {% do adapter.convert_layout(target_relation, parquet__copy_options(partition_by)) %}
+  {% endif %}
+
+  {% if not full_refresh_mode and strategy == 'merge' %}
+    {%- set batch_table = '"' ~ target_relation.identifier ~ '__dbt_batch"' -%}
+    {% call statement('main') -%}
+      create or replace temp table {{ batch_table }} as ({{ sql }})
+    {%- endcall %}
+    {% do adapter.merge_partitions(
+          batch_table, staging_relation, target_relation, unique_key, partition_by,
+          parquet__copy_options(partition_by), config.get('order_by')) %}
+    {% do run_query('drop table ' ~ batch_table) %}
+  {% else %}
+    {% call statement('main') -%}
+      {{ parquet__copy_to(staging_relation, sql, partition_by) }}
+    {%- endcall %}
+
+    {% if full_refresh_mode or (strategy == 'insert_overwrite' and not partition_by) %}
+      {% do adapter.swap_staged(staging_relation, target_relation) %}
+    {% elif strategy == 'insert_overwrite' %}
+      {% do adapter.overwrite_partitions(staging_relation, target_relation) %}
+    {% else %}
+      {% do adapter.append_staged(staging_relation, target_relation) %}
+    {% endif %}
+  {% endif %}
+  {% do adapter.update_arrow_copy(target_relation, config.get('file_format', 'parquet')) %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {% set should_revoke = should_revoke(existing_relation, full_refresh_mode) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+  {% do persist_docs(target_relation, model) %}
+
+  {% do adapter.commit() %}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{%- endmaterialization %}
@@ -0,0 +1,39 @@
+{#
+  With `fast_load: true`, seeds go straight from csv to parquet with duckdb's parallel csv reader,
+  skipping dbt's agate parse and type inference. `column_types` are passed to the reader as explicit
+  duckdb types. The reload is skipped altogether when neither the csv nor the parquet file changed
+  since the last load.
+#}
+{% materialization seed, adapter='parquet' %}
+
+  {%- if not config.get('fast_load', false) -%}
+    {{ return(dbt.materialization_seed_default()) }}
+  {%- endif -%}
+
+  {%- set existing_relation = load_cached_relation(this) -%}
+  {%- set target_relation = this.incorporate(type='table') -%}
+  {%- set grant_config = config.get('grants') -%}
+  {%- set full_refresh_mode = should_full_refresh() -%}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  {%- set csv_path = model.root_path ~ '/' ~ model.original_file_path -%}
+  {%- set response = adapter.load_csv(target_relation, csv_path, config.get('column_types'), full_refresh_mode) -%}
+  {#-- only a preview of the rows, for `dbt seed --show` --#}
+  {%- do store_result('agate_table', response='OK', agate_table=run_query('select * from ' ~ target_relation ~ ' limit 10')) -%}
+  {%- do store_result('main', response=response) -%}
+
+  {% set should_revoke = should_revoke(existing_relation, full_refresh_mode) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+  {% do persist_docs(target_relation, model) %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {% do adapter.commit() %}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmaterialization %}
@@ -0,0 +1,99 @@
+{#
+  Snapshots are stored as a dataset folder. The first run writes the snapshot as a part file, later
+  runs only add a `change-*.parquet` file with the new row versions and closed copies (with
+  `dbt_valid_to` set) of the versions they invalidate, so a run writes in proportion to the number
+  of changes rather than the size of the snapshot. The relation's view merges the change files,
+  keeping one version per `dbt_scd_id`.
+
+  Once there are `consolidate_after` change files (default 10), the current state is rewritten as
+  a single part file.
+#}
+{% materialization snapshot, adapter='parquet' %}
+  {%- set config = model['config'] -%}
+  {%- set target_table = model.get('alias', model.get('name')) -%}
+  {%- set strategy_name = config.get('strategy') -%}
+  {%- set grant_config = config.get('grants') -%}
+
+  {% set target_relation_exists, target_relation = get_or_create_relation(
+          database=model.database,
+          schema=model.schema,
+          identifier=target_table,
+          type='table') -%}
+  {%- set target_relation = adapter.prepare_snapshot(parquet__as_dataset(target_relation, [])) -%}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  {% set strategy_macro = strategy_dispatch(strategy_name) %}
+  {% set strategy = strategy_macro(model, "snapshotted_data", "source_data", config, target_relation_exists) %}
+
+  {% if not target_relation_exists %}
+    {%- set staging_relation = target_relation.staging_relation() -%}
+    {% call statement('main') -%}
+      {{ parquet__copy_to(staging_relation, build_snapshot_table(strategy, model['compiled_code'])) }}
+    {%- endcall %}
+    {% do adapter.swap_staged(staging_relation, target_relation) %}
+  {% else %}
+    {% call statement('main') -%}
+      copy ({{ parquet__snapshot_changes_sql(strategy, sql, target_relation) }})
+      to '{{ adapter.snapshot_change_path(target_relation) }}' ({{ parquet__copy_options() }})
+    {%- endcall %}
+    {% do adapter.commit_snapshot_changes(target_relation, config.get('consolidate_after', 10)) %}
+  {% endif %}
+
+  {% set should_revoke = should_revoke(target_relation_exists, full_refresh_mode=False) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+  {% do persist_docs(target_relation, model) %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {{ adapter.commit() }}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmaterialization %}
+
+{% macro parquet__snapshot_changes_sql(strategy, source_sql, target_relation) -%}
+  {#-- the rows of a change file: new versions, and closed copies of the versions they replace --#}
+  {%- set meta_columns = ['dbt_scd_id', 'dbt_updated_at', 'dbt_valid_from', 'dbt_valid_to'] -%}
+  {%- set source_columns = get_columns_in_query(source_sql) -%}
+  {%- set target_columns = adapter.get_columns_in_relation(target_relation) | map(attribute='name') | list -%}
+  {%- set columns = target_columns | list -%}
+  {%- for column in source_columns if column not in target_columns -%}
+    {%- do columns.append(column) -%}
+  {%- endfor -%}
+
+  with changes as (
+    {{ snapshot_staging_table(strategy, source_sql, target_relation) }}
+  )
+
+  select
+    {%- for column in columns %}
+    {% if column in source_columns or column in meta_columns -%}
+      "{{ column }}"
+    {%- else -%}
+      null
+    {%- endif %} as "{{ column }}"{{ "," if not loop.last }}
+    {%- endfor %}
+  from changes
+  where dbt_change_type = 'insert'
+
+  union all
+
+  select
+    {%- for column in columns %}
+    {% if column == 'dbt_valid_to' -%}
+      changes.dbt_valid_to
+    {%- elif column in target_columns -%}
+      snapshotted."{{ column }}"
+    {%- else -%}
+      null
+    {%- endif %} as "{{ column }}"{{ "," if not loop.last }}
+    {%- endfor %}
+  from {{ target_relation }} as snapshotted
+  join changes on snapshotted.dbt_scd_id = changes.dbt_scd_id
+  where changes.dbt_change_type in ('update', 'delete')
+    and snapshotted.dbt_valid_to is null
+{%- endmacro %}
@@ -0,0 +1,155 @@
+{#
+  Tables are written to a hidden staging file (or dataset folder, with `partition_by`) next to the
+  target, then swapped in with a single rename and registered as a view once. This replaces the
+  default `__dbt_tmp` / `__dbt_backup` rename dance, which costs several filesystem moves and view
+  re-registrations per model, and means readers never see the parquet file missing.
+
+  As views do not make sense for parquet files, the view materialization builds a table as well.
+
+  With `file_format: both`, an Arrow IPC copy of the table is written next to the parquet data.
+
+  With `build_cache: true`, a table whose compiled SQL, output configs and parquet inputs are unchanged
+  since it was last built is not rebuilt; its view is just re-registered.
+
+  Intermediate models configured with `persist: false` skip parquet entirely: they are kept as
+  in-memory duckdb tables, which downstream models read directly, for the rest of the run.
+
+  Python models run in the dbt process, see `ParquetAdapter.submit_python_job`. The frame they return
+  is written by the same statements as the output of a SQL model.
+#}
+{% materialization table, adapter='parquet', supported_languages=['sql', 'python'] -%}
+  {{ return(parquet__materialize_table()) }}
+{%- endmaterialization %}
+
+{% materialization view, adapter='parquet' -%}
+  {{ return(parquet__materialize_table()) }}
+{%- endmaterialization %}
+
+{% macro parquet__materialize_table() %}
+
+  {% do adapter.check_file_format(config.get('file_format', 'parquet'), config.get('persist', true)) %}
+  {%- if not config.get('persist', true) -%}
+    {{ return(parquet__materialize_in_memory()) }}
+  {%- endif -%}
+
+  {%- set existing_relation = load_cached_relation(this) -%}
+  {%- set partition_by = parquet__get_partition_by() -%}
+  {%- set target_relation = this.incorporate(type='table') -%}
+  {%- if partition_by -%}
+    {%- set target_relation = parquet__as_dataset(target_relation, partition_by) -%}
+  {%- endif -%}
+  {%- set staging_relation = target_relation.staging_relation() -%}
+  {% set grant_config = config.get('grants') %}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  {%- set sql_header = config.get('sql_header', none) -%}
+  {%- set fingerprint = parquet__build_fingerprint(sql, partition_by) -%}
+  {%- set cached_response = adapter.cached_build(target_relation, fingerprint) -%}
+  {% if cached_response %}
+    {#-- the copy is not part of the fingerprint, so one removed since is written again --#}
+    {% do adapter.update_arrow_copy(target_relation, config.get('file_format', 'parquet'), if_missing=true) %}
+    {% do store_result('main', response=cached_response) %}
+  {% else %}
+    {% if model['language'] == 'python' %}
+      {%- set output = parquet__py_output(target_relation) -%}
+      {% do parquet__submit_python(parquet__py_write_table(
+          compiled_code, output, parquet__copy_to(staging_relation, 'select * from "' ~ output ~ '"', partition_by))) %}
+    {% else %}
+      {% call statement('main') -%}
+        {{ sql_header if sql_header is not none }}
+        {{ parquet__copy_to(staging_relation, sql, partition_by) }}
+      {%- endcall %}
+    {% endif %}
+
+    {% do adapter.swap_staged(staging_relation, target_relation) %}
+    {% do adapter.update_arrow_copy(target_relation, config.get('file_format', 'parquet')) %}
+    {% do adapter.record_build(target_relation, fingerprint) %}
+  {% endif %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {% set should_revoke = should_revoke(existing_relation, full_refresh_mode=True) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+  {% do persist_docs(target_relation, model) %}
+
+  {% do adapter.commit() %}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmacro %}
+
+{% macro parquet__build_fingerprint(sql, partition_by) %}
+  {#-- the refs of python models are not rendered as relation names in the code --#}
+  {%- if not config.get('build_cache', false) or should_full_refresh() or model['language'] == 'python' -%}
+    {{ return(none) }}
+  {%- endif -%}
+  {%- set build_config = {
+        'sql_header': config.get('sql_header', none),
+        'partition_by': partition_by,
+        'order_by': config.get('order_by', none),
+        'copy_options': parquet__copy_options(partition_by),
+        'file_format': config.get('file_format', 'parquet'),
+      } -%}
+  {{ return(adapter.build_fingerprint(sql, build_config)) }}
+{% endmacro %}
+
+{% macro parquet__materialize_in_memory() %}
+
+  {%- set existing_relation = load_cached_relation(this) -%}
+  {% set grant_config = config.get('grants') %}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  {%- set target_relation = adapter.prepare_in_memory(this.incorporate(type='table')) -%}
+  {%- set sql_header = config.get('sql_header', none) -%}
+  {% if model['language'] == 'python' %}
+    {%- set output = parquet__py_output(target_relation) -%}
+    {% do parquet__submit_python(parquet__py_write_table(compiled_code, output,
+        'create or replace table ' ~ target_relation.render() ~ ' as ' ~ parquet__ordered('select * from "' ~ output ~ '"'))) %}
+  {% else %}
+    {% call statement('main') -%}
+      {{ sql_header if sql_header is not none }}
+      create or replace table {{ target_relation.render() }} as {{ parquet__ordered(sql) }}
+    {%- endcall %}
+  {% endif %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {% set should_revoke = should_revoke(existing_relation, full_refresh_mode=True) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+  {% do persist_docs(target_relation, model) %}
+
+  {% do adapter.commit() %}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmacro %}
+
+{% macro parquet__py_output(relation) -%}
+  {#-- the view that the frame returned by a python model is registered as --#}
+  {{ return(relation.identifier ~ '__dbt_output') }}
+{%- endmacro %}
+
+{% macro parquet__submit_python(compiled_code) -%}
+  {#-- `statement('main', language='python')`, which dbt only allows in the materialization itself --#}
+  {{ log('Writing runtime python for node "{}"'.format(model['unique_id'])) }}
+  {%- do write(compiled_code) -%}
+  {%- do store_result('main', response=adapter.submit_python_job(model, compiled_code)) -%}
+{%- endmacro %}
+
+{% macro parquet__py_write_table(compiled_code, output, write_sql) -%}
+{{ compiled_code }}
+
+
+# dbt-parquet: the adapter registers the frame returned by `model` as `dbt_output`, and runs
+# `dbt_write_sql` to write it
+dbt_output = {{ output | tojson }}
+dbt_write_sql = {{ write_sql | tojson }}
+{%- endmacro %}
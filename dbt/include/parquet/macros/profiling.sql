@@ -0,0 +1,21 @@
+{#
+  Rank the models of the last run with `query_profiling: true` by their total query time:
+
+    dbt run-operation parquet_profile_report --args '{limit: 10}'
+
+  The full duckdb query profiles of each model are in `target/profiles/<unique_id>.json`.
+#}
+{% macro parquet_profile_report(limit=20) %}
+  {%- set report = adapter.profile_report() -%}
+  {%- if report.rows | length == 0 -%}
+    {{ log("No query profiles found, run models with `query_profiling: true` in the profile first", info=True) }}
+    {{ return(report) }}
+  {%- endif -%}
+  {{ log("   total     scan     join    write   read MB  model", info=True) }}
+  {%- for row in report.rows[:limit] %}
+    {{ log("%8.3f %8.3f %8.3f %8.3f %9.1f  %s" | format(
+        row['total_time'], row['scan_time'], row['join_time'], row['write_time'],
+        row['input_bytes'] / 1000000, row['unique_id']), info=True) }}
+  {%- endfor %}
+  {{ return(report) }}
+{% endmacro %}
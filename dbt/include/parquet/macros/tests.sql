@@ -0,0 +1,51 @@
+{#
+  Generic tests answered from the parquet footers where their statistics are conclusive. Files
+  whose statistics clear the test are not scanned, so a test of a column without nulls, or within
+  the accepted range, reads only footers. `accepted_range` compares integer bounds only; other
+  bounds, tests with a `where` config and in-memory models scan as usual.
+#}
+
+{% macro parquet__test_not_null(model, column_name) %}
+  {%- set column_list = '*' if should_store_failures() else column_name -%}
+  {%- set scan = adapter.stats_scan(model, column_name, not_null=true) if execute else model -%}
+  select {{ column_list }}
+  from {{ scan }}
+  where {{ column_name }} is null
+{% endmacro %}
+
+{% test accepted_range(model, column_name, min_value=none, max_value=none, inclusive=true) %}
+  {%- if min_value is none and max_value is none -%}
+    {{ exceptions.raise_compiler_error("accepted_range needs a min_value, a max_value or both") }}
+  {%- endif -%}
+  {%- set scan = adapter.stats_scan(
+        model, column_name, min_value=min_value, max_value=max_value, inclusive=inclusive
+      ) if execute else model -%}
+  select {{ column_name }}
+  from {{ scan }}
+  where not (
+    {%- if min_value is not none %}
+    {{ column_name }} {{ '>=' if inclusive else '>' }} {{ min_value }}
+    {%- endif %}
+    {%- if min_value is not none and max_value is not none %} and {% endif %}
+    {%- if max_value is not none %}
+    {{ column_name }} {{ '<=' if inclusive else '<' }} {{ max_value }}
+    {%- endif %}
+  )
+{% endtest %}
+
+{% test not_negative(model, column_name) %}
+  {{ return(test_accepted_range(model, column_name, min_value=0)) }}
+{% endtest %}
+
+{% test row_count(model, min_value=none, max_value=none) %}
+  {%- set num_rows = adapter.stats_row_count(model) if execute else none -%}
+  select row_count
+  from (
+    select {{ num_rows if num_rows is not none else '(select count(*) from ' ~ model ~ ')' }} as row_count
+  ) as counted
+  where
+    {%- if min_value is not none %} row_count < {{ min_value }}{% endif %}
+    {%- if min_value is not none and max_value is not none %} or{% endif %}
+    {%- if max_value is not none %} row_count > {{ max_value }}{% endif %}
+    {%- if min_value is none and max_value is none %} false{% endif %}
+{% endtest %}
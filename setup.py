@@ -17,7 +17,7 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "dbt-core~=1.3.0",
-        "duckdb==0.5.1",
+        "duckdb~=0.7.1",
         "fs-s3fs>=1.1.0",
         "pyarrow>=7.0.0",
     ],
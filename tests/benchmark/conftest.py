@@ -0,0 +1,86 @@
+"""
+Benchmarks of the adapter against synthetic databases (`make benchmark`).
+
+Results are saved as json under `.benchmarks/`, and compared against the last saved run. The size
+of the synthetic database is set with the `--synthetic-*` options.
+"""
+import pathlib
+import typing as tp
+
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+SIZES = {
+    "schemas": 4,
+    "files": 50,
+    "columns": 20,
+    "rows": 10_000,
+    "models": 20,
+    "seed_rows": 20_000,
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("synthetic", "size of the synthetic benchmark database")
+    for name, default in SIZES.items():
+        group.addoption(
+            f"--synthetic-{name.replace('_', '-')}",
+            type=int,
+            default=default,
+            dest=f"synthetic_{name}",
+        )
+
+
+def synthetic_table(columns: int, rows: int) -> pyarrow.Table:
+    """
+    A table with an integer key, followed by alternating integer, float and string columns
+    """
+    keys = pyarrow.array(range(rows), pyarrow.int64())
+    data = {"id": keys}
+    for c in range(1, columns):
+        if c % 3 == 0:
+            data[f"c{c}"] = pc.multiply(keys, c)
+        elif c % 3 == 1:
+            data[f"c{c}"] = pc.divide(pc.cast(keys, pyarrow.float64()), c)
+        else:
+            data[f"c{c}"] = pc.cast(pc.bit_wise_and(keys, 255), pyarrow.string())
+    return pyarrow.table(data)
+
+
+def synthetic_csv(columns: int, rows: int) -> str:
+    lines = [",".join(["id"] + [f"c{c}" for c in range(1, columns)])]
+    for i in range(rows):
+        lines.append(",".join([str(i)] + [str(i * c % 1000) for c in range(1, columns)]))
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture(scope="session")
+def sizes(pytestconfig) -> tp.Dict[str, int]:
+    return {name: pytestconfig.getoption(f"synthetic_{name}") for name in SIZES}
+
+
+@pytest.fixture(scope="session")
+def synthetic_database(tmp_path_factory, sizes) -> pathlib.Path:
+    """
+    A database folder of `schemas` schemas, each holding `files` parquet files of `columns`
+    columns and `rows` rows
+    """
+    root = tmp_path_factory.mktemp("synthetic")
+    table = synthetic_table(sizes["columns"], sizes["rows"])
+    for s in range(sizes["schemas"]):
+        (root / f"synthetic_{s}").mkdir()
+        for f in range(sizes["files"]):
+            pq.write_table(table, root / f"synthetic_{s}" / f"table_{f}.parquet")
+    return root
+
+
+@pytest.fixture(scope="session")
+def synthetic_seed(sizes) -> str:
+    return synthetic_csv(sizes["columns"], sizes["seed_rows"])
+
+
+@pytest.fixture(scope="class")
+def dbt_profile_target(synthetic_database):
+    return {"type": "parquet", "threads": 4, "database": str(synthetic_database)}
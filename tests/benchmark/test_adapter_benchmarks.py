@@ -0,0 +1,119 @@
+import pytest
+
+from dbt.adapters.parquet.connections import ParquetConnectionManager
+from dbt.adapters.parquet.metadata import FooterCache
+from dbt.tests.util import run_dbt
+
+
+def synthetic_schemas(sizes):
+    return [f"synthetic_{s}" for s in range(sizes["schemas"])]
+
+
+@pytest.mark.benchmark(group="metadata")
+class TestMetadata:
+    @pytest.fixture(scope="class")
+    def relations(self, project, sizes):
+        with project.adapter.connection_named("benchmark"):
+            return [
+                relation
+                for schema in synthetic_schemas(sizes)
+                for relation in project.adapter.list_relations_without_caching(
+                    project.adapter.Relation.create(database=project.database, schema=schema)
+                )
+            ]
+
+    def test_open(self, benchmark, project):
+        adapter = project.adapter
+
+        def open_connection():
+            # a fresh duckdb database, which registers a view for every relation
+            if ParquetConnectionManager.CONN is not None:
+                ParquetConnectionManager.CONN.close()
+            ParquetConnectionManager.CONN = None
+            with adapter.connection_named("benchmark"):
+                adapter.connections.get_thread_connection().handle
+
+        benchmark(open_connection)
+
+    def test_list_relations_without_caching(self, benchmark, project, sizes):
+        adapter = project.adapter
+        schemas = [
+            adapter.Relation.create(database=project.database, schema=schema)
+            for schema in synthetic_schemas(sizes)
+        ]
+        with adapter.connection_named("benchmark"):
+            benchmark(lambda: [adapter.list_relations_without_caching(s) for s in schemas])
+
+    def test_get_columns_in_relation_cold(self, benchmark, project, relations):
+        def clear_footers():
+            ParquetConnectionManager.FOOTERS = FooterCache()
+
+        with project.adapter.connection_named("benchmark"):
+            benchmark.pedantic(
+                lambda: [project.adapter.get_columns_in_relation(r) for r in relations],
+                setup=clear_footers,
+                rounds=5,
+            )
+
+    def test_get_columns_in_relation_warm(self, benchmark, project, relations):
+        with project.adapter.connection_named("benchmark"):
+            benchmark(lambda: [project.adapter.get_columns_in_relation(r) for r in relations])
+
+    def test_get_catalog(self, benchmark, project, sizes):
+        with project.adapter.connection_named("benchmark"):
+            catalog = benchmark(
+                project.adapter.catalog_for_schemas, project.database, synthetic_schemas(sizes)
+            )
+        benchmark.extra_info["columns"] = len(catalog.rows)
+
+
+@pytest.mark.benchmark(group="seed")
+class BaseSeed:
+    @pytest.fixture(scope="class")
+    def seeds(self, synthetic_seed):
+        return {"synthetic_seed.csv": synthetic_seed}
+
+    def test_seed(self, benchmark, project, sizes):
+        benchmark.extra_info["rows"] = sizes["seed_rows"]
+        benchmark.pedantic(run_dbt, args=(["seed", "--full-refresh"],), rounds=3, warmup_rounds=1)
+
+
+class TestSeedFastLoad(BaseSeed):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"seeds": {"+fast_load": True}}
+
+
+class TestSeedAgate(BaseSeed):
+    pass
+
+
+@pytest.mark.benchmark(group="build")
+class TestModelBuild:
+    @pytest.fixture(scope="class")
+    def models(self, sizes):
+        tables = "\n".join(f"      - name: table_{f}" for f in range(sizes["files"]))
+        models = {
+            "sources.yml": f"""
+version: 2
+sources:
+  - name: synthetic_0
+    schema: synthetic_0
+    tables:
+{tables}
+"""
+        }
+        for m in range(sizes["models"]):
+            models[
+                f"model_{m}.sql"
+            ] = f"""
+{{{{ config(materialized='table') }}}}
+select id % 100 as k, count(*) as n, sum(c1) as c1
+from {{{{ source('synthetic_0', 'table_{m % sizes["files"]}') }}}}
+group by 1
+"""
+        return models
+
+    def test_build_models(self, benchmark, project, sizes):
+        benchmark.extra_info["models"] = sizes["models"]
+        benchmark.pedantic(run_dbt, args=(["run"],), rounds=3, warmup_rounds=1)
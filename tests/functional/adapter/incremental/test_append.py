@@ -0,0 +1,71 @@
+import pathlib
+
+import pytest
+
+from dbt.adapters.parquet import ParquetConnectionManager
+from dbt.tests.util import run_dbt, relation_from_name
+
+incremental_sql = """
+{{ config(materialized='incremental') }}
+{% if is_incremental() %}
+select i, 'new' as tag from range(10, 15) t(i)
+{% else %}
+select i from range(10) t(i)
+{% endif %}
+"""
+
+partitioned_sql = """
+{{ config(materialized='incremental', partition_by='k') }}
+select i, i % 2 as k from range(15) t(i)
+{% if is_incremental() %}
+where i >= 10
+{% else %}
+where i < 10
+{% endif %}
+"""
+
+
+class TestIncrementalAppend:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"appended.sql": incremental_sql, "partitioned.sql": partitioned_sql}
+
+    def test_append_parts(self, project):
+        dataset = pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        dataset = dataset / "appended"
+
+        run_dbt(["run"])
+        first_parts = {p: p.read_bytes() for p in dataset.glob("*.parquet")}
+        assert len(first_parts) == 1
+
+        run_dbt(["run"])
+        parts = list(dataset.glob("*.parquet"))
+        assert len(parts) == 2
+        # existing data is never rewritten
+        for path, content in first_parts.items():
+            assert path.read_bytes() == content
+
+        # the new `tag` column is aligned by name, and null for the rows of the first part
+        relation = relation_from_name(project.adapter, "appended")
+        result = project.run_sql(
+            f"select count(*), count(tag), max(i) from {relation}", fetch="one"
+        )
+        assert tuple(result) == (15, 5, 14)
+
+        run_dbt(["run", "--full-refresh"])
+        assert len(list(dataset.glob("*.parquet"))) == 1
+
+    def test_append_moves_cached_footers(self, project):
+        database = pathlib.Path(project.adapter.config.credentials.database)
+        dataset = database / project.test_schema / "partitioned"
+
+        run_dbt(["run", "--select", "partitioned"])
+        first_parts = set(dataset.glob("*/*.parquet"))
+        run_dbt(["run", "--select", "partitioned"])
+        new_parts = set(dataset.glob("*/*.parquet")) - first_parts
+        assert len(new_parts) == 2
+
+        # the footers read from the staged parts are kept under their final paths
+        cached = set(ParquetConnectionManager.FOOTERS._entries)
+        assert not [path for path in cached if "dbt_staging" in path]
+        assert {str(p.relative_to(database)) for p in new_parts} <= cached
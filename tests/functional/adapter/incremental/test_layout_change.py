@@ -0,0 +1,45 @@
+import pathlib
+
+import pytest
+
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt
+
+model_sql = """
+{{ config(materialized=var('materialized', 'table'), partition_by=var('partition_by', none)) }}
+select i, i % 2 as k from range({{ var('rows', 10) }}) t(i)
+{% if is_incremental() %}
+where i >= (select max(i) + 1 from {{ this }})
+{% endif %}
+"""
+
+
+class TestIncrementalLayoutChange:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"switched.sql": model_sql}
+
+    def test_table_switched_to_incremental(self, project):
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+        relation = relation_from_name(project.adapter, "switched")
+
+        def rows():
+            return project.run_sql(
+                f"select count(*), count(distinct i), max(i) from {relation}", fetch="one"
+            )
+
+        run_dbt(["run"])
+        assert (schema_dir / "switched.parquet").is_file()
+
+        # the existing rows are kept, and only the new ones appended
+        run_dbt(["run", "--vars", "{materialized: incremental, rows: 12}"])
+        assert tuple(rows()) == (12, 12, 11)
+        assert not (schema_dir / "switched.parquet").exists()
+        assert len(list((schema_dir / "switched").glob("*.parquet"))) == 2
+
+        # new partition columns rewrite the existing rows once
+        run_dbt(["run", "--vars", "{materialized: incremental, rows: 14, partition_by: k}"])
+        assert tuple(rows()) == (14, 14, 13)
+        assert sorted(p.name for p in (schema_dir / "switched").iterdir()) == ["k=0", "k=1"]
@@ -0,0 +1,114 @@
+import pathlib
+
+import pytest
+
+from dbt.tests.util import run_dbt, relation_from_name
+
+merge_sql = """
+{{ config(materialized='incremental', incremental_strategy='merge',
+          unique_key='id', partition_by='day') }}
+{% if is_incremental() %}
+-- update id 4 and insert id 10, both in day 1
+select * from (values (4, 1, 'updated'), (10, 1, 'new')) t(id, day, val)
+{% else %}
+select i as id, i % 3 as day, 'original' as val from range(10) t(i)
+{% endif %}
+"""
+
+overwrite_sql = """
+{{ config(materialized='incremental', incremental_strategy='insert_overwrite',
+          partition_by='day') }}
+{% if is_incremental() %}
+select 100 as id, 2 as day
+{% else %}
+select i as id, i % 3 as day from range(10) t(i)
+{% endif %}
+"""
+
+# the second run selects no new rows
+append_nothing_sql = """
+{{ config(materialized='incremental', partition_by='day') }}
+select i as id, i % 3 as day from range(10) t(i)
+{% if is_incremental() %}
+where i > (select max(id) from {{ this }})
+{% endif %}
+"""
+
+merge_nothing_sql = """
+{{ config(materialized='incremental', incremental_strategy='merge',
+          unique_key='id', partition_by='day') }}
+select i as id, i % 3 as day from range(10) t(i)
+{% if is_incremental() %}
+where i > (select max(id) from {{ this }})
+{% endif %}
+"""
+
+overwrite_nothing_sql = """
+{{ config(materialized='incremental', incremental_strategy='insert_overwrite',
+          partition_by='day') }}
+select i as id, i % 3 as day from range(10) t(i)
+{% if is_incremental() %}
+where i > (select max(id) from {{ this }})
+{% endif %}
+"""
+
+
+def partition_contents(dataset: pathlib.Path):
+    return {p: p.read_bytes() for p in dataset.glob("*/*.parquet")}
+
+
+class TestPartitionStrategies:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "merged.sql": merge_sql,
+            "overwritten.sql": overwrite_sql,
+            "appended_nothing.sql": append_nothing_sql,
+            "merged_nothing.sql": merge_nothing_sql,
+            "overwritten_nothing.sql": overwrite_nothing_sql,
+        }
+
+    def test_strategies(self, project):
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+
+        run_dbt(["run"])
+        merged_before = partition_contents(schema_dir / "merged")
+        overwritten_before = partition_contents(schema_dir / "overwritten")
+        nothing = ["appended_nothing", "merged_nothing", "overwritten_nothing"]
+        nothing_before = {name: partition_contents(schema_dir / name) for name in nothing}
+
+        run_dbt(["run"])
+
+        # runs without new rows leave the data, and no staging or backup folders, behind
+        for name in nothing:
+            assert partition_contents(schema_dir / name) == nothing_before[name]
+            assert [p.name for p in schema_dir.iterdir() if name in p.name] == [name]
+
+        # untouched partitions are left byte-for-byte alone
+        merged_after = partition_contents(schema_dir / "merged")
+        for path, content in merged_before.items():
+            if path.parent.name != "day=1":
+                assert merged_after[path] == content
+        overwritten_after = partition_contents(schema_dir / "overwritten")
+        for path, content in overwritten_before.items():
+            if path.parent.name != "day=2":
+                assert overwritten_after[path] == content
+
+        merged = relation_from_name(project.adapter, "merged")
+        result = project.run_sql(
+            f"select count(*), count(*) filter (where val = 'updated'), max(id) from {merged}",
+            fetch="one",
+        )
+        assert tuple(result) == (11, 1, 10)
+        result = project.run_sql(f"select val from {merged} where id = 4", fetch="one")
+        assert result[0] == "updated"
+
+        overwritten = relation_from_name(project.adapter, "overwritten")
+        result = project.run_sql(
+            f"select count(*) from {overwritten} where day = '2'", fetch="one"
+        )
+        assert result[0] == 1
+        result = project.run_sql(f"select count(*) from {overwritten}", fetch="one")
+        assert result[0] == 8
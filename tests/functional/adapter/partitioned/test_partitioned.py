@@ -0,0 +1,53 @@
+import pathlib
+
+import pytest
+
+from dbt.tests.util import run_dbt, relation_from_name, check_relations_equal
+
+partitioned_sql = """
+{{ config(materialized='table', partition_by=['k']) }}
+select i, (i % 3)::varchar as k from range(10) t(i)
+"""
+
+downstream_sql = """
+select i, k from {{ ref('partitioned') }} where k = '1'
+"""
+
+expected_sql = """
+select i, (i % 3)::varchar as k from range(10) t(i) where i % 3 = 1
+"""
+
+
+class TestPartitionedTable:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "partitioned.sql": partitioned_sql,
+            "downstream.sql": downstream_sql,
+            "expected.sql": expected_sql,
+        }
+
+    def test_partitioned(self, project):
+        # the second run replaces an existing dataset
+        for _ in range(2):
+            results = run_dbt(["run"])
+            assert len(results) == 3
+
+        dataset = pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        dataset = dataset / "partitioned"
+        assert dataset.is_dir()
+        assert sorted(p.name for p in dataset.iterdir()) == ["k=0", "k=1", "k=2"]
+
+        relation = relation_from_name(project.adapter, "partitioned")
+        result = project.run_sql(f"select count(*) from {relation}", fetch="one")
+        assert result[0] == 10
+
+        check_relations_equal(project.adapter, ["downstream", "expected"])
+
+        catalog = run_dbt(["docs", "generate"])
+        assert len(catalog.nodes) == 3
+        node = catalog.nodes["model.test.partitioned"]
+        assert [c for c in node.columns] == ["i", "k"]
+        assert node.stats["num_rows"].value == 10
+        assert node.stats["num_row_groups"].value == 3
+        assert node.stats["compression"].value == "SNAPPY"
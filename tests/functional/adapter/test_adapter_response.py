@@ -0,0 +1,31 @@
+import pytest
+
+from dbt.tests.util import run_dbt
+
+table_sql = "select i from range(1000) t(i)"
+partitioned_sql = """
+{{ config(materialized='table', partition_by='k') }}
+select i, (i % 3)::varchar as k from range(1000) t(i)
+"""
+
+
+class TestAdapterResponse:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"plain.sql": table_sql, "partitioned.sql": partitioned_sql}
+
+    def test_response(self, project):
+        results = {r.node.name: r.adapter_response for r in run_dbt(["run"])}
+
+        plain = results["plain"]
+        assert plain["_message"] == "COPY 1000"
+        assert plain["rows_affected"] == 1000
+        assert plain["files_written"] == 1
+        assert plain["row_groups_written"] == 1
+        assert plain["bytes_written"] > 0
+        assert plain["duration"] > 0
+        assert plain["process_peak_memory"] > 0
+
+        partitioned = results["partitioned"]
+        assert partitioned["rows_affected"] == 1000
+        assert partitioned["files_written"] == 3
@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+from dbt.tests.util import get_connection
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt_and_capture
+
+upstream_sql = "select i, repeat('x', 100) as padding from range(100000) t(i)"
+# slow enough that the two would overlap on dbt's 4 threads if they were both admitted
+first_sql = "select count(*) as n from {{ ref('upstream') }}, range(3000)"
+second_sql = "select max(i + r) as m from {{ ref('upstream') }}, range(3000) t(r)"
+
+# hooks run after a model was admitted, and before its reservation is released
+probe = "{{{{ log('probe ' ~ this.identifier ~ ' {} ' ~ modules.datetime.datetime.now().isoformat(), info=True) }}}}"
+
+
+def probe_intervals(logs: str) -> dict:
+    times = {
+        (name, event): value
+        for name, event, value in re.findall(r"probe (\w+) (start|end) (\S+)", logs)
+    }
+    return {name: (times[(name, "start")], times[(name, "end")]) for name, _ in times}
+
+
+class TestAdmissionControl:
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self, dbt_profile_target):
+        # every model reading `upstream` needs the whole budget, so they run one at a time
+        return {**dbt_profile_target, "admission_budget": "1KB", "admission_min_size": "1KB"}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"models": {"+pre-hook": probe.format("start"), "+post-hook": probe.format("end")}}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"upstream.sql": upstream_sql, "first.sql": first_sql, "second.sql": second_sql}
+
+    def test_admission(self, project):
+        results, logs = run_dbt_and_capture(["--debug", "run"])
+        assert len(results) == 3
+
+        intervals = probe_intervals(logs)
+        earlier, later = sorted([intervals["first"], intervals["second"]])
+        assert earlier[1] <= later[0]
+        for name in ("first", "second"):
+            assert f"Waiting to admit model.test.{name} reading" in logs
+            assert f"Admitted model.test.{name}" in logs
+        # upstream reads no relation, and is admitted without waiting
+        assert "Waiting to admit model.test.upstream" not in logs
+
+        upstream = relation_from_name(project.adapter, "upstream")
+        with get_connection(project.adapter):
+            assert project.adapter.estimate_input_bytes(f"select * from {upstream}") > 1000
+            assert project.adapter.estimate_input_bytes("select 1") == 0
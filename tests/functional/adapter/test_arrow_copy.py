@@ -0,0 +1,109 @@
+import pathlib
+
+import pyarrow
+import pyarrow.ipc
+import pytest
+
+from dbt.tests.util import run_dbt
+
+table_sql = """
+{{ config(materialized='table', file_format=var('file_format', 'both')) }}
+select i, i % 2 as k from range(10) t(i)
+"""
+
+partitioned_sql = """
+{{ config(materialized='table', partition_by='k', file_format='both') }}
+select i, i % 2 as k from range(10) t(i)
+"""
+
+cached_sql = """
+{{ config(materialized='table', file_format='both', build_cache=true) }}
+select i from range(5) t(i)
+"""
+
+in_memory_sql = """
+{{ config(materialized='table', persist=false, file_format=var('file_format', 'both')) }}
+select 1 as i
+"""
+
+incremental_sql = """
+{{ config(materialized='incremental', file_format='both') }}
+select i from range({{ var('rows', 3) }}) t(i)
+{% if is_incremental() %}
+where i >= (select max(i) + 1 from {{ this }})
+{% endif %}
+"""
+
+
+def read_arrow(path: pathlib.Path) -> pyarrow.Table:
+    with pyarrow.memory_map(str(path)) as source:
+        return pyarrow.ipc.open_file(source).read_all()
+
+
+class TestArrowCopy:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "table_model.sql": table_sql,
+            "partitioned.sql": partitioned_sql,
+            "incremental.sql": incremental_sql,
+            "cached.sql": cached_sql,
+            "in_memory.sql": in_memory_sql,
+        }
+
+    def test_arrow_copy(self, project):
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+        run_dbt(["run", "--exclude", "in_memory"])
+        assert read_arrow(schema_dir / "table_model.arrow").to_pydict() == {
+            "i": list(range(10)),
+            "k": [i % 2 for i in range(10)],
+        }
+        partitioned = read_arrow(schema_dir / "partitioned.arrow")
+        assert sorted(partitioned.column("i").to_pylist()) == list(range(10))
+        assert read_arrow(schema_dir / "incremental.arrow").column("i").to_pylist() == [0, 1, 2]
+        # the copies are not relations of their own
+        catalog = run_dbt(["docs", "generate"])
+        assert len(catalog.nodes) == 4
+        stats = catalog.nodes["model.test.table_model"].stats
+        assert stats["arrow_bytes"].value == (schema_dir / "table_model.arrow").stat().st_size
+
+        run_dbt(["run", "--select", "incremental", "--vars", "rows: 5"])
+        incremental = read_arrow(schema_dir / "incremental.arrow")
+        assert sorted(incremental.column("i").to_pylist()) == [0, 1, 2, 3, 4]
+
+        run_dbt(["run", "--select", "table_model", "--vars", "file_format: parquet"])
+        assert not (schema_dir / "table_model.arrow").exists()
+        assert not list(schema_dir.glob(".*.arrow"))
+
+    def test_invalid_file_format(self, project):
+        results = run_dbt(
+            ["run", "--select", "table_model", "--vars", "file_format: feather"],
+            expect_pass=False,
+        )
+        assert "Invalid file_format 'feather'" in results[0].message
+
+    def test_cache_hit_restores_a_missing_copy(self, project):
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+        run_dbt(["run", "--select", "cached"])
+        (schema_dir / "cached.arrow").unlink()
+        results = run_dbt(["run", "--select", "cached"])
+        assert results[0].adapter_response["code"] == "SKIP"
+        assert read_arrow(schema_dir / "cached.arrow").column("i").to_pylist() == list(range(5))
+
+    @pytest.mark.parametrize(
+        "file_format,message",
+        [
+            ("both", "cannot be combined with `persist: false`"),
+            ("feather", "Invalid file_format 'feather'"),
+        ],
+    )
+    def test_in_memory_models_have_no_copies(self, project, file_format, message):
+        results = run_dbt(
+            ["run", "--select", "in_memory", "--vars", f"file_format: {file_format}"],
+            expect_pass=False,
+        )
+        assert message in results[0].message
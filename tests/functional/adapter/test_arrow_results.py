@@ -0,0 +1,39 @@
+import decimal
+
+import pytest
+
+from dbt.tests.util import get_connection
+
+numbers_sql = "select i, i::varchar as s, i % 2 = 0 as even from range(10) t(i)"
+# more rows than fit in one arrow batch, so that a partial fetch leaves the result pending
+many_rows_sql = "select i from range(1000000) t(i)"
+
+
+class TestArrowResults:
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self, dbt_profile_target):
+        return {**dbt_profile_target, "fetch_max_rows": 3}
+
+    def test_fetch_is_typed_and_capped(self, project):
+        rows = project.run_sql(numbers_sql, fetch="all")
+        assert len(rows) == 3
+        # types come from the arrow schema, not from the values
+        assert tuple(rows[1]) == (decimal.Decimal(1), "1", False)
+
+    def test_fetch_arrow(self, project):
+        with get_connection(project.adapter):
+            table = project.adapter.fetch_arrow(numbers_sql)
+            assert table.num_rows == 10
+            assert table.schema.names == ["i", "s", "even"]
+            assert project.adapter.fetch_arrow(numbers_sql, limit=4).num_rows == 4
+
+    def test_statements_after_a_partial_fetch(self, project):
+        with get_connection(project.adapter):
+            _, table = project.adapter.execute(many_rows_sql, fetch=True)
+            assert len(table.rows) == 3
+            _, table = project.adapter.execute("select 1; select 2", fetch=True)
+            assert table.rows[0][0] == 2
+
+            assert project.adapter.fetch_arrow(many_rows_sql, limit=4).num_rows == 4
+            _, table = project.adapter.execute("select 1; select 2", fetch=True)
+            assert table.rows[0][0] == 2
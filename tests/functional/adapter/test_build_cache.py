@@ -0,0 +1,69 @@
+import pytest
+
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt
+
+upstream_sql = """
+select i from range({{ var('rows', 3) }}) t(i)
+"""
+
+downstream_sql = """
+select count(*) as n from {{ ref('upstream') }}
+"""
+
+
+def response_codes(results):
+    return {r.node.name: r.adapter_response["code"] for r in results}
+
+
+class TestBuildCache:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"upstream.sql": upstream_sql, "downstream.sql": downstream_sql}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"models": {"+materialized": "table", "+build_cache": True}}
+
+    def test_unchanged_models_are_skipped(self, project):
+        assert response_codes(run_dbt(["run"])) == {"upstream": "COPY", "downstream": "COPY"}
+
+        results = run_dbt(["run"])
+        assert response_codes(results) == {"upstream": "SKIP", "downstream": "SKIP"}
+        assert {r.node.name: r.adapter_response["rows_affected"] for r in results} == {
+            "upstream": 3,
+            "downstream": 1,
+        }
+
+        # new rows upstream invalidate the downstream model as well
+        codes = response_codes(run_dbt(["run", "--vars", "rows: 5"]))
+        assert codes == {"upstream": "COPY", "downstream": "COPY"}
+        downstream = relation_from_name(project.adapter, "downstream")
+        assert project.run_sql(f"select n from {downstream}", fetch="one")[0] == 5
+
+        codes = response_codes(run_dbt(["run", "--vars", "rows: 5", "--full-refresh"]))
+        assert codes == {"upstream": "COPY", "downstream": "COPY"}
+
+
+class TestBuildCacheUncacheableModels:
+    @pytest.fixture(scope="class")
+    def models(self, dbt_profile_target, unique_schema):
+        path = f"{dbt_profile_target['database']}/{unique_schema}/upstream.parquet"
+        by_path_sql = f"""
+        -- depends_on: {{{{ ref('upstream') }}}}
+        select count(*) as n from read_parquet('{path}')
+        """
+        return {
+            "upstream.sql": upstream_sql,
+            "by_path.sql": by_path_sql,
+            "volatile.sql": "select now() as loaded_at",
+        }
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"models": {"+materialized": "table", "+build_cache": True}}
+
+    def test_models_reading_files_or_volatile_functions_are_rebuilt(self, project):
+        run_dbt(["run"])
+        codes = response_codes(run_dbt(["run"]))
+        assert codes == {"upstream": "SKIP", "by_path": "COPY", "volatile": "COPY"}
@@ -0,0 +1,140 @@
+import pathlib
+import shutil
+import subprocess
+import sys
+
+import duckdb
+import pytest
+
+from dbt.adapters.parquet import ParquetConnectionManager
+from dbt.adapters.parquet.catalog import CatalogFile
+from dbt.tests.util import run_dbt
+
+upstream_sql = "select i from range(5) t(i)"
+downstream_sql = "select i * 2 as j from {{ ref('upstream') }}"
+
+
+def catalog_views(database: str, schema: str) -> dict:
+    """
+    The views in the catalog file with their row counts, read as another tool would
+    """
+    assert ParquetConnectionManager.CATALOG is not None
+    ParquetConnectionManager.CATALOG.close()
+    conn = duckdb.connect(str(pathlib.Path(database) / CatalogFile.FILENAME), read_only=True)
+    try:
+        views = conn.execute(
+            "select view_name from duckdb_views() where schema_name = ?", [schema]
+        ).fetchall()
+        return {
+            view: conn.execute(f'select count(*) from "{schema}"."{view}"').fetchall()[0][0]
+            for (view,) in views
+        }
+    finally:
+        conn.close()
+
+
+class TestCatalogFile:
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self, dbt_profile_target):
+        return {**dbt_profile_target, "persist_catalog": True}
+
+    @pytest.fixture(autouse=True)
+    def remove_catalog(self, project):
+        yield
+        if ParquetConnectionManager.CATALOG is not None:
+            ParquetConnectionManager.CATALOG.close()
+        database = pathlib.Path(project.adapter.config.credentials.database)
+        (database / CatalogFile.FILENAME).unlink(missing_ok=True)
+        (database / CatalogFile.STALE_MARKER).unlink(missing_ok=True)
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"upstream.sql": upstream_sql, "downstream.sql": downstream_sql}
+
+    def test_catalog_file(self, project):
+        database = project.adapter.config.credentials.database
+        schema = project.test_schema
+        run_dbt(["run"])
+        assert catalog_views(database, schema) == {"upstream": 5, "downstream": 5}
+
+        # written behind dbt's back, to a schema that dbt does not list: not seen by a new
+        # invocation, which reads the catalog...
+        other = f"{schema}_other"
+        other_dir = pathlib.Path(database) / other
+        other_dir.mkdir()
+        duckdb.connect().execute(
+            f"copy (select 1 as x) to '{other_dir / 'unrelated.parquet'}' (format 'parquet')"
+        )
+        ParquetConnectionManager.CONN = None
+        run_dbt(["run", "--select", "downstream"])
+        assert f'"{other}"."unrelated"' not in ParquetConnectionManager.VIEWS
+        assert f'"{schema}"."upstream"' in ParquetConnectionManager.VIEWS
+
+        # ...until the catalog is refreshed
+        run_dbt(["run-operation", "refresh_catalog"])
+        assert catalog_views(database, other) == {"unrelated": 1}
+
+        # a catalog referring to removed files is rebuilt from the database folder
+        shutil.rmtree(other_dir)
+        ParquetConnectionManager.CONN = None
+        run_dbt(["run", "--select", "downstream"])
+        assert f'"{other}"."unrelated"' not in ParquetConnectionManager.VIEWS
+        assert catalog_views(database, other) == {}
+        assert catalog_views(database, schema) == {"upstream": 5, "downstream": 5}
+
+        run_dbt(["run-operation", "drop_relation_op"])
+        assert catalog_views(database, schema) == {"upstream": 5}
+
+    def test_changes_while_another_process_holds_the_catalog(self, project):
+        database = project.adapter.config.credentials.database
+        schema = project.test_schema
+        ParquetConnectionManager.CONN = None
+        run_dbt(["run"])
+        assert ParquetConnectionManager.CATALOG is not None
+        ParquetConnectionManager.CATALOG.close()
+
+        # e.g. the duckdb CLI opened by `dbt run-operation duckdb`
+        holder = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import duckdb, sys; conn = duckdb.connect(sys.argv[1], read_only=True); "
+                "print('ready', flush=True); sys.stdin.read()",
+                str(pathlib.Path(database) / CatalogFile.FILENAME),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        added = pathlib.Path(project.project_root) / "models" / "added.sql"
+        try:
+            assert holder.stdout.readline().strip() == "ready"
+            added.write_text("select 1 as x")
+            ParquetConnectionManager.CONN = None
+            run_dbt(["run", "--select", "added"])
+            assert (pathlib.Path(database) / CatalogFile.STALE_MARKER).exists()
+        finally:
+            holder.stdin.close()
+            holder.wait()
+
+        # the next invocation does not trust the catalog, but rebuilds it
+        try:
+            ParquetConnectionManager.CONN = None
+            run_dbt(["run", "--select", "downstream"])
+            assert f'"{schema}"."added"' in ParquetConnectionManager.VIEWS
+            assert catalog_views(database, schema) == {"upstream": 5, "downstream": 5, "added": 1}
+            assert not (pathlib.Path(database) / CatalogFile.STALE_MARKER).exists()
+        finally:
+            added.unlink()
+
+    @pytest.fixture(scope="class")
+    def macros(self):
+        return {
+            "drop_relation_op.sql": """
+                {% macro drop_relation_op() %}
+                  {% do adapter.drop_relation(api.Relation.create(
+                      database=target.database, schema=target.schema, identifier='downstream'
+                  )) %}
+                {% endmacro %}
+            """
+        }
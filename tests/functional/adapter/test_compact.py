@@ -0,0 +1,52 @@
+import pathlib
+
+import pytest
+
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt
+
+appended_sql = """
+{{ config(materialized='incremental', partition_by='k') }}
+select i, (i % 2)::varchar as k from range({{ var('start', 0) }}, {{ var('start', 0) }} + 10) t(i)
+"""
+
+single_sql = """
+{{ config(materialized='table', row_group_size=10) }}
+select i from range(100) t(i)
+"""
+
+
+class TestCompact:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"appended.sql": appended_sql, "single.sql": single_sql}
+
+    def test_compact(self, project):
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+        for start in (0, 10, 20):
+            run_dbt(["run", "--vars", f"start: {start}"])
+        assert len(list((schema_dir / "appended").glob("*/*.parquet"))) == 6
+
+        report = run_dbt(["run-operation", "compact", "--args", "{dry_run: true}"])
+        assert report.success
+        assert len(list((schema_dir / "appended").glob("*/*.parquet"))) == 6
+
+        run_dbt(["run-operation", "compact", "--args", "{min_row_group_rows: 20}"])
+        # one file per partition, and the single file is rewritten with larger row groups
+        assert len(list((schema_dir / "appended" / "k=0").glob("*.parquet"))) == 1
+        assert len(list((schema_dir / "appended" / "k=1").glob("*.parquet"))) == 1
+        assert sorted(p.name for p in schema_dir.iterdir()) == ["appended", "single.parquet"]
+
+        appended = relation_from_name(project.adapter, "appended")
+        result = project.run_sql(
+            f"select count(*), count(distinct i), sum(k::int) from {appended}", fetch="one"
+        )
+        assert result == (30, 30, 15)
+        single = relation_from_name(project.adapter, "single")
+        assert project.run_sql(f"select count(*) from {single}", fetch="one")[0] == 100
+
+        with project.adapter.connection_named("_test"):
+            report = project.adapter.compact(min_row_group_rows=20)
+        assert len(report.rows) == 0
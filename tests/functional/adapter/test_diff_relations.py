@@ -0,0 +1,84 @@
+import pytest
+
+from dbt.tests.util import check_relations_equal
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt
+from dbt.tests.util import run_dbt_and_capture
+
+base_sql = "select i, i % 3 as k, 'x' || i as s from range(100) t(i)"
+# same rows, in another order and split over partitions
+same_sql = """
+{{ config(partition_by='k') }}
+select s, k, i from range(100) t(i), (select 'x' || i as s, i % 3 as k) order by i desc
+"""
+changed_sql = """
+select i, case when i < 5 then -1 else i % 3 end as k, 'x' || i as s, 1 as extra
+from range(101) t(i)
+"""
+
+
+class TestDiffRelations:
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"models": {"+materialized": "table"}}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"base.sql": base_sql, "same.sql": same_sql, "changed.sql": changed_sql}
+
+    def test_diff_relations(self, project):
+        run_dbt(["run"])
+        base, same, changed = (
+            relation_from_name(project.adapter, name) for name in ("base", "same", "changed")
+        )
+        with project.adapter.connection_named("_test"):
+            assert project.adapter.diff_relations(base, same) == {
+                "rows_a": 100,
+                "rows_b": 100,
+                "different_columns": [],
+                "num_mismatched": 0,
+            }
+            # one extra row, five changed ones: in both directions
+            assert project.adapter.diff_relations(base, changed) == {
+                "rows_a": 100,
+                "rows_b": 101,
+                "different_columns": ["i", "k", "s", "extra"],
+                "num_mismatched": 11,
+            }
+            assert project.adapter.diff_relations(base, changed, ["s"]) == {
+                "rows_a": 100,
+                "rows_b": 101,
+                "different_columns": ["s"],
+                "num_mismatched": 1,
+            }
+
+        check_relations_equal(project.adapter, ["base", "same"])
+        with pytest.raises(AssertionError):
+            check_relations_equal(
+                project.adapter, ["base", "changed"], compare_snapshot_cols=False
+            )
+
+    def test_run_operation(self, project):
+        run_dbt(["run"])
+        schema = project.test_schema
+
+        _, logs = run_dbt_and_capture(
+            ["run-operation", "diff_relations", "--args", "{a: base, b: same}"]
+        )
+        assert "rows: 100 in base, 100 in same" in logs
+        assert "identical" in logs
+
+        # schema.identifier names are split, a bare identifier uses the target schema
+        _, logs = run_dbt_and_capture(
+            ["run-operation", "diff_relations", "--args", f"{{a: base, b: {schema}.changed}}"]
+        )
+        assert f"rows: 100 in base, 101 in {schema}.changed" in logs
+        assert "columns that differ: i, k, s, extra" in logs
+        assert "rows in only one relation: 11" in logs
+        assert "identical" not in logs
+
+        _, logs = run_dbt_and_capture(
+            ["run-operation", "diff_relations", "--args", f"{{a: base, b: {schema}.missing}}"],
+            expect_pass=False,
+        )
+        assert f"Relation {schema}.missing does not exist" in logs
@@ -0,0 +1,58 @@
+import pytest
+
+from dbt.adapters.parquet import ParquetConnectionManager
+from dbt.tests.util import run_dbt, relation_from_name
+
+settings_sql = """
+select
+    current_setting('threads') as threads,
+    current_setting('preserve_insertion_order') as preserve_insertion_order
+"""
+
+overridden_sql = (
+    "{{ config(duckdb_settings={'threads': 3, 'preserve_insertion_order': false}) }}"
+    + settings_sql
+)
+
+
+class TestDuckdbSettings:
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self, dbt_profile_target):
+        return {**dbt_profile_target, "duckdb_threads": 2}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"overridden.sql": overridden_sql, "defaults.sql": settings_sql}
+
+    def test_settings(self, project):
+        # start from a fresh duckdb database, which gets the profile's settings
+        ParquetConnectionManager.CONN = None
+        run_dbt(["run"])
+
+        def settings(name):
+            relation = relation_from_name(project.adapter, name)
+            return tuple(project.run_sql(f"select * from {relation}", fetch="one"))
+
+        assert settings("overridden") == (3, False)
+        assert settings("defaults") == (2, True)
+        # the overrides are restored after the model ran
+        result = project.run_sql("select current_setting('threads')", fetch="one")
+        assert result[0] == 2
+
+
+class TestInvalidDuckdbSettings:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "invalid.sql": "{{ config(duckdb_settings={'no_such_setting': 1}) }} select 1 as i",
+            "valid.sql": "select 1 as i",
+        }
+
+    def test_invalid_setting(self, project):
+        results = run_dbt(["run"], expect_pass=False)
+        statuses = {r.node.name: r.status for r in results}
+        assert statuses == {"invalid": "error", "valid": "success"}
+        assert (
+            "Invalid duckdb_settings"
+            in [r for r in results if r.node.name == "invalid"][0].message
+        )
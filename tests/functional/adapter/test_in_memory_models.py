@@ -0,0 +1,56 @@
+import pathlib
+
+import pytest
+
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt
+
+staging_sql = """
+{{ config(materialized='table', persist=var('persist_staging', false)) }}
+select i, i * 2 as doubled from range(4) t(i)
+"""
+
+mart_sql = """
+{{ config(materialized='table') }}
+select sum(doubled) as total from {{ ref('staging') }}
+"""
+
+
+class TestInMemoryModels:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"staging.sql": staging_sql, "mart.sql": mart_sql}
+
+    def test_in_memory_intermediate(self, project):
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+        results = run_dbt(["run"])
+        assert results[0].adapter_response["rows_affected"] == 4
+
+        # only the mart is written to parquet, reading the staging model from memory
+        assert sorted(p.name for p in schema_dir.iterdir()) == ["mart.parquet"]
+        mart = relation_from_name(project.adapter, "mart")
+        assert project.run_sql(f"select total from {mart}", fetch="one")[0] == 12
+
+        with project.adapter.connection_named("_test"):
+            relations = project.adapter.list_relations_without_caching(
+                project.adapter.Relation.create(
+                    database=project.database, schema=project.test_schema
+                )
+            )
+            columns = project.adapter.get_columns_in_relation(
+                relation_from_name(project.adapter, "staging")
+            )
+        assert {(r.identifier, r.in_memory) for r in relations} == {
+            ("mart", False),
+            ("staging", True),
+        }
+        assert [c.name for c in columns] == ["i", "doubled"]
+
+        # persisting the model again replaces the in-memory table, and vice versa
+        run_dbt(["run", "--vars", "persist_staging: true"])
+        assert sorted(p.name for p in schema_dir.iterdir()) == ["mart.parquet", "staging.parquet"]
+        run_dbt(["run"])
+        assert sorted(p.name for p in schema_dir.iterdir()) == ["mart.parquet"]
+        assert project.run_sql(f"select total from {mart}", fetch="one")[0] == 12
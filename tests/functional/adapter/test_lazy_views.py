@@ -0,0 +1,64 @@
+import pathlib
+
+import duckdb
+import pytest
+
+from dbt.adapters.parquet import ParquetConnectionManager
+from dbt.adapters.parquet import util
+from dbt.tests.util import run_dbt, check_relations_equal
+
+upstream_sql = "select i from range(5) t(i)"
+downstream_sql = "select i * 2 as j from {{ ref('upstream') }}"
+expected_sql = "select i * 2 as j from range(5) t(i)"
+
+
+class TestLazyViews:
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self, dbt_profile_target):
+        return {**dbt_profile_target, "lazy_views": True}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "upstream.sql": upstream_sql,
+            "downstream.sql": downstream_sql,
+            "expected.sql": expected_sql,
+        }
+
+    def test_lazy_views(self, project):
+        run_dbt(["run"])
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+        duckdb.connect().execute(
+            f"copy (select 1 as x) to '{schema_dir / 'unrelated.parquet'}' (format 'parquet')"
+        )
+
+        # start from a fresh duckdb catalog, as a new dbt invocation would
+        ParquetConnectionManager.CONN = None
+        run_dbt(["run", "--select", "downstream"])
+
+        registered = set(ParquetConnectionManager.VIEWS)
+        assert f'"{project.test_schema}"."upstream"' in registered
+        assert f'"{project.test_schema}"."downstream"' in registered
+        assert f'"{project.test_schema}"."unrelated"' not in registered
+        check_relations_equal(project.adapter, ["downstream", "expected"])
+
+    def test_names_without_relations_are_looked_up_once(self, project, monkeypatch):
+        lookups = []
+        get_relation_from_fs = util.get_relation_from_fs
+
+        def counting_lookup(root_dir, database, schema, identifier):
+            lookups.append(identifier)
+            return get_relation_from_fs(root_dir, database, schema, identifier)
+
+        monkeypatch.setattr(util, "get_relation_from_fs", counting_lookup)
+        sql = 'select "nothing" from (select 1 as nothing)'
+        project.run_sql(sql, fetch="one")
+        project.run_sql(sql, fetch="one")
+        assert lookups == ["nothing"]
+
+        # registering views may have created the relation
+        run_dbt(["run", "--select", "upstream"])
+        project.run_sql(sql, fetch="one")
+        assert lookups.count("nothing") == 2
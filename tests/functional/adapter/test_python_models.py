@@ -0,0 +1,75 @@
+import pytest
+
+from dbt.tests.util import check_relations_equal
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt
+
+upstream_sql = "select i from range(10) t(i)"
+
+arrow_py = """
+import pyarrow.compute as pc
+
+
+def model(dbt, session):
+    table = dbt.ref("upstream").arrow()
+    return table.append_column("j", pc.multiply(table["i"], 2))
+"""
+
+relation_py = """
+def model(dbt, session):
+    dbt.config(materialized="table", partition_by="k")
+    return dbt.ref("upstream").filter("i >= 5").project("i, i % 2 as k")
+"""
+
+in_memory_py = """
+def model(dbt, session):
+    dbt.config(persist=False)
+    return dbt.ref("upstream").limit(3).arrow()
+"""
+
+downstream_sql = "select sum(i) as s from {{ ref('in_memory') }}"
+
+failing_py = """
+def model(dbt, session):
+    frame = dbt.ref("upstream")
+    if frame.count("*").fetchone()[0] > 0:
+        raise ValueError("no data today")
+    return frame
+"""
+
+expected_arrow_sql = "select i, i * 2 as j from range(10) t(i)"
+expected_relation_sql = "select i, (i % 2)::varchar as k from range(5, 10) t(i)"
+
+
+class TestPythonModels:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "upstream.sql": upstream_sql,
+            "arrow_model.py": arrow_py,
+            "relation_model.py": relation_py,
+            "in_memory.py": in_memory_py,
+            "downstream.sql": downstream_sql,
+            "failing.py": failing_py,
+            "expected_arrow.sql": expected_arrow_sql,
+            "expected_relation.sql": expected_relation_sql,
+        }
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"models": {"+materialized": "table"}}
+
+    def test_python_models(self, project):
+        results = run_dbt(["run"], expect_pass=False)
+        statuses = {r.node.name: r.status for r in results}
+        assert statuses.pop("failing") == "error"
+        assert set(statuses.values()) == {"success"}
+        failing = next(r for r in results if r.node.name == "failing")
+        assert "no data today" in failing.message
+        arrow_model = next(r for r in results if r.node.name == "arrow_model")
+        assert arrow_model.adapter_response["rows_affected"] == 10
+
+        check_relations_equal(project.adapter, ["arrow_model", "expected_arrow"])
+        check_relations_equal(project.adapter, ["relation_model", "expected_relation"])
+        downstream = relation_from_name(project.adapter, "downstream")
+        assert project.run_sql(f"select s from {downstream}", fetch="one")[0] == 3
@@ -0,0 +1,41 @@
+import json
+import pathlib
+
+import pytest
+
+from dbt.tests.util import run_dbt
+
+upstream_sql = "select i, i % 7 as k from range(10000) t(i)"
+joined_sql = """
+select a.k, count(*) as n
+from {{ ref('upstream') }} a join {{ ref('upstream') }} b using (i)
+group by 1
+"""
+
+
+class TestQueryProfiling:
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self, dbt_profile_target):
+        return {**dbt_profile_target, "query_profiling": True}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"upstream.sql": upstream_sql, "joined.sql": joined_sql}
+
+    def test_profiles(self, project):
+        run_dbt(["run"])
+
+        profiles_dir = pathlib.Path(project.project_root) / "target" / "profiles"
+        assert sorted(p.name for p in profiles_dir.iterdir()) == [
+            "model.test.joined.json",
+            "model.test.upstream.json",
+        ]
+        document = json.loads((profiles_dir / "model.test.joined.json").read_text())
+        summary = document["summary"]
+        assert summary["queries"] >= 1
+        assert summary["time_by_category"]["join"] > 0
+        assert any(op["name"] == "HASH_JOIN" for op in summary["top_operators"])
+        assert list(summary["input_bytes"]) == [f"{project.test_schema}/upstream.parquet"]
+
+        report = run_dbt(["run-operation", "parquet_profile_report"])
+        assert report.success
@@ -0,0 +1,49 @@
+import pathlib
+
+import pytest
+
+from dbt.tests.util import run_dbt, relation_from_name
+
+seed_csv = """id,code,amount
+1,007,1.50
+2,042,2.25
+3,100,3.00
+"""
+
+seeds_yml = """
+version: 2
+seeds:
+  - name: fast
+    config:
+      fast_load: true
+      column_types:
+        code: varchar
+        amount: decimal(10, 2)
+"""
+
+
+class TestSeedFastLoad:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"fast.csv": seed_csv, "seeds.yml": seeds_yml}
+
+    def test_fast_load(self, project):
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["rows_affected"] == 3
+
+        relation = relation_from_name(project.adapter, "fast")
+        rows = project.run_sql(
+            f"select code, amount::varchar from {relation} order by id", fetch="all"
+        )
+        assert [tuple(r) for r in rows] == [("007", "1.50"), ("042", "2.25"), ("100", "3.00")]
+
+        # an unchanged csv is not reloaded
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["code"] == "SKIP"
+
+        seed_path = pathlib.Path(project.project_root) / "seeds" / "fast.csv"
+        seed_path.write_text(seed_csv + "4,999,4.00\n")
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["code"] == "INSERT"
+        result = project.run_sql(f"select count(*) from {relation}", fetch="one")
+        assert result[0] == 4
@@ -0,0 +1,86 @@
+import pathlib
+
+import pytest
+
+from dbt.tests.util import relation_from_name
+from dbt.tests.util import run_dbt
+
+source_sql = """
+{{ config(materialized='table') }}
+{% set rows = {
+    1: [(1, 'a', '2022-01-01'), (2, 'b', '2022-01-01'), (3, 'c', '2022-01-01')],
+    2: [(1, 'a', '2022-01-01'), (2, 'B', '2022-01-02'), (4, 'd', '2022-01-02')],
+    3: [(1, 'A', '2022-01-03'), (2, 'B', '2022-01-02'), (4, 'd', '2022-01-02')],
+    4: [(1, 'A', '2022-01-03'), (2, 'B', '2022-01-02'), (4, 'D', '2022-01-04')],
+}[var('version', 1)] %}
+{% for id, value, updated_at in rows %}
+select {{ id }} as id, '{{ value }}' as value, '{{ updated_at }}'::timestamp as updated_at
+{{ 'union all' if not loop.last }}
+{% endfor %}
+"""
+
+snapshot_sql = """
+{% snapshot snap %}
+{{ config(
+    target_schema=schema,
+    unique_key='id',
+    strategy='timestamp',
+    updated_at='updated_at',
+    invalidate_hard_deletes=True,
+    consolidate_after=3,
+) }}
+select * from {{ ref('source_rows') }}
+{% endsnapshot %}
+"""
+
+
+class TestSnapshotChangeFiles:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"source_rows.sql": source_sql}
+
+    @pytest.fixture(scope="class")
+    def snapshots(self):
+        return {"snap.sql": snapshot_sql}
+
+    def snapshot(self, project, version):
+        run_dbt(["run", "--vars", f"version: {version}"])
+        run_dbt(["snapshot", "--vars", f"version: {version}"])
+        snap_dir = pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        return sorted(p.name.split("-")[0] for p in (snap_dir / "snap").iterdir())
+
+    def versions(self, project):
+        snap = relation_from_name(project.adapter, "snap")
+        return project.run_sql(
+            f"select id, value, dbt_valid_to is null from {snap} order by id, dbt_valid_from",
+            fetch="all",
+        )
+
+    def test_change_files(self, project):
+        assert self.snapshot(project, 1) == ["part"]
+
+        # only the changed rows are written, as a change file next to the first snapshot
+        assert self.snapshot(project, 2) == ["change", "part"]
+        assert self.versions(project) == [
+            (1, "a", True),
+            (2, "b", False),
+            (2, "B", True),
+            (3, "c", False),
+            (4, "d", True),
+        ]
+
+        # runs without changes leave no change file behind
+        assert self.snapshot(project, 2) == ["change", "part"]
+        assert self.snapshot(project, 3) == ["change", "change", "part"]
+
+        # the third change file consolidates the snapshot into a single part file
+        assert self.snapshot(project, 4) == ["part"]
+        assert self.versions(project) == [
+            (1, "a", False),
+            (1, "A", True),
+            (2, "b", False),
+            (2, "B", True),
+            (3, "c", False),
+            (4, "d", False),
+            (4, "D", True),
+        ]
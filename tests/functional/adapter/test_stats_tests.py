@@ -0,0 +1,76 @@
+import pytest
+
+from dbt.tests.util import run_dbt
+
+events_sql = """
+{{ config(materialized='table', partition_by='k') }}
+select
+    i,
+    i % 4 as k,
+    case when i % 4 = 3 and i > 90 then null else i end as maybe_null
+from range(100) t(i)
+"""
+
+schema_yml = """
+version: 2
+models:
+  - name: events
+    tests:
+      - row_count:
+          min_value: 1
+          max_value: 100
+      - row_count:
+          name: too_few_events
+          min_value: 101
+    columns:
+      - name: i
+        tests:
+          - not_null
+          - not_negative
+          - accepted_range:
+              min_value: 0
+              max_value: 99
+          - accepted_range:
+              name: i_above_50
+              min_value: 50
+      - name: maybe_null
+        tests:
+          - not_null
+          - not_null:
+              name: maybe_null_where
+              config:
+                where: "k < 3"
+"""
+
+
+class TestStatsTests:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"events.sql": events_sql, "schema.yml": schema_yml}
+
+    def test_stats_tests(self, project):
+        run_dbt(["run"])
+        results = {r.node.name: r for r in run_dbt(["test"], expect_pass=False)}
+        failures = {name: r.failures for name, r in results.items()}
+        assert failures == {
+            "row_count_events_100__1": 0,
+            "too_few_events": 1,
+            "not_null_events_i": 0,
+            "not_negative_events_i": 0,
+            "accepted_range_events_i__99__0": 0,
+            "i_above_50": 50,
+            "not_null_events_maybe_null": 3,
+            "maybe_null_where": 0,
+        }
+
+        def compiled(name):
+            return results[name].node.compiled_code
+
+        # cleared by the footers alone
+        assert "limit 0" in compiled("not_null_events_i")
+        assert "limit 0" in compiled("accepted_range_events_i__99__0")
+        assert "count(*)" not in compiled("row_count_events_100__1")
+        # only the partition holding nulls is scanned
+        assert "parquet_scan([" in compiled("not_null_events_maybe_null")
+        assert "k=3" in compiled("not_null_events_maybe_null")
+        assert "k=0" not in compiled("not_null_events_maybe_null")
@@ -0,0 +1,33 @@
+import pathlib
+
+import pytest
+
+from dbt.adapters.parquet.impl import ParquetAdapter
+from dbt.tests.util import run_dbt, relation_from_name
+
+table_sql = """
+{{ config(materialized='table') }}
+select i from range({{ var('rows', 3) }}) t(i)
+"""
+
+
+class TestTableMaterialization:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"swapped.sql": table_sql}
+
+    def test_single_swap(self, project, monkeypatch):
+        def no_rename(*args, **kwargs):
+            raise AssertionError("tables should be swapped in without rename_relation")
+
+        monkeypatch.setattr(ParquetAdapter, "rename_relation", no_rename)
+
+        schema_dir = pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        run_dbt(["run"])
+        run_dbt(["run", "--vars", "rows: 5"])
+
+        # no temporary or backup files are left behind
+        assert [p.name for p in schema_dir.iterdir()] == ["swapped.parquet"]
+        relation = relation_from_name(project.adapter, "swapped")
+        result = project.run_sql(f"select count(*) from {relation}", fetch="one")
+        assert result[0] == 5
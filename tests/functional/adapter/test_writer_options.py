@@ -0,0 +1,45 @@
+import pathlib
+
+import pyarrow.parquet as pq
+import pytest
+
+from dbt.tests.util import run_dbt
+
+tuned_sql = """
+{{ config(materialized='table', compression='zstd', row_group_size=2048, order_by='i') }}
+select (i * 7919) % 10000 as i from range(10000) t(i)
+"""
+
+default_sql = "select 1 as i"
+
+
+class TestWriterOptions:
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self, dbt_profile_target):
+        return {**dbt_profile_target, "compression": "gzip"}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"tuned.sql": tuned_sql, "default.sql": default_sql}
+
+    def test_writer_options(self, project):
+        run_dbt(["run"])
+        schema_dir = (
+            pathlib.Path(project.adapter.config.credentials.database) / project.test_schema
+        )
+
+        tuned = pq.ParquetFile(schema_dir / "tuned.parquet").metadata
+        assert tuned.row_group(0).column(0).compression == "ZSTD"
+        assert tuned.num_row_groups > 1
+        bounds = [
+            (
+                tuned.row_group(i).column(0).statistics.min,
+                tuned.row_group(i).column(0).statistics.max,
+            )
+            for i in range(tuned.num_row_groups)
+        ]
+        # sorted output gives disjoint row group ranges
+        assert all(prev[1] < cur[0] for prev, cur in zip(bounds, bounds[1:]))
+
+        default = pq.ParquetFile(schema_dir / "default.parquet").metadata
+        assert default.row_group(0).column(0).compression == "GZIP"
@@ -83,7 +83,6 @@ class TestEmptyParquet(BaseEmpty):
 class TestEphemeralParquet(BaseEphemeral):
     pass
 
-@pytest.mark.skip("parquet files do not support incremental materializations")
 class TestIncrementalParquet(BaseIncremental):
     pass
 
@@ -91,12 +90,12 @@ class TestIncrementalParquet(BaseIncremental):
 class TestGenericTestsParquet(BaseGenericTests):
     pass
 
-@pytest.mark.skip("parquet files do not support snapshots")
+@pytest.mark.skip("updates the seed tables in place, which parquet relations do not support")
 class TestSnapshotCheckColsParquet(BaseSnapshotCheckCols):
     pass
 
 
-@pytest.mark.skip("parquet files do not support snapshots")
+@pytest.mark.skip("updates the seed tables in place, which parquet relations do not support")
 class TestSnapshotTimestampParquet(BaseSnapshotTimestamp):
     pass
 
@@ -0,0 +1,36 @@
+import pyarrow
+
+from dbt.adapters.parquet.metadata import FooterInfo
+from dbt.adapters.parquet.util import compaction_bins
+
+SCHEMA = pyarrow.schema([("a", pyarrow.int64())])
+
+
+def footer(size, num_rows=1000, num_row_groups=1):
+    return FooterInfo(size, 0.0, SCHEMA, num_rows, num_row_groups, "SNAPPY", {})
+
+
+def test_small_files_are_binned_per_folder():
+    files = {
+        "s/t/k=0/a.parquet": footer(40),
+        "s/t/k=0/b.parquet": footer(40),
+        "s/t/k=0/c.parquet": footer(40),
+        "s/t/k=0/large.parquet": footer(90),
+        "s/t/k=1/d.parquet": footer(10),
+        "s/t/k=2/e.parquet": footer(10),
+        "s/t/k=2/f.parquet": footer(10),
+    }
+    assert compaction_bins(files, target_size=100, min_row_group_rows=10) == [
+        ["s/t/k=0/a.parquet", "s/t/k=0/b.parquet"],
+        ["s/t/k=2/e.parquet", "s/t/k=2/f.parquet"],
+    ]
+
+
+def test_files_with_small_row_groups_are_rewritten():
+    files = {
+        "s/fine.parquet": footer(1000, num_rows=1000, num_row_groups=2),
+        "s/fragmented.parquet": footer(1000, num_rows=1000, num_row_groups=200),
+    }
+    assert compaction_bins(files, target_size=100, min_row_group_rows=10) == [
+        ["s/fragmented.parquet"]
+    ]
@@ -0,0 +1,84 @@
+import fs.memoryfs
+import pyarrow
+import pyarrow.parquet as pq
+
+from dbt.adapters.parquet import util
+from dbt.adapters.parquet.metadata import FooterCache
+
+
+def write_parquet(root, path, **columns):
+    with root.openbin(path, "w") as f:
+        pq.write_table(pyarrow.table(columns), f)
+
+
+def test_footer_cache_reads_and_revalidates():
+    root = fs.memoryfs.MemoryFS()
+    write_parquet(root, "t.parquet", a=[1, 2, 3])
+    cache = FooterCache()
+
+    info = cache.get(root, "t.parquet")
+    assert info.schema.names == ["a"]
+    assert info.num_rows == 3
+    assert info.num_row_groups == 1
+    assert cache.get(root, "/t.parquet") is info
+
+    # a rewritten file is detected by its size
+    write_parquet(root, "t.parquet", a=[1], b=["x"])
+    info = cache.get(root, "t.parquet")
+    assert info.schema.names == ["a", "b"]
+    assert info.num_rows == 1
+
+
+def test_footer_cache_eviction_rename_and_invalidate():
+    root = fs.memoryfs.MemoryFS()
+    root.makedirs("s/d")
+    for name in ("p0", "p1", "p2"):
+        write_parquet(root, f"s/d/{name}.parquet", a=[1])
+    cache = FooterCache(maxsize=2)
+    for name in ("p0", "p1", "p2"):
+        cache.get(root, f"s/d/{name}.parquet")
+    assert list(cache._entries) == ["s/d/p1.parquet", "s/d/p2.parquet"]
+
+    cache.rename("s/d", "s/e")
+    assert list(cache._entries) == ["s/e/p1.parquet", "s/e/p2.parquet"]
+    cache.invalidate("/s/e")
+    assert not cache._entries
+
+
+def test_footer_cache_sidecar_roundtrip():
+    root = fs.memoryfs.MemoryFS()
+    write_parquet(root, "t.parquet", a=[1, 2], b=["x", "y"])
+    cache = FooterCache()
+    info = cache.get(root, "t.parquet")
+    cache.save(root)
+    assert root.exists(FooterCache.SIDECAR)
+
+    warm = FooterCache()
+    warm.load(root)
+    loaded = warm._entries["t.parquet"]
+    assert loaded.schema.equals(info.schema)
+    assert (loaded.num_rows, loaded.size) == (2, info.size)
+    assert warm.get(root, "t.parquet") is loaded
+
+
+def test_column_stats():
+    root = fs.memoryfs.MemoryFS()
+    with root.openbin("t.parquet", "w") as f:
+        table = pyarrow.table(
+            {"i": [5, 1, None, 9], "s": ["a", None, "b", "c"], "n": pyarrow.nulls(4, "int64")}
+        )
+        pq.write_table(table, f, row_group_size=2)
+    stats = FooterCache().get(root, "t.parquet").column_stats
+    assert stats["i"] == {"null_count": 1, "range": [1, 9]}
+    # ranges are only kept for integer columns
+    assert stats["s"] == {"null_count": 1, "range": None}
+    assert stats["n"] == {"null_count": 4, "range": [None, None]}
+
+    assert util.stats_clear(stats["s"], min_value=0) is False
+    assert util.stats_clear(stats["s"]) is True
+    assert util.stats_clear(stats["i"], not_null=True) is False
+    assert util.stats_clear(stats["i"], min_value=1, max_value="9") is True
+    assert util.stats_clear(stats["i"], min_value=1, inclusive=False) is False
+    assert util.stats_clear(stats["i"], max_value="current_date") is False
+    assert util.stats_clear(stats["n"], min_value=100) is True
+    assert util.stats_clear(None) is False
@@ -0,0 +1,28 @@
+from dbt.adapters.parquet import profiling
+
+
+def operator(name, timing, cardinality=1, children=()):
+    return {"name": name, "timing": timing, "cardinality": cardinality, "children": list(children)}
+
+
+def test_summarize():
+    scan = operator("PARQUET_SCAN", 0.5, 100)
+    join = operator("HASH_JOIN", 1.0, 100, [scan, operator("PARQUET_SCAN", 0.25, 10)])
+    query = {
+        "name": "Query",
+        "timing": 2.0,
+        "children": [operator("COPY_TO_FILE", 0.125, 1, [join])],
+    }
+
+    summary = profiling.summarize([query, {"name": "Query", "timing": 1.0}], {"s/t.parquet": 42})
+    assert summary["total_time"] == 3.0
+    assert summary["queries"] == 2
+    assert summary["time_by_category"] == {"scan": 0.75, "join": 1.0, "write": 0.125, "other": 0.0}
+    assert summary["top_operators"][0] == {
+        "name": "HASH_JOIN",
+        "time": 1.0,
+        "rows": 100,
+        "count": 1,
+    }
+    assert summary["top_operators"][1]["count"] == 2
+    assert summary["input_bytes"] == {"s/t.parquet": 42}
@@ -0,0 +1,37 @@
+import fs.memoryfs
+
+from dbt.adapters.parquet import util
+from dbt.adapters.parquet.relation import ParquetRelation
+
+
+def test_file_relation_paths():
+    rel = ParquetRelation.create(database="/data", schema="s", identifier="t")
+    assert rel.render_path() == "/data/s/t.parquet"
+    assert rel.render_parquet_scan() == "parquet_scan('/data/s/t.parquet')"
+
+
+def test_dataset_relation_paths():
+    rel = ParquetRelation.create(database="/data", schema="s", identifier="t", partition_depth=2)
+    assert rel.render_path() == "/data/s/t"
+    assert rel.render_resource_path() == "s/t"
+    assert rel.render_parquet_scan() == "parquet_scan('/data/s/t/*/*/*.parquet', hive_partitioning=1)"
+
+    parts = rel.incorporate(partition_depth=0)
+    assert parts.render_parquet_scan() == "parquet_scan('/data/s/t/*.parquet', union_by_name=1)"
+
+
+def test_list_relations_detects_datasets():
+    root = fs.memoryfs.MemoryFS()
+    root.makedirs("s/partitioned/year=2022/month=1")
+    root.touch("s/partitioned/year=2022/month=1/data_0.parquet")
+    root.makedirs("s/parts")
+    root.touch("s/parts/part-0.parquet")
+    root.makedirs("s/empty")
+    root.touch("s/single.parquet")
+    root.touch("s/notes.txt")
+
+    relations = {r.identifier: r for r in util.list_relations_from_fs(root, "/data", "s")}
+    assert sorted(relations) == ["partitioned", "parts", "single"]
+    assert relations["partitioned"].partition_depth == 2
+    assert relations["parts"].partition_depth == 0
+    assert relations["single"].partition_depth is None
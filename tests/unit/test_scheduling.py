@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from dbt.adapters.parquet import util
+from dbt.adapters.parquet.connections import AdmissionControl
+
+
+def test_parse_bytes():
+    assert util.parse_bytes(123) == 123
+    assert util.parse_bytes("512MB") == 512 * 10**6
+    assert util.parse_bytes("5.0GB") == 5 * 10**9
+    assert util.parse_bytes("4 GiB") == 4 * 2**30
+    with pytest.raises(ValueError):
+        util.parse_bytes("lots")
+
+
+def test_referenced_relation_names():
+    sql = (
+        'select "x", "b".y as "z" from "s"."a" join "b" using (id) '
+        'where "s"."a".x = 1 and y = \'it\'\'s "c"\''
+    )
+    # string literals and aliases are skipped, quoted column names are not
+    assert util.referenced_relation_names(sql) == {("s", "a"), ("", "b"), ("", "x")}
+    relations = {("s", "a"), ("", "b")}
+    known = util.referenced_relation_names(sql, known=lambda *name: name in relations)
+    assert known == {("s", "a"), ("", "b")}
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "select * from read_parquet('data/*.parquet')",
+        "select * from read_csv_auto ('x.csv')",
+        "select * from parquet_scan('x.parquet')",
+        "select * from 'x.parquet'",
+        'select * from "s"."a" join \'s3://bucket/x.parquet\' using (id)',
+        "select now() as loaded_at",
+        "select current_date as day",
+        'select * from "a" order by random()',
+    ],
+)
+def test_uncacheable_sql(sql):
+    assert util.uncacheable_sql(sql)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        'select * from "s"."a" where "s"."a".x = \'now()\'',
+        'select "current_date", "random" from "a"',
+        "select epoch_ms(1) as t, 'from ''x''' as s",
+    ],
+)
+def test_cacheable_sql(sql):
+    assert not util.uncacheable_sql(sql)
+
+
+def test_admission_control_makes_large_models_wait():
+    admission = AdmissionControl()
+    assert admission.acquire(60, budget=100) == 60
+    admitted = threading.Event()
+
+    def large_model():
+        # larger than the whole budget: waits for the running model, then reserves all of it
+        admission.acquire(500, budget=100)
+        admitted.set()
+
+    waiting = threading.Thread(target=large_model)
+    waiting.start()
+    assert not admitted.wait(0.1)
+    admission.release(60)
+    assert admitted.wait(1)
+    waiting.join()
+    assert admission._reserved == 100
@@ -0,0 +1,138 @@
+import socket
+
+import boto3
+import duckdb
+import fs.memoryfs
+import fs.osfs
+import pyarrow
+import pyarrow.parquet as pq
+import pytest
+
+from dbt.adapters.parquet import util
+from dbt.adapters.parquet.connections import ParquetCredentials
+from dbt.adapters.parquet.connections import set_statements
+from dbt.adapters.parquet.metadata import FooterCache
+from dbt.adapters.parquet.relation import ParquetRelation
+from dbt.adapters.parquet.storage import CachedListingFS
+
+
+def write_parquet(root, path, **columns):
+    with root.openbin(path, "w") as f:
+        pq.write_table(pyarrow.table(columns), f)
+
+
+def test_listing_cache_is_dropped_on_writes():
+    inner = fs.memoryfs.MemoryFS()
+    inner.makedir("s")
+    root = CachedListingFS(inner, ttl=3600)
+    assert root.listdir("s") == []
+
+    # changes behind our back are not seen until the ttl runs out...
+    inner.writebytes("s/a.parquet", b"")
+    assert root.listdir("s") == []
+    # ...but every change made through the wrapper is
+    root.writebytes("s/b.parquet", b"")
+    assert sorted(root.listdir("s")) == ["a.parquet", "b.parquet"]
+    write_parquet(root, "s/c.parquet", a=[1])
+    root.move("s/a.parquet", "s/d.parquet")
+    assert sorted(root.listdir("/s/")) == ["b.parquet", "c.parquet", "d.parquet"]
+
+    expiring = CachedListingFS(inner, ttl=0)
+    assert expiring.listdir("s") == root.listdir("s")
+    inner.remove("s/b.parquet")
+    assert "b.parquet" not in expiring.listdir("s")
+
+
+def test_relation_paths_keep_the_url_scheme():
+    relation = ParquetRelation.create("s3://bucket/prefix", "s", "t")
+    assert relation.render_path() == "s3://bucket/prefix/s/t.parquet"
+    assert relation.render_resource_path() == "s/t.parquet"
+    dataset = relation.incorporate(partition_depth=1)
+    assert "'s3://bucket/prefix/s/t/*/*.parquet'" in dataset.render_parquet_scan()
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint():
+    moto_server = pytest.importorskip("moto.server")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    yield f"127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest.fixture()
+def credentials(s3_endpoint, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    boto3.client(
+        "s3", endpoint_url=f"http://{s3_endpoint}", region_name="us-east-1"
+    ).create_bucket(Bucket="warehouse")
+    return ParquetCredentials(
+        database="s3://warehouse/dbt/",
+        s3_region="us-east-1",
+        s3_endpoint=s3_endpoint,
+        s3_access_key_id="testing",
+        s3_secret_access_key="testing",
+        s3_use_ssl=False,
+        s3_url_style="path",
+        s3_upload_threads=4,
+    )
+
+
+def test_s3_database(credentials):
+    assert credentials.database == "s3://warehouse/dbt"
+    root = credentials.create_fs_interface()
+    root.makedirs("s/t", recreate=True)
+    for part in ("k=1", "k=2"):
+        root.makedir(f"s/t/{part}")
+        write_parquet(root, f"s/t/{part}/part-0.parquet", a=[1, 2])
+    write_parquet(root, "s/u.parquet", a=[1, 2, 3])
+
+    assert util.list_schemas_from_fs(root) == ["", "s"]
+    relations = util.list_relations_from_fs(root, credentials.database, "s")
+    assert {(r.identifier, r.partition_depth) for r in relations} == {("t", 1), ("u", None)}
+
+    footers = FooterCache(opener=credentials.footer_opener())
+    assert footers.get(root, "s/u.parquet").num_rows == 3
+
+    util.move_resource(root, "s/t", "s/.t.dbt_backup", workers=credentials.s3_upload_threads)
+    assert not root.exists("s/t")
+    assert sorted(root.walk.files("s/.t.dbt_backup")) == [
+        "s/.t.dbt_backup/k=1/part-0.parquet",
+        "s/.t.dbt_backup/k=2/part-0.parquet",
+    ]
+    assert [r.identifier for r in util.list_relations_from_fs(root, None, "s")] == ["u"]
+
+
+def test_move_resource_replaces_local_folders(tmp_path):
+    root = fs.osfs.OSFS(str(tmp_path))
+    root.makedirs("s/t/k=1")
+    write_parquet(root, "s/t/k=1/part-0.parquet", a=[1])
+    root.makedirs("s/u/k=2")
+    write_parquet(root, "s/u/k=2/part-0.parquet", a=[2])
+    write_parquet(root, "s/v.parquet", a=[3])
+
+    util.move_resource(root, "s/t", "s/u")
+    assert sorted(root.walk.files("s")) == ["s/u/k=1/part-0.parquet", "s/v.parquet"]
+    # a dataset replacing a single file, and the other way around
+    util.move_resource(root, "s/u", "s/v.parquet")
+    assert sorted(root.walk.files("s")) == ["s/v.parquet/k=1/part-0.parquet"]
+    write_parquet(root, "s/w.parquet", a=[4])
+    util.move_resource(root, "s/w.parquet", "s/v.parquet")
+    assert sorted(root.walk.files("s")) == ["s/v.parquet"]
+    assert root.listdir("s") == ["v.parquet"]
+
+
+def test_duckdb_reads_and_writes_the_s3_database(credentials):
+    conn = duckdb.connect()
+    try:
+        conn.execute("install httpfs; load httpfs")
+    except duckdb.Error:
+        pytest.skip("the duckdb httpfs extension cannot be installed")
+    conn.execute(set_statements(credentials.s3_settings()))
+    relation = ParquetRelation.create(credentials.database, "s", "v")
+    conn.execute(f"copy (select 42 as a) to '{relation.render_path()}' (format 'parquet')")
+    assert conn.execute(f"select a from {relation.render_parquet_scan()}").fetchall() == [(42,)]